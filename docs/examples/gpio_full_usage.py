@@ -24,3 +24,9 @@ gpio.set_digital_out(0o323)
 gpio.set_digital_out(211)
 # 4. Use hexadecimal integer:
 gpio.set_digital_out(0xD3)
+
+# Change single pins without reading the DO status back from the device.
+gpio.set_pin(2)  # DO_2 -> high
+gpio.clear_pin(0)  # DO_0 -> low
+gpio.toggle_pin(7)  # DO_7 -> inverted
+gpio.write_pins({1: True, 4: False})  # DO_1 -> high, DO_4 -> low in one write
@@ -24,20 +24,54 @@ from .exc import (
     PSPWarning,
 )
 from .sdk_dll import DLL, DLLVersionModel
-from .sdk_gpio import GPIO, GPIOInfoModel
+from .sdk_gpio import GPIO, GPIOCaptureModel, GPIOInfoModel, GPIOSequencer, GPIOTimingModel
 from .sdk_gps import GPS
-from .sdk_gsr import GSR, GSRDataModel, GSROffsetModel
+from .sdk_gsr import (
+    GSR,
+    GSRAnalyzer,
+    GSRBlockModel,
+    GSRDataModel,
+    GSREventModel,
+    GSRFeatureModel,
+    GSROffsetModel,
+    GSRStream,
+    GSRTrigger,
+)
 from .sdk_hwm import HWM, HWMSensorModel
-from .sdk_lcm import LCM
+from .sdk_lcm import (
+    LCM,
+    LCMDisplayEngine,
+    LCMFrameBuffer,
+    LCMKeyEventModel,
+    LCMKeypad,
+    LCMPortModel,
+    LCMRenderQueue,
+    LCMRenderStatsModel,
+)
 from .sdk_odm_com_port import COMPort, COMPortInfoModel
-from .sdk_poe import PoE, PoEInfoModel
-from .sdk_rfm import RFM
-from .sdk_sled import SystemLED
+from .sdk_poe import (
+    PoE,
+    PoEEventModel,
+    PoEInfoModel,
+    PoEPortResultModel,
+    PoESequencer,
+    PoEStatusModel,
+    PoEWatcher,
+)
+from .sdk_rfm import RFM, RFMController, RFMSwitchModel
+from .sdk_sled import LEDAnimator, LEDBatch, SystemLED
 from .sdk_sled_gps import GPSStatusLED
 from .sdk_sled_lte import LTEStatusLED
-from .sdk_sled_lte_stress import LTEStressLED
+from .sdk_sled_lte_stress import LTESignalModel, LTESignalMonitor, LTEStressLED
 from .sdk_swr import SWR
-from .sdk_wdt import WDT, WDTInfoModel
+from .sdk_wdt import (
+    WDT,
+    WDTInfoModel,
+    WDTKeepalive,
+    WDTKeepaliveStatsModel,
+    WDTProbeStatsModel,
+    WDTSupervisor,
+)
 
 __version__ = "0.0.12"
 __all__ = [
@@ -48,28 +82,59 @@ __all__ = [
     "COMPort",
     "DLL",
     "GPIO",
+    "GPIOSequencer",
     "GPS",
     "GPSStatusLED",
     "GSR",
+    "GSRAnalyzer",
+    "GSRStream",
+    "GSRTrigger",
     "HWM",
     "LCM",
+    "LCMDisplayEngine",
+    "LCMFrameBuffer",
+    "LCMKeypad",
+    "LCMRenderQueue",
+    "LEDAnimator",
+    "LEDBatch",
+    "LTESignalMonitor",
     "LTEStatusLED",
     "LTEStressLED",
     "PoE",
+    "PoESequencer",
+    "PoEWatcher",
     "PSP",
     "RFM",
+    "RFMController",
     "SWR",
     "SystemLED",
     "WDT",
+    "WDTKeepalive",
+    "WDTSupervisor",
     # Models
     "COMPortInfoModel",
     "DLLVersionModel",
+    "GPIOCaptureModel",
     "GPIOInfoModel",
+    "GPIOTimingModel",
+    "GSRBlockModel",
     "GSRDataModel",
+    "GSREventModel",
+    "GSRFeatureModel",
     "GSROffsetModel",
     "HWMSensorModel",
+    "LCMKeyEventModel",
+    "LCMPortModel",
+    "LCMRenderStatsModel",
+    "LTESignalModel",
+    "PoEEventModel",
     "PoEInfoModel",
+    "PoEPortResultModel",
+    "PoEStatusModel",
+    "RFMSwitchModel",
     "WDTInfoModel",
+    "WDTKeepaliveStatsModel",
+    "WDTProbeStatsModel",
     # Exceptions & Warnings
     "IPMIError",
     "IPMIIBF0",
@@ -1,16 +1,125 @@
 import logging
-
-from portio import inb, ioperm, outb
+import os
+from importlib.util import find_spec
+from typing import Dict, List, Optional, Tuple
 
 from .exc import PSPInvalid
 from .utils import is_root
 
 logger = logging.getLogger(__name__)
 
+DEV_PORT = "/dev/port"
+BACKENDS = ("auto", "devport", "portio")
+
+
+class _DevPortIO:
+    """I/O port access through one ``/dev/port`` file descriptor kept open for the process lifetime."""
+    _fd: Optional[int] = None
+
+    def __init__(self) -> None:
+        if _DevPortIO._fd is None:
+            _DevPortIO._fd = os.open(DEV_PORT, os.O_RDWR | getattr(os, "O_CLOEXEC", 0))
+            logger.debug(f"open {DEV_PORT}")
+        self._fd = _DevPortIO._fd
+        self._buf = bytearray(1)
+
+    def enable(self, port: int, num: int) -> None:
+        pass
+
+    def disable(self, port: int, num: int) -> None:
+        pass
+
+    def inb(self, port: int) -> int:
+        return os.pread(self._fd, 1, port)[0]
+
+    def outb(self, value: int, port: int) -> None:
+        self._buf[0] = value
+        os.pwrite(self._fd, self._buf, port)
+
+
+class _PortIO:
+    """I/O port access through the ``portio`` extra."""
+
+    def __init__(self) -> None:
+        try:
+            from portio import inb, ioperm, outb
+        except ImportError:
+            raise RuntimeError("Install lannerpsp with 'portio' extra in order to use COM port.")
+        self._ioperm = ioperm
+        self.inb = inb
+        self.outb = outb
+
+    def enable(self, port: int, num: int) -> None:
+        self._ioperm(port, num, 1)
+
+    def disable(self, port: int, num: int) -> None:
+        self._ioperm(port, num, 0)
+
+
+def check_backend() -> None:
+    """
+    Check if an I/O port backend is available.
+
+    :raises RuntimeError: if neither ``/dev/port`` nor the ``portio`` extra is available.
+    """
+    if not os.path.exists(DEV_PORT) and find_spec("portio") is None:
+        raise RuntimeError("Install lannerpsp with 'portio' extra in order to use COM port.")
+
+
+class SIOTransaction:
+    """
+    A script of Super I/O register accesses, run in one pass by :meth:`GPIOConfigTool.run`.
+
+    Each step reads the register, applies ``(value & and_mask) | or_mask`` and writes it
+    back. The registers from ``0x30`` belong to a logical device, so :meth:`select` must
+    come before them. Within a pass a register is read from the chip at most once, the index port is
+    only written when the register changes and writes that do not change the value are
+    skipped.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> txn = SIOTransaction()
+        >>> txn.select(GPIOConfigTool.SIO_GPIO_DEVICE)
+        >>> txn.update(GPIOConfigTool.REG_GPIO1_OUT_DATA, 0xF7, 0x08)
+        >>> GPIOConfigTool().run(txn)
+        [6, 8]
+    """
+
+    def __init__(self) -> None:
+        # (register, and mask, or mask, write back)
+        self._script: List[Tuple[int, int, int, bool]] = []
+
+    def __len__(self) -> int:
+        return len(self._script)
+
+    def select(self, device: int) -> None:
+        """Select the logical device (register ``0x07``)."""
+        self.write(GPIOConfigTool.SIO_LDN, device)
+
+    def read(self, reg: int) -> None:
+        """Read the register."""
+        self._script.append((reg, 0xFF, 0x00, False))
+
+    def write(self, reg: int, value: int) -> None:
+        """Write the register without reading it."""
+        self._script.append((reg, 0x00, value & 0xFF, True))
+
+    def update(self, reg: int, and_mask: int, or_mask: int) -> None:
+        """Read, modify and write the register."""
+        self._script.append((reg, and_mask & 0xFF, or_mask & 0xFF, True))
+
 
 class GPIOConfigTool:
     """
     GPIO config tool for LEC-7242.
+
+    :param str backend: ``"devport"`` to access the I/O ports through ``/dev/port``,
+        ``"portio"`` to use the ``portio`` extra,
+        ``"auto"`` (the default) to use ``/dev/port`` and fall back to ``portio``.
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
     """
 
     SIO_UART5_DEVICE = 0x14
@@ -41,9 +150,107 @@ class GPIOConfigTool:
 
     SIO_INDEX = 0x2e
     SIO_DATA = 0x2f
+    SIO_LDN = 0x07
 
-    def __init__(self):
-        pass
+    # The last known register values, keyed by (logical device or None, register).
+    _shadow: Dict[Tuple[Optional[int], int], int] = {}
+
+    def __init__(self, backend: str = "auto"):
+        # Check type.
+        if not isinstance(backend, str):
+            raise TypeError("'backend' type must be str")
+        # Check value.
+        if backend not in BACKENDS:
+            raise PSPInvalid(f"'backend' value must be one of {BACKENDS}")
+        self._backend = backend
+        self._io = None
+
+    @property
+    def backend(self) -> str:
+        """The selected I/O port backend, ``"devport"`` or ``"portio"`` once opened, otherwise as given."""
+        if isinstance(self._io, _DevPortIO):
+            return "devport"
+        if isinstance(self._io, _PortIO):
+            return "portio"
+        return self._backend
+
+    def _get_io(self):
+        """Open the I/O port backend on first use."""
+        if self._io is None:
+            if self._backend in ("auto", "devport"):
+                try:
+                    self._io = _DevPortIO()
+                except OSError as e:
+                    if self._backend == "devport":
+                        raise
+                    logger.debug(f"cannot open {DEV_PORT} ({e}), fall back to portio")
+            if self._io is None:
+                self._io = _PortIO()
+        return self._io
+
+    @property
+    def shadow(self) -> Dict[Tuple[Optional[int], int], int]:
+        """
+        The last known Super I/O register values as ``{(logical device, register): value}``.
+
+        The logical device is :data:`None` for the global registers (below ``0x30``).
+        """
+        return dict(self._shadow)
+
+    def run(self, transaction: SIOTransaction) -> List[int]:
+        """
+        Run a :class:`SIOTransaction` in one unlocked pass.
+
+        :param SIOTransaction transaction: the register accesses to run
+        :return: the register value after each step
+        :rtype: list[int]
+        :raises PermissionError: if not running as root user
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: A logical device register is accessed before a logical device is selected.
+        """
+        # Check permission.
+        if not is_root():
+            raise PermissionError("Please uses root user !!!")
+        # Check type.
+        if not isinstance(transaction, SIOTransaction):
+            raise TypeError("'transaction' type must be SIOTransaction")
+        # Check value.
+        for reg, _, _, _ in transaction._script:
+            if reg == self.SIO_LDN:
+                break
+            if reg >= 0x30:
+                raise PSPInvalid(f"register 0x{reg:02X} needs a logical device, call select() first")
+        # Run.
+        io = self._get_io()
+        inb, outb = io.inb, io.outb
+        values = []
+        cache: Dict[Tuple[Optional[int], int], int] = {}
+        device = index = None
+        self._sio_unlock()
+        try:
+            for reg, and_mask, or_mask, write in transaction._script:
+                key = (device if reg >= 0x30 else None, reg)
+                value = cache.get(key)
+                if and_mask and value is None:
+                    if index != reg:
+                        outb(reg, self.SIO_INDEX)
+                        index = reg
+                    value = cache[key] = inb(self.SIO_DATA)
+                new_value = ((value or 0) & and_mask) | or_mask
+                if write and new_value != value:
+                    if index != reg:
+                        outb(reg, self.SIO_INDEX)
+                        index = reg
+                    outb(new_value, self.SIO_DATA)
+                    cache[key] = new_value
+                if reg == self.SIO_LDN:
+                    device = new_value
+                values.append(new_value)
+        finally:
+            self._sio_lock()
+            GPIOConfigTool._shadow.update(cache)
+        logger.debug(f"run sio transaction of {len(transaction)} steps")
+        return values
 
     def set_com1_mode(self, mode: int) -> None:
         """
@@ -104,14 +311,53 @@ class GPIOConfigTool:
             self._com3_term_ctrl(0)
         logger.debug(f"set com1 termination {enable}")
 
+    def set_com1(self, mode: Optional[int] = None, termination: Optional[bool] = None) -> None:
+        """
+        Set COM1 mode and RS-422/RS-485 termination in one pass.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> GPIOConfigTool().set_com1(485, False)
+
+        :param mode: 232/422/485, :data:`None` to keep it
+        :type mode: int or None
+        :param termination: ``True`` = enable, ``False`` = disable, :data:`None` to keep it
+        :type termination: bool or None
+        :raises PermissionError: if not running as root user
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        """
+        # Check type.
+        if mode is not None and not isinstance(mode, int):
+            raise TypeError("'mode' type must be int")
+        if termination is not None and not isinstance(termination, bool):
+            raise TypeError("'termination' type must be bool")
+        # Check value.
+        mode_mapping = {232: 1, 422: 3, 485: 2}
+        if mode is not None and mode not in mode_mapping:
+            raise PSPInvalid("'mode' value must be 232 or 422 or 485")
+        # Set mode and termination.
+        transaction = SIOTransaction()
+        if mode is not None:
+            self._com3_switch_mode_script(transaction, mode_mapping[mode],
+                                          None if termination is None else int(termination))
+        elif termination is not None:
+            self._com3_term_ctrl_script(transaction, int(termination))
+        self.run(transaction)
+        logger.debug(f"set com1 mode {mode} termination {termination}")
+
     def _sio_unlock(self) -> None:
-        ioperm(self.SIO_INDEX, 2, 1)
-        outb(0x87, self.SIO_INDEX)
-        outb(0x87, self.SIO_INDEX)
+        io = self._get_io()
+        io.enable(self.SIO_INDEX, 2)
+        io.outb(0x87, self.SIO_INDEX)
+        io.outb(0x87, self.SIO_INDEX)
 
     def _sio_lock(self) -> None:
-        outb(0xaa, self.SIO_INDEX)
-        ioperm(self.SIO_INDEX, 2, 0)
+        io = self._get_io()
+        io.outb(0xaa, self.SIO_INDEX)
+        io.disable(self.SIO_INDEX, 2)
 
     def _com3_switch_mode(self, mode: int) -> None:
         """
@@ -120,84 +366,43 @@ class GPIOConfigTool:
         mode 2: rs485
         mode 3: rs422
         """
-        self._sio_unlock()
+        transaction = SIOTransaction()
+        self._com3_switch_mode_script(transaction, mode)
+        self.run(transaction)
 
-        # set multi function into gpio1x (13/16)
-        outb(0x27, self.SIO_INDEX)
-        xch = (inb(self.SIO_DATA) & 0xF2) | 0x04
-        outb(0x27, self.SIO_INDEX)
-        outb(xch, self.SIO_DATA)
-
-        outb(0x29, self.SIO_INDEX)
-        xch = inb(self.SIO_DATA) & 0xF9
-        outb(0x29, self.SIO_INDEX)
-        outb(xch, self.SIO_DATA)
-
-        outb(0x2c, self.SIO_INDEX)
-        xch = inb(self.SIO_DATA) | 0x48
-        outb(0x2c, self.SIO_INDEX)
-        outb(xch, self.SIO_DATA)
-
-        # set multi function into gpio2x (20)
-        outb(0x27, self.SIO_INDEX)
-        xch = (inb(self.SIO_DATA) & 0xF2) | 0x08
-        outb(0x27, self.SIO_INDEX)
-        outb(xch, self.SIO_DATA)
-
-        outb(0x29, self.SIO_INDEX)
-        xch = inb(self.SIO_DATA) & 0xF7
-        outb(0x29, self.SIO_INDEX)
-        outb(xch, self.SIO_DATA)
-
-        outb(0x2c, self.SIO_INDEX)
-        xch = inb(self.SIO_DATA) | 0x01
-        outb(0x2c, self.SIO_INDEX)
-        outb(xch, self.SIO_DATA)
-        # print("set multi function into gpio")
+    def _com3_switch_mode_script(self, transaction: SIOTransaction, mode: int, on_off: Optional[int] = 1) -> None:
+        # set multi function into gpio1x (13/16) and gpio2x (20),
+        # one write per register with the same result as setting them one after another
+        transaction.update(0x27, 0xF2, 0x08)
+        transaction.update(0x29, 0xF1, 0x00)
+        transaction.update(0x2c, 0xFF, 0x49)
 
         # enable GPIO logical device
-        outb(0x07, self.SIO_INDEX)
-        outb(self.SIO_GPIO_DEVICE, self.SIO_DATA)
+        transaction.select(self.SIO_GPIO_DEVICE)
 
         # active GPIO logic device
-        outb(self.SIO_GPIO_EN, self.SIO_INDEX)
-        xch = inb(self.SIO_DATA) | 0x01
-        outb(self.SIO_GPIO_EN, self.SIO_INDEX)
-        outb(xch, self.SIO_DATA)  # active GPIO
-        # print("active gpio function")
-
-        outb(self.REG_GPIO1_OUT_EN, self.SIO_INDEX)
-        xch = inb(self.SIO_DATA) | 0x48  # set gpio13/gpio16 output pins
-        outb(xch, self.SIO_DATA)
-
-        outb(self.REG_GPIO2_OUT_EN, self.SIO_INDEX)
-        xch = inb(self.SIO_DATA) | 0x01  # set gpio20 output pins
-        outb(xch, self.SIO_DATA)
+        transaction.update(self.SIO_GPIO_EN, 0xFF, 0x01)
 
-        outb(self.REG_GPIO1_OUT_DATA, self.SIO_INDEX)  # GPIO1 Output Data Register
-        xch = inb(self.SIO_DATA) & 0xBF  # clear gpio16 output pins
-        xch |= (mode << 5)  # set gpio16 output value
-        xch |= 0x08  # set gpio13 output 1
-        outb(xch, self.SIO_DATA)
+        transaction.update(self.REG_GPIO1_OUT_EN, 0xFF, 0x48)  # set gpio13/gpio16 output pins
+        transaction.update(self.REG_GPIO2_OUT_EN, 0xFF, 0x01)  # set gpio20 output pins
 
-        outb(self.REG_GPIO2_OUT_DATA, self.SIO_INDEX)  # GPIO2 Output Data Register
-        xch = inb(self.SIO_DATA) & 0xFE  # clear gpio20 output pins
-        xch |= mode  # set gpio20 output value
-        outb(xch, self.SIO_DATA)
-
-        self._sio_lock()
+        # clear gpio16 output pins, set gpio16 output value and set gpio13 output (term),
+        # gpio13 is kept when on_off is None
+        if on_off is None:
+            transaction.update(self.REG_GPIO1_OUT_DATA, 0xBF, mode << 5)
+        else:
+            transaction.update(self.REG_GPIO1_OUT_DATA, 0xB7, (mode << 5) | (0x08 if on_off else 0x00))
+        # clear gpio20 output pins, set gpio20 output value
+        transaction.update(self.REG_GPIO2_OUT_DATA, 0xFE, mode)
 
     def _com3_term_ctrl(self, on_off: int) -> None:
-        self._sio_unlock()
+        transaction = SIOTransaction()
+        self._com3_term_ctrl_script(transaction, on_off)
+        self.run(transaction)
 
+    def _com3_term_ctrl_script(self, transaction: SIOTransaction, on_off: int) -> None:
         # enable GPIO logical device
-        outb(0x07, self.SIO_INDEX)
-        outb(self.SIO_GPIO_DEVICE, self.SIO_DATA)
-
-        outb(self.REG_GPIO1_OUT_DATA, self.SIO_INDEX)  # GPIO1 Output Data Register
-        xch = inb(self.SIO_DATA) & 0xF7  # clear gpio13 output pins
-        if on_off:
-            xch |= 0x08  # set gpio13 output pins, enable term
-        outb(xch, self.SIO_DATA)
+        transaction.select(self.SIO_GPIO_DEVICE)
 
-        self._sio_lock()
+        # clear gpio13 output pins, set it to enable term
+        transaction.update(self.REG_GPIO1_OUT_DATA, 0xF7, 0x08 if on_off else 0x00)
@@ -1,7 +1,7 @@
 import logging
 from ctypes import addressof, byref, c_char_p, c_int8, sizeof
 from mmap import mmap, PROT_READ, MAP_SHARED
-from typing import Any, Dict, NamedTuple
+from typing import Any, Dict, NamedTuple, Optional
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
@@ -42,6 +42,8 @@ class DLL:
     """
     Dynamic Link Library.
     """
+    # The BIOS ID does not change while running, it is read once per process.
+    _bios_id: Optional[str] = None
 
     def __init__(self) -> None:
         pass
@@ -105,10 +107,12 @@ class DLL:
         else:
             raise PSPError(msg)
 
-    def get_bios_id(self) -> str:
+    def get_bios_id(self, refresh: bool = False) -> str:
         """
         Get the Lanner mother-board BIOS infromation.
 
+        The BIOS ID is read once and then served from memory.
+
         Example:
 
         .. code-block:: pycon
@@ -117,35 +121,62 @@ class DLL:
             >>> dll.get_bios_id()
             'LEB-7242B BIOS V1.12 "03/09/2022"'
 
+        :param bool refresh: set :data:`True` to read the BIOS ID again
         :return: the mother board BIOS information
         :rtype: str
         :raises PSPNotOpened: The library is not ready or opened yet.
         :raises PSPNotSupport: This platform does not support this function.
         :raises PSPError: General PSP functional error.
         """
+        if DLL._bios_id is not None and not refresh:
+            return DLL._bios_id
         try:
             str_bios_id = (c_int8 * 50)(*range(50))  # str_bios_id = create_string_buffer(50)
             with PSP() as psp:
                 i_ret = psp.lib.LMB_DLL_BIOSID(str_bios_id, sizeof(str_bios_id))
             msg = get_psp_exc_msg("LMB_DLL_BIOSID", i_ret)
             if i_ret == ERR_Success:
-                return c_char_p(addressof(str_bios_id)).value.decode().strip()
+                DLL._bios_id = c_char_p(addressof(str_bios_id)).value.decode().strip()
             elif i_ret == ERR_NotOpened:
                 raise PSPNotOpened(msg)
-            elif i_ret == PSPNotSupport:
+            elif i_ret == ERR_NotSupport:
                 raise PSPNotSupport(msg)
             else:
                 raise PSPError(msg)
         except AttributeError:
-            # `sudo usermod -g kmem yourID`
-            # `sudo busybox devmem 0x00ff58b 8 | xxd -r -p`
-            key = "*LIID "
-            with open("/dev/mem", "rb") as f:
-                mem = mmap(f.fileno(), 0x10000, MAP_SHARED, PROT_READ, offset=0x000f0000)
-            if mem is None:
-                return ""
-            if not mem.read(33 + len(key)).startswith(key.encode()):
-                # not found "*LIID"
-                # add here for BIOS uses traditional position F000:F58B
-                mem.seek(0xF58B)
-            return mem.read(33 + len(key)).decode().replace(key, "").strip().rsplit('"', 1)[0] + '"'
+            DLL._bios_id = self._read_bios_id_from_mem()
+        return DLL._bios_id
+
+    @classmethod
+    def _read_bios_id_from_mem(cls) -> str:
+        """
+        Read the BIOS ID from the BIOS area (F000:0000) when ``LMB_DLL_BIOSID`` is not available.
+
+        The ``*LIID`` record is parsed from a view of the mapping without copying it,
+        and the mapping is closed before returning.
+        """
+        # `sudo usermod -g kmem yourID`
+        # `sudo busybox devmem 0x00ff58b 8 | xxd -r -p`
+        key = b"*LIID "
+        size = 33 + len(key)
+        with open("/dev/mem", "rb") as f:
+            mem = mmap(f.fileno(), 0x10000, MAP_SHARED, PROT_READ, offset=0x000f0000)
+        try:
+            with memoryview(mem) as view:
+                start = 0
+                if view[:len(key)] != key:
+                    # not found "*LIID"
+                    # add here for BIOS uses traditional position F000:F58B
+                    start = 0xF58B
+                stop = start + size
+                if view[start:start + len(key)] == key:
+                    start += len(key)
+                # Keep up to the closing quote of the date.
+                end = stop
+                while end > start and view[end - 1] != ord('"'):
+                    end -= 1
+                if end == start:
+                    return str(view[start:stop], "utf-8").strip() + '"'
+                return str(view[start:end], "utf-8").strip()
+        finally:
+            mem.close()
@@ -1,11 +1,16 @@
 import logging
+from array import array
 from ctypes import byref, c_int32, c_uint8, c_uint32
 from math import log2
-from typing import Any, Dict, NamedTuple
+from threading import Event, RLock, Thread
+from time import perf_counter, strftime
+from typing import Any, Dict, NamedTuple, Optional, Sequence, TextIO, Tuple, Union
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
+    PSPBusyInUses,
     PSPError,
+    PSPInvalid,
     PSPNotOpened,
     PSPNotSupport,
 )
@@ -32,6 +37,80 @@ class GPIOInfoModel(NamedTuple):
         return dict(self._asdict())
 
 
+class GPIOCaptureModel(NamedTuple):
+    """
+    To store a run-length encoded GPI/DI capture.
+
+    Each run ``i`` starts at ``timestamps[i]`` seconds after the capture started,
+    holds the DI status ``values[i]`` and lasts for ``run_lengths[i]`` samples.
+    """
+    number_of_di_pins: int
+    timestamps: array
+    values: array
+    run_lengths: array
+    sample_count: int
+    duration: float
+    sample_rate: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+    def to_vcd(self, f: TextIO) -> None:
+        """
+        Export the capture as a Value Change Dump (VCD) file with one wire per DI pin.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> capture = gpio.capture(1.0)
+            >>> with open("di.vcd", "w") as f:
+            ...     capture.to_vcd(f)
+            ...
+
+        :param f: a writable text file object
+        """
+        # Printable identifier codes starting from "!".
+        ids = [chr(33 + i) for i in range(self.number_of_di_pins)]
+        f.write(f"$date {strftime('%Y-%m-%d %H:%M:%S')} $end\n")
+        f.write("$version lannerpsp GPIO capture $end\n")
+        f.write("$timescale 1 us $end\n")
+        f.write("$scope module gpio $end\n")
+        for i, code in enumerate(ids):
+            f.write(f"$var wire 1 {code} DI_{i} $end\n")
+        f.write("$upscope $end\n")
+        f.write("$enddefinitions $end\n")
+        last = None
+        for timestamp, value in zip(self.timestamps, self.values):
+            if last is None:
+                # Dump the initial value of every pin.
+                f.write("#0\n$dumpvars\n")
+                changed = (1 << self.number_of_di_pins) - 1
+            else:
+                f.write(f"#{round(timestamp * 1_000_000):d}\n")
+                changed = value ^ last
+            for i, code in enumerate(ids):
+                if changed >> i & 1:
+                    f.write(f"{value >> i & 1:d}{code}\n")
+            if last is None:
+                f.write("$end\n")
+            last = value
+        f.write(f"#{round(self.duration * 1_000_000):d}\n")
+
+
+class GPIOTimingModel(NamedTuple):
+    """To store the timing error of a :class:`GPIOSequencer` playback (in seconds)."""
+    steps: int
+    mean_error: float
+    max_error: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
 class GPIO:
     """
     General Purpose Input/Output.
@@ -44,6 +123,10 @@ class GPIO:
     :raises NotImplementedError: It has not been verified to run on this platform
         (when ``check_platform`` is set to :data:`True`).
     """
+    # Shadow of the DO register shared by all instances in this process.
+    _do_lock = RLock()
+    _do_shadow: Optional[int] = None
+    _number_of_do_pins: Optional[int] = None
 
     def __init__(self, check_platform: bool = False) -> None:
         self._version = DLL().get_version()
@@ -187,21 +270,27 @@ class GPIO:
         :raises PSPError: General PSP functional error.
         """
         gpio_info = self.get_info()
+        with PSP() as psp:
+            try:
+                return self._read_digital_out(psp, gpio_info.number_of_do_pins)
+            finally:
+                self._close_ign_port(psp)
+
+    def _read_digital_out(self, psp: PSP, number_of_do_pins: int) -> int:
+        """
+        Read the GPO/DO status in an opened PSP session.
+
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
         udw_dio_stat = c_int32(0)
         if self._version.platform_id in ("LEB-2680",):
             # Use ignition MCU.
-            with PSP() as psp:
-                i_ret = psp.lib.LMB_IGN_GetDigitalOut(2 ** gpio_info.number_of_do_pins - 1, byref(udw_dio_stat))
-                psp.lib.LMB_IGN_ClosePort()  # Prevent the UART of the MCU from being occupied.
+            i_ret = psp.lib.LMB_IGN_GetDigitalOut(2 ** number_of_do_pins - 1, byref(udw_dio_stat))
             msg = get_psp_exc_msg("LMB_IGN_GetDigitalOut", i_ret)
         else:
-            with PSP() as psp:
-                i_ret = psp.lib.LMB_GPIO_GpoRead(0, byref(udw_dio_stat))
-                try:
-                    # Prevent the UART of the MCU from being occupied.
-                    psp.lib.LMB_IGN_ClosePort()
-                except AttributeError:
-                    pass
+            i_ret = psp.lib.LMB_GPIO_GpoRead(0, byref(udw_dio_stat))
             msg = get_psp_exc_msg("LMB_GPIO_GpoRead", i_ret)
         if i_ret == ERR_Success:
             logger.debug(f"read DO status: 0x{udw_dio_stat.value:02X}")
@@ -235,26 +324,515 @@ class GPIO:
         if not isinstance(status, int):
             raise TypeError("'status' type must be int")
         gpio_info = self.get_info()
+        with GPIO._do_lock:
+            with PSP() as psp:
+                try:
+                    self._write_digital_out(psp, status, gpio_info.number_of_do_pins)
+                except PSPError:
+                    GPIO._do_shadow = None
+                    raise
+                finally:
+                    self._close_ign_port(psp)
+            GPIO._do_shadow = status & (2 ** gpio_info.number_of_do_pins - 1)
+            GPIO._number_of_do_pins = gpio_info.number_of_do_pins
+
+    def sync_digital_out(self) -> int:
+        """
+        Re-read the GPO/DO status into the shadow register used by
+        :meth:`set_pin`, :meth:`clear_pin`, :meth:`toggle_pin`, :meth:`write_masked` and :meth:`write_pins`.
+
+        Call this after the DO status was changed outside of this process.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> gpio.sync_digital_out()
+            3
+
+        :return: GPO/DO status in decimal. When converted to binary, the LSB represents DO_0.
+        :rtype: int
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        with GPIO._do_lock:
+            GPIO._do_shadow = None
+            gpio_info = self.get_info()
+            status = self.get_digital_out()
+            GPIO._do_shadow = status & (2 ** gpio_info.number_of_do_pins - 1)
+            GPIO._number_of_do_pins = gpio_info.number_of_do_pins
+            return GPIO._do_shadow
+
+    def set_pin(self, pin: int) -> None:
+        """
+        Set a single GPO/DO pin to high.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> gpio.set_pin(2)  # DO_2 -> high
+
+        :param int pin: DO pin number, starting from 0
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        self.write_pins({pin: True})
+
+    def clear_pin(self, pin: int) -> None:
+        """
+        Set a single GPO/DO pin to low.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> gpio.clear_pin(2)  # DO_2 -> low
+
+        :param int pin: DO pin number, starting from 0
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        self.write_pins({pin: False})
+
+    def toggle_pin(self, pin: int) -> None:
+        """
+        Invert a single GPO/DO pin.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> gpio.toggle_pin(2)  # DO_2 -> high if it was low, otherwise low
+
+        :param int pin: DO pin number, starting from 0
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        if not isinstance(pin, int):
+            raise TypeError("'pin' type must be int")
+        with GPIO._do_lock:
+            shadow = self._get_do_shadow()
+            self._check_pin(pin)
+            self.write_masked(1 << pin, ~shadow)
+
+    def write_pins(self, pins: Dict[int, bool]) -> None:
+        """
+        Set several GPO/DO pins with a single write.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> gpio.write_pins({0: True, 1: False, 3: True})
+
+        :param dict pins: mapping of DO pin number (starting from 0) to
+            :data:`True` for high or :data:`False` for low
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(pins, dict):
+            raise TypeError("'pins' type must be dict")
+        for pin, high in pins.items():
+            if not isinstance(pin, int):
+                raise TypeError("'pin' type must be int")
+            if not isinstance(high, bool):
+                raise TypeError("'high' type must be bool")
+        # Run.
+        mask = 0
+        value = 0
+        with GPIO._do_lock:
+            self._get_do_shadow()
+            for pin, high in pins.items():
+                self._check_pin(pin)
+                mask |= 1 << pin
+                if high:
+                    value |= 1 << pin
+            self.write_masked(mask, value)
+
+    def write_masked(self, mask: int, value: int) -> None:
+        """
+        Read-modify-write the GPO/DO pins selected by ``mask`` from the shadow register.
+
+        Only the bits set in ``mask`` are taken from ``value``, the other pins keep their current status.
+        The shadow register is synchronized from the hardware on first use (see :meth:`sync_digital_out`),
+        so every call costs a single locked write.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> gpio.set_digital_out(0b0011)
+            >>> gpio.write_masked(0b0110, 0b0100)
+            >>> gpio.get_digital_out()
+            5
+
+        :param int mask: DO pins to change, the LSB represents DO_0
+        :param int value: new status of the selected DO pins, the LSB represents DO_0
+        :raises TypeError: The input parameters type error.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(mask, int):
+            raise TypeError("'mask' type must be int")
+        if not isinstance(value, int):
+            raise TypeError("'value' type must be int")
+        # Run.
+        with GPIO._do_lock:
+            shadow = self._get_do_shadow()
+            pins_mask = 2 ** GPIO._number_of_do_pins - 1
+            status = (shadow & ~mask | value & mask) & pins_mask
+            with PSP() as psp:
+                try:
+                    self._write_digital_out(psp, status, GPIO._number_of_do_pins)
+                except PSPError:
+                    # The real DO status is unknown now, re-read it on next use.
+                    GPIO._do_shadow = None
+                    raise
+                finally:
+                    self._close_ign_port(psp)
+            GPIO._do_shadow = status
+
+    def _get_do_shadow(self) -> int:
+        """Get the shadow of the DO register, synchronize it from the hardware on first use."""
+        if GPIO._do_shadow is None:
+            self.sync_digital_out()
+        return GPIO._do_shadow
+
+    def _check_pin(self, pin: int) -> None:
+        """Check the DO pin number against the synchronized DO information."""
+        if not 0 <= pin < GPIO._number_of_do_pins:
+            raise PSPInvalid(f"'pin' value must be between 0 and {GPIO._number_of_do_pins - 1}")
+
+    def _write_digital_out(self, psp: PSP, status: int, number_of_do_pins: int) -> None:
+        """
+        Write the GPO/DO status in an opened PSP session.
+
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
         if self._version.platform_id in ("LEB-2680",):
             # Use ignition MCU.
-            with PSP() as psp:
-                i_ret = psp.lib.LMB_IGN_SetDigitalOut(2 ** gpio_info.number_of_do_pins - 1, status)
-                psp.lib.LMB_IGN_ClosePort()  # Prevent the UART of the MCU from being occupied.
+            i_ret = psp.lib.LMB_IGN_SetDigitalOut(2 ** number_of_do_pins - 1, status)
             msg = get_psp_exc_msg("LMB_IGN_SetDigitalOut", i_ret)
         else:
-            with PSP() as psp:
-                i_ret = psp.lib.LMB_GPIO_GpoWrite(0, status)
-                try:
-                    # Prevent the UART of the MCU from being occupied.
-                    psp.lib.LMB_IGN_ClosePort()
-                except AttributeError:
-                    pass
+            i_ret = psp.lib.LMB_GPIO_GpoWrite(0, status)
             msg = get_psp_exc_msg("LMB_GPIO_GpoWrite", i_ret)
         if i_ret == ERR_Success:
-            logger.debug(f"write DI status: {status:d}")
+            logger.debug(f"write DO status: 0x{status:02X}")
+        elif i_ret == ERR_NotSupport:
+            raise PSPNotSupport(msg)
+        elif i_ret == ERR_NotOpened:
+            raise PSPNotOpened(msg)
+        else:
+            raise PSPError(msg)
+
+    @classmethod
+    def _close_ign_port(cls, psp: PSP) -> None:
+        """Prevent the UART of the MCU from being occupied."""
+        try:
+            psp.lib.LMB_IGN_ClosePort()
+        except AttributeError:
+            pass
+
+    def capture(self, duration: float, max_runs: int = 65536) -> GPIOCaptureModel:
+        """
+        Sample the GPI/DI status as fast as possible for ``duration`` seconds (logic-analyzer mode).
+
+        All samples are read in a single PSP session. Consecutive identical samples are
+        run-length encoded into preallocated buffers, so memory only grows with the number
+        of level changes. The capture stops early when ``max_runs`` changes were recorded.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> gpio = GPIO()
+            >>> capture = gpio.capture(0.5)
+            >>> capture.sample_count
+            41873
+            >>> round(capture.sample_rate)
+            83746
+            >>> list(capture.values)
+            [12, 13, 12]
+
+        :param float duration: capture time in seconds
+        :param int max_runs: maximum number of runs (level changes) to record
+        :return: The run-length encoded capture.
+        :rtype: GPIOCaptureModel
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(duration, (float, int)):
+            raise TypeError("'duration' type must be float or int")
+        if not isinstance(max_runs, int):
+            raise TypeError("'max_runs' type must be int")
+        # Check value.
+        if duration <= 0:
+            raise PSPInvalid("'duration' value must be > 0")
+        if max_runs <= 0:
+            raise PSPInvalid("'max_runs' value must be > 0")
+        # Preallocate the buffers.
+        gpio_info = self.get_info()
+        timestamps = array("d", [0.0]) * max_runs
+        values = array("I", [0]) * max_runs
+        run_lengths = array("I", [0]) * max_runs
+        udw_dio_stat = c_int32(0)
+        p_dio_stat = byref(udw_dio_stat)
+        runs = 0
+        sample_count = 0
+        last = -1
+        i_ret = ERR_Success
+        use_ign = self._version.platform_id in ("LEB-2680",)
+        with PSP() as psp:
+            if use_ign:
+                # Use ignition MCU.
+                func_name = "LMB_IGN_GetDigitalIn"
+                func = psp.lib.LMB_IGN_GetDigitalIn
+                args = (2 ** gpio_info.number_of_di_pins - 1, p_dio_stat)
+            else:
+                func_name = "LMB_GPIO_GpiRead"
+                func = psp.lib.LMB_GPIO_GpiRead
+                args = (0, p_dio_stat)
+            start_time = perf_counter()
+            deadline = start_time + duration
+            now = start_time
+            while now < deadline:
+                i_ret = func(*args)
+                now = perf_counter()
+                if i_ret != ERR_Success:
+                    break
+                sample_count += 1
+                value = udw_dio_stat.value
+                if value == last:
+                    run_lengths[runs - 1] += 1
+                    continue
+                if runs == max_runs:
+                    sample_count -= 1
+                    break
+                timestamps[runs] = now - start_time
+                values[runs] = value
+                run_lengths[runs] = 1
+                runs += 1
+                last = value
+            elapsed = now - start_time
+            try:
+                # Prevent the UART of the MCU from being occupied.
+                psp.lib.LMB_IGN_ClosePort()
+            except AttributeError:
+                pass
+        msg = get_psp_exc_msg(func_name, i_ret)
+        if i_ret == ERR_Success:
+            logger.debug(f"captured {sample_count:d} DI samples ({runs:d} runs) in {elapsed:.3f} seconds")
         elif i_ret == ERR_NotSupport:
             raise PSPNotSupport(msg)
         elif i_ret == ERR_NotOpened:
             raise PSPNotOpened(msg)
         else:
             raise PSPError(msg)
+        # Drop the unused part of the buffers.
+        del timestamps[runs:]
+        del values[runs:]
+        del run_lengths[runs:]
+        return GPIOCaptureModel(
+            number_of_di_pins=gpio_info.number_of_di_pins,
+            timestamps=timestamps,
+            values=values,
+            run_lengths=run_lengths,
+            sample_count=sample_count,
+            duration=elapsed,
+            sample_rate=sample_count / elapsed if elapsed > 0 else 0.0,
+        )
+
+
+class GPIOSequencer:
+    """
+    Play a GPO/DO waveform from a dedicated thread in one PSP session.
+
+    Each step is a ``(mask, value, duration)`` tuple: the DO pins selected by ``mask``
+    are set to ``value`` (see :meth:`GPIO.write_masked`), then the step is held for
+    ``duration`` seconds. Steps are scheduled against absolute deadlines, so the timing
+    error does not accumulate over the sequence.
+
+    Example for 3x 200 ms pulses on DO_0:
+
+    .. code-block:: pycon
+
+        >>> sequencer = GPIOSequencer()
+        >>> sequencer.start([(0b1, 0b1, 0.2), (0b1, 0b0, 0.2)], repeat=3)
+        >>> sequencer.wait()
+        True
+        >>> sequencer.get_timing()
+        GPIOTimingModel(steps=6, mean_error=0.00012, max_error=0.00031)
+
+    :param GPIO gpio: the :class:`GPIO` to drive. Defaults to a new :class:`GPIO`.
+    :raises TypeError: The input parameters type error.
+    """
+
+    def __init__(self, gpio: Optional[GPIO] = None) -> None:
+        if gpio is None:
+            gpio = GPIO()
+        if not isinstance(gpio, GPIO):
+            raise TypeError("'gpio' type must be GPIO")
+        self._gpio = gpio
+        self._thread: Optional[Thread] = None
+        self._cancel = Event()
+        self._exc: Optional[BaseException] = None
+        self._steps = 0
+        self._error_sum = 0.0
+        self._max_error = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if a waveform is being played."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, steps: Sequence[Tuple[int, int, Union[float, int]]], repeat: int = 1) -> None:
+        """
+        Start playing the waveform in the background.
+
+        :param steps: list of ``(mask, value, duration)`` steps
+        :param int repeat: number of times to play the steps, ``0`` to repeat until :meth:`cancel`
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPBusyInUses: A waveform is already being played.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(steps, (list, tuple)):
+            raise TypeError("'steps' type must be list or tuple")
+        if not isinstance(repeat, int):
+            raise TypeError("'repeat' type must be int")
+        for step in steps:
+            if not isinstance(step, (list, tuple)) or len(step) != 3:
+                raise TypeError("'step' must be a (mask, value, duration) tuple")
+            mask, value, duration = step
+            if not isinstance(mask, int) or not isinstance(value, int):
+                raise TypeError("'mask' and 'value' type must be int")
+            if not isinstance(duration, (float, int)):
+                raise TypeError("'duration' type must be float or int")
+            # Check value.
+            if duration < 0:
+                raise PSPInvalid("'duration' value must be >= 0")
+        # Check value.
+        if not steps:
+            raise PSPInvalid("'steps' must not be empty")
+        if repeat < 0:
+            raise PSPInvalid("'repeat' value must be >= 0")
+        if self.is_running:
+            raise PSPBusyInUses("A waveform is already being played")
+        # Run.
+        with GPIO._do_lock:
+            self._gpio._get_do_shadow()
+        self._cancel.clear()
+        self._exc = None
+        self._steps = 0
+        self._error_sum = 0.0
+        self._max_error = 0.0
+        self._thread = Thread(target=self._run, args=(tuple(steps), repeat), daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Stop the playback after the current step. The DO pins keep their last status.
+        """
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, timeout: Optional[Union[float, int]] = None) -> bool:
+        """
+        Wait until the playback is finished or cancelled.
+
+        :type timeout: float or int or None
+        :param timeout: Number of seconds to wait, :data:`None` (the default) to wait indefinitely.
+        :return: :data:`True` if the playback is finished, :data:`False` on timeout.
+        :rtype: bool
+        :raises PSPError: The error raised by the playback thread.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return False
+        if self._exc is not None:
+            raise self._exc
+        return True
+
+    def get_timing(self) -> GPIOTimingModel:
+        """
+        Get the timing error of the steps played so far.
+
+        :return: the achieved timing error
+        :rtype: GPIOTimingModel
+        """
+        steps, error_sum, max_error = self._steps, self._error_sum, self._max_error
+        if not steps:
+            return GPIOTimingModel(steps=0, mean_error=0.0, max_error=0.0)
+        return GPIOTimingModel(steps=steps, mean_error=error_sum / steps, max_error=max_error)
+
+    def _run(self, steps: Tuple[Tuple[int, int, Union[float, int]], ...], repeat: int) -> None:
+        """Thread target of :meth:`start`."""
+        gpio = self._gpio
+        number_of_do_pins = GPIO._number_of_do_pins
+        pins_mask = 2 ** number_of_do_pins - 1
+        try:
+            with PSP() as psp:
+                try:
+                    count = 0
+                    deadline = perf_counter()
+                    while repeat == 0 or count < repeat:
+                        for mask, value, duration in steps:
+                            with GPIO._do_lock:
+                                shadow = GPIO._do_shadow
+                                if shadow is None:
+                                    # Reset by another thread after a failed write, re-read it.
+                                    shadow = gpio._read_digital_out(psp, number_of_do_pins) & pins_mask
+                                status = (shadow & ~mask | value & mask) & pins_mask
+                                try:
+                                    gpio._write_digital_out(psp, status, number_of_do_pins)
+                                except PSPError:
+                                    GPIO._do_shadow = None
+                                    raise
+                                GPIO._do_shadow = status
+                            error = perf_counter() - deadline
+                            self._steps += 1
+                            self._error_sum += error
+                            self._max_error = max(self._max_error, error)
+                            deadline += duration
+                            if self._cancel.wait(max(deadline - perf_counter(), 0.0)):
+                                return
+                        count += 1
+                finally:
+                    gpio._close_ign_port(psp)
+        except BaseException as e:
+            logger.error(f"GPIO sequencer stopped: {e}")
+            self._exc = e
@@ -1,11 +1,19 @@
+import cmath
+import json
 import logging
-from ctypes import byref
-from time import sleep
-from typing import Any, Dict, NamedTuple
+import os
+from array import array
+from ctypes import byref, sizeof
+from math import acos, ceil, cos, degrees, pi, radians, sqrt
+from threading import Condition, Event, Thread
+from time import perf_counter, sleep, strftime, time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
+    PSPBusyInUses,
     PSPError,
+    PSPInvalid,
     PSPNotSupport,
 )
 from .lmbinc import (
@@ -20,6 +28,10 @@ logger = logging.getLogger(__name__)
 SUPPORTED_PLATFORMS = ("V3S", "V6S",)
 UNSUPPORTED_PLATFORMS = ("LEB-2680", "LEB-7242", "LEC-2290", "LEC-7230", "NCA-2510",)
 
+# The g per raw count of each range (±g).
+G_STEPS = {2: 2 / 255, 4: 4 / 255, 8: 8 / 255, 16: 16 / 255}
+DEFAULT_GSR_BANDS = ((1, 10), (10, 30), (30, 100))  # Hz.
+
 
 class GSRDataModel(NamedTuple):
     """To store G-Sensor data."""
@@ -47,6 +59,93 @@ class GSROffsetModel(NamedTuple):
         return dict(self._asdict())
 
 
+class GSRBlockModel(NamedTuple):
+    """
+    To store a block of streamed G-Sensor samples.
+
+    ``samples`` is a flat int16 view of ``(raw_x, raw_y, raw_z, g_range)`` records and
+    ``timestamps`` a float64 view of the sample times in seconds since the stream started.
+    Both views share the memory of the stream's ring buffer (no copy is made), so a block
+    is only valid until the stream has written ``capacity - 1`` more samples.
+    """
+    sequence: int
+    sample_count: int
+    samples: memoryview
+    timestamps: memoryview
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+    def to_numpy(self) -> Tuple[Any, Any]:
+        """
+        Get the block as NumPy arrays without copying.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> samples, timestamps = block.to_numpy()
+            >>> samples.shape
+            (128, 4)
+            >>> samples[:, 2].mean()
+            -215.4
+
+        :return: an int16 array of shape ``(sample_count, 4)`` and a float64 array of shape ``(sample_count,)``
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        :raises RuntimeError: NumPy is not installed.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise RuntimeError("Install lannerpsp with 'numpy' extra in order to use NumPy arrays.")
+        samples = numpy.frombuffer(self.samples, dtype=numpy.int16).reshape(self.sample_count, 4)
+        timestamps = numpy.frombuffer(self.timestamps, dtype=numpy.float64)
+        return samples, timestamps
+
+
+class GSRFeatureModel(NamedTuple):
+    """
+    To store the vibration features of a window of G-Sensor samples.
+
+    Values are in g (``band_power`` in g²) and are given per axis as ``(x, y, z)``.
+    ``mean`` is the static part of the window (gravity), the other features are
+    computed on the samples with the mean removed. ``band_power`` holds the power
+    of each frequency band, summed over the 3 axes.
+    """
+    sequence: int
+    sample_count: int
+    mean: Tuple[float, float, float]
+    rms: Tuple[float, float, float]
+    peak: Tuple[float, float, float]
+    crest_factor: Tuple[float, float, float]
+    band_power: Tuple[float, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
+class GSREventModel(NamedTuple):
+    """
+    To store a G-Sensor shock or tilt event recorded by :class:`GSRTrigger`.
+
+    ``kind`` is ``"shock"`` or ``"tilt"``, ``value`` the triggering magnitude in g or
+    tilt angle in degrees, and ``path`` the event record written to disk.
+    """
+    kind: str
+    value: float
+    sequence: int
+    timestamp: float
+    pre_trigger: int
+    sample_count: int
+    path: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
 class GSR:
     """
     G-Sensor.
@@ -114,15 +213,9 @@ class GSR:
         else:
             raise PSPError(msg)
 
-        if stu_raw_data.w_g_range == 2:
-            f_mg_step = 2 / 255
-        elif stu_raw_data.w_g_range == 4:
-            f_mg_step = 4 / 255
-        elif stu_raw_data.w_g_range == 8:
-            f_mg_step = 8 / 255
-        elif stu_raw_data.w_g_range == 16:
-            f_mg_step = 16 / 255
-        else:
+        try:
+            f_mg_step = G_STEPS[stu_raw_data.w_g_range]
+        except KeyError:
             raise PSPError(f"'w_g_range' = {stu_raw_data.w_g_range}")
 
         f_x_mg = stu_raw_data.w_x_axis * f_mg_step
@@ -263,3 +356,728 @@ class GSR:
                     print(f"Offset Z-Axis={stu_raw_data.w_z_axis:d}")
 
                 sleep(0.5)
+
+
+class GSRStream:
+    """
+    Stream G-Sensor samples from a dedicated thread in one PSP session.
+
+    ``LMB_GSR_GetAxisData`` writes each sample directly into a preallocated int16 ring
+    buffer of ``capacity`` ``(raw_x, raw_y, raw_z, g_range)`` records, with a float64
+    timestamp per sample. :meth:`read` hands out :class:`GSRBlockModel` views of that
+    buffer, so no object is allocated per sample.
+
+    The consumer must keep up with the stream: samples overwritten before they were
+    read are skipped and counted in :attr:`overruns`.
+
+    Example for 400 samples per second:
+
+    .. code-block:: pycon
+
+        >>> with GSRStream(sample_rate=400) as stream:
+        ...     for block in stream:
+        ...         samples, timestamps = block.to_numpy()
+        ...         print(block.sequence, samples[:, :3].std(axis=0))
+
+    :param sample_rate: number of samples per second
+    :type sample_rate: float or int
+    :param int capacity: number of samples held by the ring buffer,
+        one of them is kept free for the sample being written
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self, sample_rate: Union[float, int] = 200, capacity: int = 4096) -> None:
+        # Check type.
+        if not isinstance(sample_rate, (float, int)):
+            raise TypeError("'sample_rate' type must be float or int")
+        if not isinstance(capacity, int):
+            raise TypeError("'capacity' type must be int")
+        # Check value.
+        if sample_rate <= 0:
+            raise PSPInvalid("'sample_rate' value must be > 0")
+        if capacity < 2:
+            raise PSPInvalid("'capacity' value must be >= 2")
+        self._sample_rate = sample_rate
+        self._capacity = capacity
+        # One AxisRawData record (x, y, z, g_range) per sample.
+        self._samples = array("h", bytes(sizeof(AxisRawData) * capacity))
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._slots = (AxisRawData * capacity).from_buffer(self._samples)
+        self._samples_view = memoryview(self._samples)
+        self._timestamps_view = memoryview(self._timestamps)
+        self._cond = Condition()
+        self._written = 0
+        self._cursor = 0
+        self._overruns = 0
+        self._running = False
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self._exc: Optional[BaseException] = None
+
+    def __enter__(self) -> "GSRStream":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    def __iter__(self) -> Iterator[GSRBlockModel]:
+        while True:
+            block = self.read()
+            if block is None:
+                return
+            yield block
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the stream thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def sample_count(self) -> int:
+        """The number of samples written since :meth:`start`."""
+        return self._written
+
+    @property
+    def overruns(self) -> int:
+        """The number of samples overwritten before they were read."""
+        return self._overruns
+
+    def start(self) -> None:
+        """
+        Start streaming in the background.
+
+        :raises PSPBusyInUses: The stream is already running.
+        """
+        if self.is_running:
+            raise PSPBusyInUses("The G-Sensor stream is already running")
+        with self._cond:
+            self._written = 0
+            self._cursor = 0
+            self._overruns = 0
+            self._running = True
+        self._stop.clear()
+        self._exc = None
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop streaming. The samples not read yet can still be read.
+
+        :raises PSPError: The error raised by the stream thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._exc is not None:
+            exc, self._exc = self._exc, None
+            raise exc
+
+    def read(self,
+             max_samples: Optional[int] = None,
+             timeout: Optional[Union[float, int]] = None) -> Optional[GSRBlockModel]:
+        """
+        Wait for new samples and return them as a zero-copy block.
+
+        A block never wraps around the end of the ring buffer, so it may hold fewer
+        samples than are available; the rest is returned by the next call.
+
+        :param max_samples: maximum number of samples in the block, :data:`None` for no limit
+        :type max_samples: int or None
+        :type timeout: float or int or None
+        :param timeout: Number of seconds to wait, :data:`None` (the default) to wait indefinitely.
+        :return: the next block, :data:`None` on timeout or when stopped and all samples were read
+        :rtype: GSRBlockModel or None
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        """
+        # Check type.
+        if max_samples is not None and not isinstance(max_samples, int):
+            raise TypeError("'max_samples' type must be int or None")
+        # Check value.
+        if max_samples is not None and max_samples <= 0:
+            raise PSPInvalid("'max_samples' value must be > 0")
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._written > self._cursor or not self._running, timeout):
+                return None
+            if self._written == self._cursor:
+                return None
+            # Keep one slot free, so the next sample is never written into the returned block.
+            if self._written - self._cursor > self._capacity - 1:
+                skipped = self._written - (self._capacity - 1) - self._cursor
+                logger.warning(f"G-Sensor stream overrun, {skipped} samples skipped")
+                self._overruns += skipped
+                self._cursor += skipped
+            sequence = self._cursor
+            start = sequence % self._capacity
+            count = min(self._written - sequence, self._capacity - start)
+            if max_samples is not None:
+                count = min(count, max_samples)
+            self._cursor += count
+        return GSRBlockModel(
+            sequence=sequence,
+            sample_count=count,
+            samples=self._samples_view[start * 4:(start + count) * 4],
+            timestamps=self._timestamps_view[start:start + count],
+        )
+
+    def _copy(self, sequence: int, count: int) -> Tuple[array, array]:
+        """
+        Copy ``count`` samples from ``sequence`` out of the ring buffer.
+
+        :raises PSPInvalid: The samples are no longer or not yet in the ring buffer.
+        """
+        with self._cond:
+            if sequence < self._written - (self._capacity - 1) or sequence + count > self._written:
+                raise PSPInvalid(f"samples {sequence}~{sequence + count - 1} are not in the ring buffer")
+        samples, timestamps = array("h"), array("d")
+        while count:
+            start = sequence % self._capacity
+            n = min(count, self._capacity - start)
+            samples.extend(self._samples_view[start * 4:(start + n) * 4])
+            timestamps.extend(self._timestamps_view[start:start + n])
+            sequence += n
+            count -= n
+        return samples, timestamps
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        period = 1 / self._sample_rate
+        slots = self._slots
+        timestamps = self._timestamps
+        capacity = self._capacity
+        try:
+            with PSP() as psp:
+                get_axis_data = psp.lib.LMB_GSR_GetAxisData
+                start_time = perf_counter()
+                deadline = start_time
+                written = 0
+                while not self._stop.is_set():
+                    index = written % capacity
+                    i_ret = get_axis_data(byref(slots[index]))
+                    now = perf_counter()
+                    if i_ret != ERR_Success:
+                        msg = get_psp_exc_msg("LMB_GSR_GetAxisData", i_ret)
+                        if i_ret == ERR_NotSupport:
+                            raise PSPNotSupport(msg)
+                        raise PSPError(msg)
+                    timestamps[index] = now - start_time
+                    written += 1
+                    with self._cond:
+                        self._written = written
+                        self._cond.notify_all()
+                    deadline += period
+                    if deadline < now:
+                        # Fell behind (e.g. a slow bus read), do not try to catch up in a burst.
+                        deadline = now
+                    elif self._stop.wait(deadline - now):
+                        break
+        except BaseException as e:
+            logger.error(f"G-Sensor stream stopped: {e}")
+            self._exc = e
+        finally:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+
+
+class GSRAnalyzer:
+    """
+    Compute vibration features over windows of streamed G-Sensor samples.
+
+    :meth:`feed` takes the :class:`GSRBlockModel` blocks of a :class:`GSRStream`, scales
+    the raw data to g with the offset correction, and returns a :class:`GSRFeatureModel`
+    for each full window of ``window`` samples: RMS, peak, crest factor and the power
+    of each frequency band (Hann-windowed FFT).
+
+    The computation is vectorized with NumPy when it is installed, otherwise a pure
+    Python implementation gives the same results more slowly.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> gsr = GSR()
+        >>> analyzer = GSRAnalyzer(400, window=512, offset=gsr.get_offset())
+        >>> with GSRStream(sample_rate=400) as stream:
+        ...     for block in stream:
+        ...         for features in analyzer.feed(block):
+        ...             print(features.rms, features.band_power)
+
+    :param sample_rate: number of samples per second of the stream
+    :type sample_rate: float or int
+    :param int window: number of samples per window, must be a power of 2
+    :param bands: ``(low, high)`` frequency bands in Hz, ``low`` included and ``high`` excluded
+    :param GSROffsetModel offset: the offset to subtract from the raw data (see :meth:`GSR.get_offset`)
+    :param use_numpy: :data:`True` to require NumPy, :data:`False` to use pure Python,
+        :data:`None` (the default) to use NumPy when it is installed
+    :type use_numpy: bool or None
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    :raises RuntimeError: NumPy is required but not installed.
+    """
+
+    def __init__(self,
+                 sample_rate: Union[float, int],
+                 window: int = 256,
+                 bands: Sequence[Tuple[Union[float, int], Union[float, int]]] = DEFAULT_GSR_BANDS,
+                 offset: Optional[GSROffsetModel] = None,
+                 use_numpy: Optional[bool] = None) -> None:
+        # Check type.
+        if not isinstance(sample_rate, (float, int)):
+            raise TypeError("'sample_rate' type must be float or int")
+        if not isinstance(window, int):
+            raise TypeError("'window' type must be int")
+        if not isinstance(bands, (list, tuple)):
+            raise TypeError("'bands' type must be list or tuple")
+        for band in bands:
+            if (not isinstance(band, (list, tuple)) or len(band) != 2 or
+                    not all(isinstance(f, (float, int)) for f in band)):
+                raise TypeError("'band' must be a (low, high) tuple")
+        if offset is not None and not isinstance(offset, GSROffsetModel):
+            raise TypeError("'offset' type must be GSROffsetModel")
+        if use_numpy is not None and not isinstance(use_numpy, bool):
+            raise TypeError("'use_numpy' type must be bool or None")
+        # Check value.
+        if sample_rate <= 0:
+            raise PSPInvalid("'sample_rate' value must be > 0")
+        if window < 2 or window & (window - 1):
+            raise PSPInvalid("'window' value must be a power of 2")
+        for low, high in bands:
+            if not 0 <= low < high <= sample_rate / 2:
+                raise PSPInvalid(f"'band' must be within (0~{sample_rate / 2}) Hz with low < high")
+        self._np = None
+        if use_numpy is not False:
+            try:
+                import numpy
+                self._np = numpy
+            except ImportError:
+                if use_numpy:
+                    raise RuntimeError("Install lannerpsp with 'numpy' extra in order to use NumPy arrays.")
+        self._sample_rate = sample_rate
+        self._window = window
+        self._offset = (0, 0, 0) if offset is None else (offset.raw_x, offset.raw_y, offset.raw_z)
+        # FFT bins of each band.
+        bins = window // 2 + 1
+        self._bands = tuple(
+            (min(ceil(low * window / sample_rate), bins), min(ceil(high * window / sample_rate), bins))
+            for low, high in bands
+        )
+        # Hann window and one-sided power spectrum scaling, so that the band powers sum up to the mean square.
+        hann = [0.5 - 0.5 * cos(2 * pi * i / window) for i in range(window)]
+        scale = 1 / (window * sum(w * w for w in hann))
+        weights = [2 * scale] * bins
+        weights[0] = weights[-1] = scale
+        if self._np is not None:
+            self._hann = self._np.array(hann)[:, None]
+            self._weights = self._np.array(weights)
+        else:
+            self._hann = hann
+            self._weights = weights
+        self.reset()
+
+    @property
+    def is_numpy(self) -> bool:
+        """Returns :data:`True` if the computation uses NumPy."""
+        return self._np is not None
+
+    def reset(self) -> None:
+        """Drop the samples of the incomplete window."""
+        self._sequence = 0
+        if self._np is not None:
+            self._pending = self._np.empty((0, 3))
+        else:
+            self._pending = [array("d"), array("d"), array("d")]
+
+    def scale(self, block: GSRBlockModel) -> Any:
+        """
+        Convert a block of raw samples to g, with the offset correction.
+
+        :param GSRBlockModel block: the block to convert
+        :return: an array of shape ``(sample_count, 3)`` with NumPy, otherwise a list of 3 ``array('d')`` (x, y, z)
+        :raises PSPError: The block holds an unknown range.
+        """
+        if self._np is not None:
+            np = self._np
+            raw = np.frombuffer(block.samples, dtype=np.int16).reshape(block.sample_count, 4)
+            g_range = raw[:, 3:]
+            if not np.isin(g_range, tuple(G_STEPS)).all():
+                raise PSPError(f"'w_g_range' = {g_range[~np.isin(g_range, tuple(G_STEPS))][0]}")
+            return (raw[:, :3] - np.array(self._offset)) * (g_range / 255)
+        offset_x, offset_y, offset_z = self._offset
+        x, y, z = array("d"), array("d"), array("d")
+        samples = block.samples
+        for i in range(0, block.sample_count * 4, 4):
+            try:
+                step = G_STEPS[samples[i + 3]]
+            except KeyError:
+                raise PSPError(f"'w_g_range' = {samples[i + 3]}")
+            x.append((samples[i] - offset_x) * step)
+            y.append((samples[i + 1] - offset_y) * step)
+            z.append((samples[i + 2] - offset_z) * step)
+        return [x, y, z]
+
+    def feed(self, block: GSRBlockModel) -> List[GSRFeatureModel]:
+        """
+        Add a block of samples and compute the features of each window it completes.
+
+        Samples skipped by a stream overrun break the window: the incomplete window
+        is dropped and a new one starts with the block.
+
+        :param GSRBlockModel block: the next block of the stream
+        :return: the features of the completed windows, possibly empty
+        :rtype: list[GSRFeatureModel]
+        :raises TypeError: The input parameters type error.
+        :raises PSPError: The block holds an unknown range.
+        """
+        # Check type.
+        if not isinstance(block, GSRBlockModel):
+            raise TypeError("'block' type must be GSRBlockModel")
+        if block.sequence != self._sequence + self._pending_count():
+            self.reset()
+            self._sequence = block.sequence
+        data = self.scale(block)
+        if self._np is not None:
+            self._pending = self._np.concatenate((self._pending, data))
+        else:
+            for pending, axis in zip(self._pending, data):
+                pending.extend(axis)
+        window = self._window
+        features = []
+        while self._pending_count() >= window:
+            if self._np is not None:
+                features.append(self._analyze_numpy(self._pending[:window]))
+                self._pending = self._pending[window:]
+            else:
+                features.append(self._analyze_python([axis[:window] for axis in self._pending]))
+                for axis in self._pending:
+                    del axis[:window]
+            self._sequence += window
+        return features
+
+    def _pending_count(self) -> int:
+        """Number of samples of the incomplete window."""
+        if self._np is not None:
+            return len(self._pending)
+        return len(self._pending[0])
+
+    def _analyze_numpy(self, data: Any) -> GSRFeatureModel:
+        """Compute the features of a ``(window, 3)`` array."""
+        np = self._np
+        mean = data.mean(axis=0)
+        ac = data - mean
+        rms = np.sqrt((ac * ac).mean(axis=0))
+        peak = np.abs(ac).max(axis=0)
+        crest_factor = np.divide(peak, rms, out=np.zeros(3), where=rms > 0)
+        spectrum = np.fft.rfft(ac * self._hann, axis=0)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).sum(axis=1) * self._weights
+        return GSRFeatureModel(
+            sequence=self._sequence,
+            sample_count=self._window,
+            mean=tuple(mean.tolist()),
+            rms=tuple(rms.tolist()),
+            peak=tuple(peak.tolist()),
+            crest_factor=tuple(crest_factor.tolist()),
+            band_power=tuple(float(power[low:high].sum()) for low, high in self._bands),
+        )
+
+    def _analyze_python(self, axes: List[array]) -> GSRFeatureModel:
+        """Compute the features of 3 (x, y, z) arrays of ``window`` samples."""
+        window = self._window
+        means, rms_values, peaks, crest_factors = [], [], [], []
+        power = [0.0] * (window // 2 + 1)
+        for axis in axes:
+            mean = sum(axis) / window
+            ac = [v - mean for v in axis]
+            rms = sqrt(sum(v * v for v in ac) / window)
+            peak = max(abs(v) for v in ac)
+            means.append(mean)
+            rms_values.append(rms)
+            peaks.append(peak)
+            crest_factors.append(peak / rms if rms > 0 else 0.0)
+            spectrum = _fft([v * w for v, w in zip(ac, self._hann)])
+            for k, weight in enumerate(self._weights):
+                c = spectrum[k]
+                power[k] += (c.real * c.real + c.imag * c.imag) * weight
+        return GSRFeatureModel(
+            sequence=self._sequence,
+            sample_count=window,
+            mean=tuple(means),
+            rms=tuple(rms_values),
+            peak=tuple(peaks),
+            crest_factor=tuple(crest_factors),
+            band_power=tuple(sum(power[low:high]) for low, high in self._bands),
+        )
+
+
+class GSRTrigger:
+    """
+    Record the G-Sensor waveform around shocks and tilts, from a dedicated thread.
+
+    The samples of a :class:`GSRStream` are checked one by one against the thresholds
+    with integer arithmetic on the raw data only. When a threshold is crossed, the
+    ``pre_trigger`` samples before and ``post_trigger`` samples after the trigger are
+    copied out of the stream's ring buffer and written to ``directory`` as a JSON event
+    record. Nothing else is stored between events.
+
+    * A *shock* is a sample whose acceleration magnitude exceeds ``shock_threshold`` g
+      (about 1 g at rest, because of gravity).
+    * A *tilt* is a sample whose direction differs by more than ``tilt_threshold``
+      degrees from the reference direction, which is the mean of the first 16 samples.
+
+    After an event, triggers are ignored for ``holdoff`` seconds.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> trigger = GSRTrigger("/var/log/gsr", shock_threshold=2.5, tilt_threshold=30,
+        ...                      on_event=print)
+        >>> trigger.start()
+        GSREventModel(kind='shock', value=3.41, sequence=81234, timestamp=1667808000.1, pre_trigger=200, sample_count=400, path='/var/log/gsr/gsr-20221107-080000-shock-81234.json')
+
+    :param str directory: the directory of the event records, created if needed
+    :param sample_rate: number of samples per second
+    :type sample_rate: float or int
+    :param int pre_trigger: number of samples recorded before the trigger
+    :param int post_trigger: number of samples recorded from the trigger on
+    :param shock_threshold: magnitude in g to trigger a shock event, :data:`None` to disable
+    :type shock_threshold: float or int or None
+    :param tilt_threshold: angle in degrees (0~180) to trigger a tilt event, :data:`None` to disable
+    :type tilt_threshold: float or int or None
+    :param holdoff: number of seconds to ignore triggers after an event
+    :type holdoff: float or int
+    :param on_event: called from the trigger thread with each :class:`GSREventModel`
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    REFERENCE_SAMPLES = 16
+
+    def __init__(self,
+                 directory: str,
+                 sample_rate: Union[float, int] = 200,
+                 pre_trigger: int = 200,
+                 post_trigger: int = 200,
+                 shock_threshold: Optional[Union[float, int]] = 2.5,
+                 tilt_threshold: Optional[Union[float, int]] = None,
+                 holdoff: Union[float, int] = 1,
+                 on_event: Optional[Callable[[GSREventModel], Any]] = None) -> None:
+        # Check type.
+        if not isinstance(directory, str):
+            raise TypeError("'directory' type must be str")
+        if not isinstance(pre_trigger, int):
+            raise TypeError("'pre_trigger' type must be int")
+        if not isinstance(post_trigger, int):
+            raise TypeError("'post_trigger' type must be int")
+        if shock_threshold is not None and not isinstance(shock_threshold, (float, int)):
+            raise TypeError("'shock_threshold' type must be float or int or None")
+        if tilt_threshold is not None and not isinstance(tilt_threshold, (float, int)):
+            raise TypeError("'tilt_threshold' type must be float or int or None")
+        if not isinstance(holdoff, (float, int)):
+            raise TypeError("'holdoff' type must be float or int")
+        if on_event is not None and not callable(on_event):
+            raise TypeError("'on_event' must be callable")
+        # Check value.
+        if pre_trigger < 0:
+            raise PSPInvalid("'pre_trigger' value must be >= 0")
+        if post_trigger <= 0:
+            raise PSPInvalid("'post_trigger' value must be > 0")
+        if shock_threshold is None and tilt_threshold is None:
+            raise PSPInvalid("'shock_threshold' or 'tilt_threshold' must be set")
+        if shock_threshold is not None and shock_threshold <= 0:
+            raise PSPInvalid("'shock_threshold' value must be > 0")
+        if tilt_threshold is not None and not 0 < tilt_threshold < 180:
+            raise PSPInvalid("'tilt_threshold' value must be between 0 and 180")
+        if holdoff < 0:
+            raise PSPInvalid("'holdoff' value must be >= 0")
+        # The ring buffer must hold an event while the previous one is being written.
+        self._stream = GSRStream(sample_rate=sample_rate,
+                                 capacity=max(4096, 4 * (pre_trigger + post_trigger)))
+        self._directory = directory
+        self._sample_rate = sample_rate
+        self._pre_trigger = pre_trigger
+        self._post_trigger = post_trigger
+        self._holdoff = int(holdoff * sample_rate)
+        self._on_event = on_event
+        # Squared thresholds in raw counts of each range, to avoid sqrt per sample.
+        self._shock2 = None if shock_threshold is None else {
+            g_range: (shock_threshold / step) ** 2 for g_range, step in G_STEPS.items()
+        }
+        self._cos_tilt = None if tilt_threshold is None else cos(radians(tilt_threshold))
+        self._events: List[GSREventModel] = []
+        self._thread: Optional[Thread] = None
+        self._exc: Optional[BaseException] = None
+
+    def __enter__(self) -> "GSRTrigger":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the trigger thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def events(self) -> List[GSREventModel]:
+        """The events recorded since :meth:`start`."""
+        return list(self._events)
+
+    def start(self) -> None:
+        """
+        Start streaming and watching for events in the background.
+
+        :raises PSPBusyInUses: The trigger is already running.
+        :raises OSError: The directory cannot be created.
+        """
+        if self.is_running:
+            raise PSPBusyInUses("The G-Sensor trigger is already running")
+        os.makedirs(self._directory, exist_ok=True)
+        self._events = []
+        self._exc = None
+        self._stream.start()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop streaming. A pending event is dropped.
+
+        :raises PSPError: The error raised by the stream or trigger thread.
+        """
+        try:
+            self._stream.stop()
+        finally:
+            if self._thread is not None:
+                self._thread.join()
+        if self._exc is not None:
+            exc, self._exc = self._exc, None
+            raise exc
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        shock2 = self._shock2
+        cos_tilt = self._cos_tilt
+        cos2_tilt = None if cos_tilt is None else cos_tilt * cos_tilt
+        reference = [0, 0, 0]
+        reference_count = 0
+        reference2 = 0
+        armed_at = 0  # Sequence from which triggers are accepted.
+        pending: Optional[Tuple[str, float, int, float]] = None  # (kind, value, sequence, wall time)
+        try:
+            for block in self._stream:
+                samples = block.samples
+                for i in range(block.sample_count):
+                    sequence = block.sequence + i
+                    if pending is not None:
+                        if sequence + 1 >= pending[2] + self._post_trigger:
+                            try:
+                                self._record(*pending)
+                            except (PSPInvalid, OSError) as e:
+                                # The samples were overwritten or the record cannot be written, skip the event.
+                                logger.error(f"record G-Sensor {pending[0]} event failure: {e}")
+                            pending = None
+                            armed_at = sequence + 1 + self._holdoff
+                        continue
+                    j = i * 4
+                    x, y, z = samples[j], samples[j + 1], samples[j + 2]
+                    m2 = x * x + y * y + z * z
+                    if reference_count < self.REFERENCE_SAMPLES:
+                        reference[0] += x
+                        reference[1] += y
+                        reference[2] += z
+                        reference_count += 1
+                        if reference_count == self.REFERENCE_SAMPLES:
+                            reference2 = sum(r * r for r in reference)
+                        continue
+                    if sequence < armed_at:
+                        continue
+                    if shock2 is not None and m2 > shock2.get(samples[j + 3], m2):
+                        value = sqrt(m2) * G_STEPS[samples[j + 3]]
+                        pending = ("shock", value, sequence, time())
+                    elif cos2_tilt is not None and m2 and reference2:
+                        # cos(angle) < cos(threshold), squared to avoid sqrt per sample.
+                        dot = x * reference[0] + y * reference[1] + z * reference[2]
+                        limit = cos2_tilt * m2 * reference2
+                        if (dot < 0 or dot * dot < limit) if cos_tilt >= 0 else (dot < 0 and dot * dot > limit):
+                            value = degrees(acos(max(-1.0, min(1.0, dot / sqrt(m2 * reference2)))))
+                            pending = ("tilt", value, sequence, time())
+                    if pending is not None:
+                        logger.info(f"G-Sensor {pending[0]} event: {pending[1]:.2f} at sample {sequence}")
+        except BaseException as e:
+            logger.error(f"G-Sensor trigger stopped: {e}")
+            self._exc = e
+
+    def _record(self, kind: str, value: float, sequence: int, timestamp: float) -> None:
+        """Copy the samples around an event out of the ring buffer and write the event record."""
+        start = max(sequence - self._pre_trigger, 0)
+        count = sequence + self._post_trigger - start
+        samples, timestamps = self._stream._copy(start, count)
+        path = os.path.join(
+            self._directory,
+            f"gsr-{strftime('%Y%m%d-%H%M%S')}-{kind}-{sequence}.json",
+        )
+        record = {
+            "kind": kind,
+            "value": value,
+            "sequence": sequence,
+            "timestamp": timestamp,
+            "sample_rate": self._sample_rate,
+            "pre_trigger": sequence - start,
+            "fields": ["raw_x", "raw_y", "raw_z", "g_range"],
+            "samples": [samples[i:i + 4].tolist() for i in range(0, len(samples), 4)],
+            "timestamps": timestamps.tolist(),
+        }
+        with open(path, "w") as f:
+            json.dump(record, f)
+        event = GSREventModel(
+            kind=kind,
+            value=value,
+            sequence=sequence,
+            timestamp=timestamp,
+            pre_trigger=sequence - start,
+            sample_count=count,
+            path=path,
+        )
+        self._events.append(event)
+        logger.debug(f"write G-Sensor event record: {path}")
+        if self._on_event is not None:
+            try:
+                self._on_event(event)
+            except Exception as e:
+                logger.error(f"G-Sensor trigger callback failed: {e}")
+
+
+def _fft(values: List[complex]) -> List[complex]:
+    """Iterative radix-2 FFT, the pure Python fallback of :func:`numpy.fft.fft`."""
+    n = len(values)
+    result = list(values)
+    # Bit-reversal permutation.
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            result[i], result[j] = result[j], result[i]
+    # Butterflies.
+    size = 2
+    while size <= n:
+        half = size // 2
+        twiddles = [cmath.exp(-2j * cmath.pi * k / size) for k in range(half)]
+        for start in range(0, n, size):
+            for k in range(half):
+                t = twiddles[k] * result[start + k + half]
+                result[start + k + half] = result[start + k] - t
+                result[start + k] += t
+        size *= 2
+    return result
@@ -1,5 +1,12 @@
+import asyncio
+import json
 import logging
-from ctypes import byref, c_char_p, c_int32, c_uint8, CFUNCTYPE, sizeof
+import os
+from ctypes import byref, c_char_p, c_int32, c_uint8, CFUNCTYPE, create_string_buffer, sizeof
+from queue import Empty, Full, Queue
+from threading import Condition, Event, RLock, Thread
+from time import monotonic
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
@@ -27,10 +34,40 @@ UNSUPPORTED_PLATFORMS = ("LEB-2680", "LEB-7242", "LEC-2290", "LEC-7230", "V3S",
 
 DEFAULT_LCM_PORT = "/dev/ttyS1"
 DEFAULT_BAUD_RATE = 19200
+DEFAULT_LCM_CACHE_PATH = "/var/cache/lannerpsp/lcm.json"
+
+LCM_PORT_SIZE = 64
 
 LCM_UART_TYPE = 1
 LCM_LPT_TYPE = 2
 
+DEFAULT_LCM_ROWS = 2
+DEFAULT_LCM_COLUMNS = 20
+
+
+class LCMPortModel(NamedTuple):
+    """To store the discovered LCM port."""
+    port: str
+    baud_rate: int
+    mode_no: int
+    firmware_version: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
+class LCMKeyEventModel(NamedTuple):
+    """To store a LCM key event."""
+    key: int
+    pressed: bool
+    is_repeat: bool
+    timestamp: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
 
 class LCM:
     """
@@ -70,17 +107,33 @@ class LCM:
         :raises PSPError: General PSP functional error.
         """
         # TODO: Example
-        dw_speed = c_int32(self._dw_speed)
         with PSP() as psp:
-            if self._version.dll_major == 2 and self._version.dll_minor in (1, 2, 3):
-                i_ret = psp.lib.LMB_LCM_SearchPort(self._str_lcm_port, byref(dw_speed))
-            elif self._version.dll_major == 3 and self._version.dll_minor in (0,):
-                i_ret = psp.lib.LMB_LCM_SearchPort(self._str_lcm_port, byref(dw_speed), sizeof(self._str_lcm_port))
-            else:
-                raise NotImplementedError
+            port, speed = self._search_port(psp)
+        return f"port={port}, speed={speed:d}"
+
+    def _search_port(self, psp: PSP) -> Tuple[str, int]:
+        """
+        Scan the serial ports and baud rates for the LCM.
+
+        :return: the port and speed the LCM is currently connected to
+        :rtype: typing.Tuple[str, int]
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotExist: This function is not enabled or does not exist.
+        :raises PSPError: General PSP functional error.
+        """
+        str_lcm_port = create_string_buffer(self._str_lcm_port.value, LCM_PORT_SIZE)
+        dw_speed = c_int32(self._dw_speed)
+        if self._version.dll_major == 2 and self._version.dll_minor in (1, 2, 3):
+            i_ret = psp.lib.LMB_LCM_SearchPort(str_lcm_port, byref(dw_speed))
+        elif self._version.dll_major == 3 and self._version.dll_minor in (0,):
+            i_ret = psp.lib.LMB_LCM_SearchPort(str_lcm_port, byref(dw_speed), sizeof(str_lcm_port))
+        else:
+            raise NotImplementedError
         msg = get_psp_exc_msg("LMB_LCM_SearchPort", i_ret)
         if i_ret == ERR_Success:
-            return f"port={self._str_lcm_port}, speed={dw_speed.value:d}"
+            logger.debug(f"LCM found on port {str_lcm_port.value.decode()} speed {dw_speed.value:d}")
+            return str_lcm_port.value.decode(), dw_speed.value
         elif i_ret == ERR_NotOpened:
             raise PSPNotOpened(msg)
         elif i_ret == ERR_NotSupport:
@@ -90,6 +143,97 @@ class LCM:
         else:
             raise PSPError(msg)
 
+    def discover(self, cache_path: str = DEFAULT_LCM_CACHE_PATH, refresh: bool = False) -> LCMPortModel:
+        """
+        Find the LCM port and speed once and remember them in a cache file.
+
+        On later calls the cached port and speed are validated with a single ``LMB_LCM_DeviceInfo``
+        round trip instead of scanning all serial ports and baud rates again. The port is rescanned
+        when the cache is missing, invalid or ``refresh`` is :data:`True`.
+
+        This :class:`LCM` instance uses the discovered port and speed afterwards.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> lcm = LCM()
+            >>> lcm.discover()
+            LCMPortModel(port='/dev/ttyS1', baud_rate=19200, mode_no=8224, firmware_version=256)
+
+        :param str cache_path: path of the cache file
+        :param bool refresh: set :data:`True` to ignore the cache and scan again
+        :return: the LCM port, speed and device information
+        :rtype: LCMPortModel
+        :raises TypeError: The input parameters type error.
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotExist: This function is not enabled or does not exist.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(cache_path, str):
+            raise TypeError("'cache_path' type must be str")
+        if not isinstance(refresh, bool):
+            raise TypeError("'refresh' type must be bool")
+        # Try the cached port and speed first.
+        cached = None if refresh else self._load_port_cache(cache_path)
+        if cached is not None:
+            self._str_lcm_port = c_char_p(cached.port.encode())
+            self._dw_speed = cached.baud_rate
+            with PSP() as psp:
+                try:
+                    self._open_port(psp)
+                    try:
+                        stu_lcm_info = self._read_device_info(psp)
+                    finally:
+                        self._close_device(psp)
+                except PSPError as e:
+                    logger.debug(f"cached LCM port is invalid: {e}")
+                    stu_lcm_info = None
+            if stu_lcm_info is not None and stu_lcm_info.uw_mode_no == cached.mode_no:
+                return cached._replace(firmware_version=stu_lcm_info.uw_version)
+        # Scan.
+        with PSP() as psp:
+            port, speed = self._search_port(psp)
+            self._str_lcm_port = c_char_p(port.encode())
+            self._dw_speed = speed
+            self._open_port(psp)
+            try:
+                stu_lcm_info = self._read_device_info(psp)
+            finally:
+                self._close_device(psp)
+        lcm_port = LCMPortModel(
+            port=port,
+            baud_rate=speed,
+            mode_no=stu_lcm_info.uw_mode_no,
+            firmware_version=stu_lcm_info.uw_version,
+        )
+        self._save_port_cache(cache_path, lcm_port)
+        return lcm_port
+
+    @classmethod
+    def _load_port_cache(cls, cache_path: str) -> Optional[LCMPortModel]:
+        """Load the discovered LCM port from the cache file, :data:`None` if it is missing or invalid."""
+        try:
+            with open(cache_path) as f:
+                return LCMPortModel(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"LCM port cache '{cache_path}' is not usable: {e}")
+            return None
+
+    @classmethod
+    def _save_port_cache(cls, cache_path: str, lcm_port: LCMPortModel) -> None:
+        """Save the discovered LCM port to the cache file atomically."""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(lcm_port.to_dict(), f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"save LCM port cache '{cache_path}' failure: {e}")
+
     def _open_port(self, psp: PSP) -> None:
         """
         Open the LCM device with path and assigned speed.
@@ -157,6 +301,26 @@ class LCM:
         else:
             raise PSPError(msg)
 
+    def _read_device_info(self, psp: PSP) -> LCMInfo:
+        """
+        Read platform LCM device information from an opened port.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        stu_lcm_info = LCMInfo()
+        i_ret = psp.lib.LMB_LCM_DeviceInfo(byref(stu_lcm_info))
+        msg = get_psp_exc_msg("LMB_LCM_DeviceInfo", i_ret)
+        if i_ret == ERR_Success:
+            return stu_lcm_info
+        elif i_ret == ERR_NotOpened:
+            raise PSPNotOpened(msg)
+        elif i_ret == ERR_NotSupport:
+            raise PSPNotSupport(msg)
+        else:
+            raise PSPError(msg)
+
     def _get_device_info(self, psp: PSP) -> int:
         """
         Get platform LCM device information.
@@ -268,20 +432,31 @@ class LCM:
         # Run.
         with PSP() as psp:
             self._open_device(psp)
-            i_ret = psp.lib.LMB_LCM_SetCursor(column, row)
-            msg = get_psp_exc_msg("LMB_LCM_SetCursor", i_ret)
-            if i_ret == ERR_Success:
-                logger.debug(f"set LCM cursor to row {row} column {column}")
-            elif i_ret == ERR_Invalid:
-                raise PSPInvalid(msg)
-            elif i_ret == ERR_NotOpened:
-                raise PSPNotOpened(msg)
-            elif i_ret == ERR_NotSupport:
-                raise PSPNotSupport(msg)
-            else:
-                raise PSPError(msg)
+            self._set_cursor(psp, row, column)
             self._close_device(psp)
 
+    def _set_cursor(self, psp: PSP, row: int, column: int) -> None:
+        """
+        Set LCM cursor on an opened LCD module.
+
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        i_ret = psp.lib.LMB_LCM_SetCursor(column, row)
+        msg = get_psp_exc_msg("LMB_LCM_SetCursor", i_ret)
+        if i_ret == ERR_Success:
+            logger.debug(f"set LCM cursor to row {row} column {column}")
+        elif i_ret == ERR_Invalid:
+            raise PSPInvalid(msg)
+        elif i_ret == ERR_NotOpened:
+            raise PSPNotOpened(msg)
+        elif i_ret == ERR_NotSupport:
+            raise PSPNotSupport(msg)
+        else:
+            raise PSPError(msg)
+
     def write(self, msg: str) -> None:
         """
         Write string to LCD module.
@@ -308,18 +483,28 @@ class LCM:
         # Run.
         with PSP() as psp:
             self._open_device(psp)
-            i_ret = psp.lib.LMB_LCM_WriteString(c_char_p(msg.encode()))
-            msg = get_psp_exc_msg("LMB_LCM_WriteString", i_ret)
-            if i_ret == ERR_Success:
-                logger.debug(f"write '{msg}' on LCM")
-            elif i_ret == ERR_NotOpened:
-                raise PSPNotOpened(msg)
-            elif i_ret == ERR_NotSupport:
-                raise PSPNotSupport(msg)
-            else:
-                raise PSPError(msg)
+            self._write_string(psp, msg)
             self._close_device(psp)
 
+    def _write_string(self, psp: PSP, string: str) -> None:
+        """
+        Write string to an opened LCD module at the current cursor.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        i_ret = psp.lib.LMB_LCM_WriteString(c_char_p(string.encode()))
+        msg = get_psp_exc_msg("LMB_LCM_WriteString", i_ret)
+        if i_ret == ERR_Success:
+            logger.debug(f"write '{string}' on LCM")
+        elif i_ret == ERR_NotOpened:
+            raise PSPNotOpened(msg)
+        elif i_ret == ERR_NotSupport:
+            raise PSPNotSupport(msg)
+        else:
+            raise PSPError(msg)
+
     def clear(self) -> None:
         """
         Clear LCM display.
@@ -337,18 +522,28 @@ class LCM:
         """
         with PSP() as psp:
             self._open_device(psp)
-            i_ret = psp.lib.LMB_LCM_DisplayClear()
-            msg = get_psp_exc_msg("LMB_LCM_DisplayClear", i_ret)
-            if i_ret == ERR_Success:
-                logger.debug(f"clear string on LCM")
-            elif i_ret == ERR_NotOpened:
-                raise PSPNotOpened(msg)
-            elif i_ret == ERR_NotSupport:
-                raise PSPNotSupport(msg)
-            else:
-                raise PSPError(msg)
+            self._clear(psp)
             self._close_device(psp)
 
+    def _clear(self, psp: PSP) -> None:
+        """
+        Clear display of an opened LCD module.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        i_ret = psp.lib.LMB_LCM_DisplayClear()
+        msg = get_psp_exc_msg("LMB_LCM_DisplayClear", i_ret)
+        if i_ret == ERR_Success:
+            logger.debug(f"clear string on LCM")
+        elif i_ret == ERR_NotOpened:
+            raise PSPNotOpened(msg)
+        elif i_ret == ERR_NotSupport:
+            raise PSPNotSupport(msg)
+        else:
+            raise PSPError(msg)
+
     def get_keys_status(self) -> int:
         """
         Get LCM keys status.
@@ -447,3 +642,945 @@ class LCM:
             if i_ret == ERR_Success:
                 print("----> hook LCM Keys Callback Disable OK <----")
             self._close_device(psp)
+
+
+class LCMRenderStatsModel(NamedTuple):
+    """To store :class:`LCMRenderQueue` statistics."""
+    posted: int
+    rendered: int
+    dropped: int
+    errors: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
+def _diff_spans(old: str, new: str, max_gap: int = 2) -> List[Tuple[int, str]]:
+    """
+    Get the spans of ``new`` that differ from ``old`` as ``(start, text)`` tuples.
+
+    Spans separated by at most ``max_gap`` unchanged characters are merged,
+    because resending a few characters is cheaper than another cursor positioning.
+    """
+    spans = []
+    start = end = -1
+    for i, (a, b) in enumerate(zip(old, new)):
+        if a == b:
+            continue
+        if start < 0:
+            start = i
+        elif i - end > max_gap + 1:
+            spans.append((start, new[start:end + 1]))
+            start = i
+        end = i
+    if start >= 0:
+        spans.append((start, new[start:end + 1]))
+    return spans
+
+
+def _marquee_frames(text: str, width: int, gap: str) -> Tuple[str, ...]:
+    """
+    Pre-compute the frames of ``text`` scrolling one character per frame through ``width`` columns.
+
+    A text that fits in ``width`` columns is a single static frame.
+    """
+    if len(text) <= width:
+        return (text.ljust(width),)
+    loop = text + gap
+    doubled = loop + loop[:width]
+    return tuple(doubled[i:i + width] for i in range(len(loop)))
+
+
+class LCMFrameBuffer:
+    """
+    Keep the LCD module open and only send the changed character cells.
+
+    A shadow of the displayed rows is kept in memory. Each new frame passed to :meth:`draw`
+    is compared with the shadow, and only the changed spans are sent to the LCD module
+    by cursor positioning plus partial writes.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> with LCMFrameBuffer() as fb:
+        ...     fb.draw(["Lanner NCA-2510", "CPU 42C"])
+        ...     fb.draw(["Lanner NCA-2510", "CPU 43C"])  # Only "3" is sent.
+        ...
+
+    :param LCM lcm: the :class:`LCM` to drive. Defaults to a new :class:`LCM`.
+    :param int rows: number of rows of the LCD module
+    :param int columns: number of columns of the LCD module
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self,
+                 lcm: Optional[LCM] = None,
+                 rows: int = DEFAULT_LCM_ROWS,
+                 columns: int = DEFAULT_LCM_COLUMNS) -> None:
+        if lcm is None:
+            lcm = LCM()
+        # Check type.
+        if not isinstance(lcm, LCM):
+            raise TypeError("'lcm' type must be LCM")
+        if not isinstance(rows, int):
+            raise TypeError("'rows' type must be int")
+        if not isinstance(columns, int):
+            raise TypeError("'columns' type must be int")
+        # Check value.
+        if rows <= 0:
+            raise PSPInvalid("'rows' value must be > 0")
+        if columns <= 0:
+            raise PSPInvalid("'columns' value must be > 0")
+        self._lcm = lcm
+        self._rows = rows
+        self._columns = columns
+        self._lock = RLock()
+        self._psp: Optional[PSP] = None
+        self._shadow: List[str] = []
+
+    def __enter__(self) -> "LCMFrameBuffer":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+    @property
+    def rows(self) -> int:
+        """Number of rows of the LCD module."""
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        """Number of columns of the LCD module."""
+        return self._columns
+
+    @property
+    def is_open(self) -> bool:
+        """Returns :data:`True` if the LCD module is held open."""
+        return self._psp is not None
+
+    @property
+    def shadow(self) -> List[str]:
+        """A copy of the rows currently displayed on the LCD module."""
+        with self._lock:
+            return list(self._shadow)
+
+    def open(self) -> None:
+        """
+        Open the LCD module and clear the display.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotExist: This function is not enabled or does not exist.
+        :raises PSPError: General PSP functional error.
+        """
+        with self._lock:
+            if self._psp is not None:
+                return
+            psp = PSP()
+            psp.__enter__()
+            try:
+                self._lcm._open_device(psp)
+                self._lcm._clear(psp)
+            except BaseException:
+                psp.__exit__(None, None, None)
+                raise
+            self._psp = psp
+            self._shadow = [" " * self._columns for _ in range(self._rows)]
+
+    def close(self) -> None:
+        """
+        Close the LCD module. The display keeps its content.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        with self._lock:
+            if self._psp is None:
+                return
+            psp, self._psp = self._psp, None
+            try:
+                self._lcm._close_device(psp)
+            finally:
+                psp.__exit__(None, None, None)
+
+    def draw(self, lines: Sequence[str]) -> int:
+        """
+        Display a new frame and only send the cells that changed since the last frame.
+
+        Missing rows are blank, each row is padded or truncated to the number of columns.
+
+        :param lines: the text of each row
+        :return: number of characters sent to the LCD module
+        :rtype: int
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotOpened: The LCD module is not opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(lines, (list, tuple)):
+            raise TypeError("'lines' type must be list or tuple")
+        for line in lines:
+            if not isinstance(line, str):
+                raise TypeError("'line' type must be str")
+        # Check value.
+        if len(lines) > self._rows:
+            raise PSPInvalid(f"'lines' can only have up to {self._rows} rows")
+        # Run.
+        with self._lock:
+            return self._draw_rows({row: line for row, line in enumerate(lines)}, self._rows)
+
+    def draw_region(self, row: int, column: int, text: str) -> int:
+        """
+        Update only ``text`` starting at ``row`` and ``column`` (both start from 1), keep the other cells.
+
+        :param int row: row of the first character
+        :param int column: column of the first character
+        :param str text: text to display, truncated at the end of the row
+        :return: number of characters sent to the LCD module
+        :rtype: int
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotOpened: The LCD module is not opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(row, int):
+            raise TypeError("'row' type must be int")
+        if not isinstance(column, int):
+            raise TypeError("'column' type must be int")
+        if not isinstance(text, str):
+            raise TypeError("'text' type must be str")
+        # Check value.
+        if not 1 <= row <= self._rows:
+            raise PSPInvalid(f"'row' value must be between 1 and {self._rows}")
+        if not 1 <= column <= self._columns:
+            raise PSPInvalid(f"'column' value must be between 1 and {self._columns}")
+        # Run.
+        with self._lock:
+            self._check_open()
+            old = self._shadow[row - 1]
+            new = old[:column - 1] + text[:self._columns - column + 1]
+            new += old[len(new):]
+            return self._draw_rows({row - 1: new}, 0)
+
+    def invalidate(self) -> None:
+        """
+        Forget the shadow, so the next frame is fully redrawn.
+
+        Call this when the display was changed outside of this frame buffer.
+        """
+        with self._lock:
+            # A shadow that matches no printable character forces a full redraw.
+            self._shadow = ["\0" * self._columns for _ in range(self._rows)]
+
+    def _check_open(self) -> None:
+        """Check the LCD module is held open."""
+        if self._psp is None:
+            raise PSPNotOpened("LCM frame buffer is not opened yet")
+
+    def _draw_rows(self, lines: Dict[int, str], blank_rows: int) -> int:
+        """
+        Send the changed spans of ``lines`` (row index to text), rows below ``blank_rows``
+        that are not in ``lines`` are blanked. Must be called with the lock held.
+        """
+        self._check_open()
+        sent = 0
+        for row in range(self._rows):
+            if row in lines:
+                new = lines[row][:self._columns].ljust(self._columns)
+            elif row < blank_rows:
+                new = " " * self._columns
+            else:
+                continue
+            old = self._shadow[row]
+            for start, text in _diff_spans(old, new):
+                try:
+                    self._lcm._set_cursor(self._psp, row + 1, start + 1)
+                    self._lcm._write_string(self._psp, text)
+                except PSPError:
+                    # The display content is unknown now.
+                    self.invalidate()
+                    raise
+                old = old[:start] + text + old[start + len(text):]
+                self._shadow[row] = old
+                sent += len(text)
+        return sent
+
+
+class LCMRenderQueue:
+    """
+    Coalesce LCD module updates from many producers and render them at a capped rate.
+
+    The display is split into named regions. :meth:`post` only stores the latest text of a region,
+    a text that is superseded before it was rendered is dropped. A background thread renders the
+    pending regions through an :class:`LCMFrameBuffer` at most ``max_rate`` times per second,
+    so the display shows the current state with bounded latency no matter how many producers post.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> queue = LCMRenderQueue(max_rate=5)
+        >>> queue.set_region("net", 1, 1, 20)
+        >>> queue.set_region("alarm", 2, 1, 20)
+        >>> queue.start()
+        >>> queue.post("net", "eth0 up 1000M")
+        >>> queue.post("alarm", "FAN1 fail")
+        >>> queue.stop()
+        >>> queue.get_stats()
+        LCMRenderStatsModel(posted=2, rendered=2, dropped=0, errors=0)
+
+    :param LCMFrameBuffer frame_buffer: the frame buffer to render to.
+        Defaults to a new :class:`LCMFrameBuffer`.
+    :type max_rate: float or int
+    :param max_rate: maximum number of device updates per second
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self,
+                 frame_buffer: Optional[LCMFrameBuffer] = None,
+                 max_rate: Union[float, int] = 10) -> None:
+        if frame_buffer is None:
+            frame_buffer = LCMFrameBuffer()
+        # Check type.
+        if not isinstance(frame_buffer, LCMFrameBuffer):
+            raise TypeError("'frame_buffer' type must be LCMFrameBuffer")
+        if not isinstance(max_rate, (float, int)):
+            raise TypeError("'max_rate' type must be float or int")
+        # Check value.
+        if max_rate <= 0:
+            raise PSPInvalid("'max_rate' value must be > 0")
+        self._fb = frame_buffer
+        self._interval = 1 / max_rate
+        self._regions: Dict[str, Tuple[int, int, int]] = {}
+        self._pending: Dict[str, str] = {}
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._stopping = False
+        self._posted = 0
+        self._rendered = 0
+        self._dropped = 0
+        self._errors = 0
+
+    def __enter__(self) -> "LCMRenderQueue":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the render thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_region(self, name: str, row: int, column: int, width: int) -> None:
+        """
+        Define a named region of the display.
+
+        :param str name: region name
+        :param int row: row of the region (starts from 1)
+        :param int column: first column of the region (starts from 1)
+        :param int width: number of columns of the region
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        """
+        # Check type.
+        if not isinstance(name, str):
+            raise TypeError("'name' type must be str")
+        for key, value in (("row", row), ("column", column), ("width", width)):
+            if not isinstance(value, int):
+                raise TypeError(f"'{key}' type must be int")
+        # Check value.
+        if not 1 <= row <= self._fb.rows:
+            raise PSPInvalid(f"'row' value must be between 1 and {self._fb.rows}")
+        if not 1 <= column <= self._fb.columns:
+            raise PSPInvalid(f"'column' value must be between 1 and {self._fb.columns}")
+        if not 1 <= width <= self._fb.columns - column + 1:
+            raise PSPInvalid(f"'width' value must be between 1 and {self._fb.columns - column + 1}")
+        with self._cond:
+            self._regions[name] = (row, column, width)
+
+    def post(self, name: str, text: str) -> None:
+        """
+        Post the latest text of a region, it replaces any text of this region that is not rendered yet.
+
+        :param str name: region name defined by :meth:`set_region`
+        :param str text: text to display, padded or truncated to the region width
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The region is not defined.
+        """
+        # Check type.
+        if not isinstance(name, str):
+            raise TypeError("'name' type must be str")
+        if not isinstance(text, str):
+            raise TypeError("'text' type must be str")
+        with self._cond:
+            # Check value.
+            if name not in self._regions:
+                raise PSPInvalid(f"region '{name}' is not defined")
+            if name in self._pending:
+                self._dropped += 1
+            self._pending[name] = text
+            self._posted += 1
+            self._cond.notify()
+
+    def start(self) -> None:
+        """
+        Open the frame buffer and start the render thread.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotExist: This function is not enabled or does not exist.
+        :raises PSPError: General PSP functional error.
+        """
+        if self.is_running:
+            return
+        self._fb.open()
+        self._stopping = False
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Render the pending regions, stop the render thread and close the frame buffer.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._fb.close()
+
+    def get_stats(self) -> LCMRenderStatsModel:
+        """
+        Get the number of posted, rendered and dropped texts and render errors.
+
+        :rtype: LCMRenderStatsModel
+        """
+        with self._cond:
+            return LCMRenderStatsModel(
+                posted=self._posted,
+                rendered=self._rendered,
+                dropped=self._dropped,
+                errors=self._errors,
+            )
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        next_time = monotonic()
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Cap the update rate, the texts posted meanwhile supersede the pending ones.
+                # A post wakes the wait early, so wait again until the deadline.
+                delay = next_time - monotonic()
+                while delay > 0 and not self._stopping:
+                    self._cond.wait(delay)
+                    delay = next_time - monotonic()
+                pending, self._pending = self._pending, {}
+                regions = dict(self._regions)
+            next_time = monotonic() + self._interval
+            for name, text in pending.items():
+                row, column, width = regions[name]
+                try:
+                    self._fb.draw_region(row, column, text[:width].ljust(width))
+                except PSPError as e:
+                    logger.error(f"render LCM region '{name}' failure: {e}")
+                    with self._cond:
+                        self._errors += 1
+                    continue
+                with self._cond:
+                    self._rendered += 1
+
+
+class LCMDisplayEngine:
+    """
+    Render logical pages with scrolling (marquee) rows from a background thread.
+
+    Every page is a list of rows. A row longer than the display is scrolled one character per frame,
+    its frames are pre-computed when the page is set. The pages are rotated every ``page_time`` seconds.
+    Frames are rendered at a fixed frame rate through an :class:`LCMFrameBuffer` in one open session,
+    so only the changed cells are sent. Foreground code only updates the page contents.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> engine = LCMDisplayEngine(fps=4, page_time=5)
+        >>> engine.set_page("host", ["Hostname", "appliance-01.example.com"])
+        >>> engine.set_page("ipv6", ["IPv6", "2001:db8:85a3::8a2e:370:7334"])
+        >>> engine.start()
+        >>> engine.set_page("host", ["Hostname", "appliance-02.example.com"])
+        >>> engine.stop()
+
+    :param LCMFrameBuffer frame_buffer: the frame buffer to render to.
+        Defaults to a new :class:`LCMFrameBuffer`.
+    :type fps: float or int
+    :param fps: frames per second, which is also the scrolling speed in characters per second
+    :type page_time: float or int
+    :param page_time: seconds each page is shown when there are several pages
+    :param str scroll_gap: separator shown between the end and the start of a scrolling row
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self,
+                 frame_buffer: Optional[LCMFrameBuffer] = None,
+                 fps: Union[float, int] = 4,
+                 page_time: Union[float, int] = 5,
+                 scroll_gap: str = "   ") -> None:
+        if frame_buffer is None:
+            frame_buffer = LCMFrameBuffer()
+        # Check type.
+        if not isinstance(frame_buffer, LCMFrameBuffer):
+            raise TypeError("'frame_buffer' type must be LCMFrameBuffer")
+        if not isinstance(fps, (float, int)):
+            raise TypeError("'fps' type must be float or int")
+        if not isinstance(page_time, (float, int)):
+            raise TypeError("'page_time' type must be float or int")
+        if not isinstance(scroll_gap, str):
+            raise TypeError("'scroll_gap' type must be str")
+        # Check value.
+        if fps <= 0:
+            raise PSPInvalid("'fps' value must be > 0")
+        if page_time <= 0:
+            raise PSPInvalid("'page_time' value must be > 0")
+        self._fb = frame_buffer
+        self._interval = 1 / fps
+        self._frames_per_page = max(round(page_time * fps), 1)
+        self._scroll_gap = scroll_gap
+        self._lock = RLock()
+        self._pages: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+
+    def __enter__(self) -> "LCMDisplayEngine":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the render thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_page(self, name: str, lines: Sequence[str]) -> None:
+        """
+        Add a page or replace the content of a page.
+
+        :param str name: page name
+        :param lines: the text of each row, rows longer than the display are scrolled
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        """
+        # Check type.
+        if not isinstance(name, str):
+            raise TypeError("'name' type must be str")
+        if not isinstance(lines, (list, tuple)):
+            raise TypeError("'lines' type must be list or tuple")
+        for line in lines:
+            if not isinstance(line, str):
+                raise TypeError("'line' type must be str")
+        # Check value.
+        if len(lines) > self._fb.rows:
+            raise PSPInvalid(f"'lines' can only have up to {self._fb.rows} rows")
+        # Pre-compute the frames outside of the render thread.
+        frames = tuple(_marquee_frames(line, self._fb.columns, self._scroll_gap) for line in lines)
+        with self._lock:
+            self._pages[name] = frames
+
+    def remove_page(self, name: str) -> None:
+        """
+        Remove a page, do nothing if the page does not exist.
+
+        :param str name: page name
+        """
+        with self._lock:
+            self._pages.pop(name, None)
+
+    def start(self) -> None:
+        """
+        Open the frame buffer and start the render thread.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotExist: This function is not enabled or does not exist.
+        :raises PSPError: General PSP functional error.
+        """
+        if self.is_running:
+            return
+        self._fb.open()
+        self._stop.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the render thread and close the frame buffer. The display keeps the last frame.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._fb.close()
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        tick = 0
+        page_index = 0
+        page_name = None
+        page_start = 0
+        deadline = monotonic()
+        while not self._stop.is_set():
+            with self._lock:
+                names = list(self._pages)
+                if names:
+                    # Rotate to the next page when the current one was shown long enough or removed.
+                    if page_name not in self._pages:
+                        page_index = 0 if page_name is None else page_index % len(names)
+                        page_start = tick
+                    elif tick - page_start >= self._frames_per_page and len(names) > 1:
+                        page_index = (names.index(page_name) + 1) % len(names)
+                        page_start = tick
+                    else:
+                        page_index = names.index(page_name)
+                    page_name = names[page_index]
+                    frames = self._pages[page_name]
+                    step = tick - page_start
+                    lines = [row_frames[step % len(row_frames)] for row_frames in frames]
+                else:
+                    page_name = None
+                    lines = []
+            try:
+                self._fb.draw(lines)
+            except PSPError as e:
+                logger.error(f"render LCM frame failure: {e}")
+            tick += 1
+            deadline += self._interval
+            delay = deadline - monotonic()
+            if delay < 0:
+                # Skip the frames that are already late instead of rendering a burst.
+                deadline = monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+
+def _wake_waiter(waiter: asyncio.Future) -> None:
+    """Wake up an ``async for`` consumer of :class:`LCMKeypad`, in its event loop."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class LCMKeypad:
+    """
+    Deliver LCM key-down/up events with auto-repeat through a bounded queue.
+
+    Key changes are reported by ``LMB_LCM_KeysCallback``. When the callback cannot be hooked
+    (or ``use_callback`` is :data:`False`), the keys are polled by ``LMB_LCM_KeysStatus``
+    every ``poll_interval`` seconds instead. A key held longer than ``repeat_delay`` seconds
+    generates a repeated key-down event every ``repeat_interval`` seconds.
+    When the queue is full, the oldest event is dropped.
+
+    Events can be consumed synchronously or with ``async for``:
+
+    .. code-block:: pycon
+
+        >>> keypad = LCMKeypad()
+        >>> keypad.start()
+        >>> for event in keypad:
+        ...     print(event)
+        ...
+        LCMKeyEventModel(key=2, pressed=True, is_repeat=False, timestamp=3791.041)
+        LCMKeyEventModel(key=2, pressed=False, is_repeat=False, timestamp=3791.187)
+
+    .. code-block:: python
+
+        async def menu(keypad):
+            async for event in keypad:
+                if event.pressed and event.key == 1:
+                    ...
+
+    :param LCM lcm: the :class:`LCM` to read. Defaults to a new :class:`LCM`.
+    :param bool use_callback: set :data:`False` to always poll the keys
+    :type poll_interval: float or int
+    :param poll_interval: seconds between two key reads when polling
+    :type repeat_delay: float or int or None
+    :param repeat_delay: seconds before a held key starts repeating, :data:`None` to disable auto-repeat
+    :type repeat_interval: float or int
+    :param repeat_interval: seconds between two repeated key-down events
+    :param int maxsize: maximum number of queued events
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    NUMBER_OF_KEYS = 4
+
+    def __init__(self,
+                 lcm: Optional[LCM] = None,
+                 use_callback: bool = True,
+                 poll_interval: Union[float, int] = 0.05,
+                 repeat_delay: Optional[Union[float, int]] = 0.5,
+                 repeat_interval: Union[float, int] = 0.15,
+                 maxsize: int = 64) -> None:
+        if lcm is None:
+            lcm = LCM()
+        # Check type.
+        if not isinstance(lcm, LCM):
+            raise TypeError("'lcm' type must be LCM")
+        if not isinstance(use_callback, bool):
+            raise TypeError("'use_callback' type must be bool")
+        if not isinstance(poll_interval, (float, int)):
+            raise TypeError("'poll_interval' type must be float or int")
+        if repeat_delay is not None and not isinstance(repeat_delay, (float, int)):
+            raise TypeError("'repeat_delay' type must be float or int or None")
+        if not isinstance(repeat_interval, (float, int)):
+            raise TypeError("'repeat_interval' type must be float or int")
+        if not isinstance(maxsize, int):
+            raise TypeError("'maxsize' type must be int")
+        # Check value.
+        if poll_interval <= 0:
+            raise PSPInvalid("'poll_interval' value must be > 0")
+        if repeat_delay is not None and repeat_delay <= 0:
+            raise PSPInvalid("'repeat_delay' value must be > 0")
+        if repeat_interval <= 0:
+            raise PSPInvalid("'repeat_interval' value must be > 0")
+        if maxsize <= 0:
+            raise PSPInvalid("'maxsize' value must be > 0")
+        self._lcm = lcm
+        self._use_callback = use_callback
+        self._poll_interval = poll_interval
+        self._repeat_delay = repeat_delay
+        self._repeat_interval = repeat_interval
+        self._queue: Queue = Queue(maxsize)
+        self._lock = RLock()
+        self._state = 0
+        self._next_repeat: Dict[int, float] = {}
+        self._dropped = 0
+        self._psp: Optional[PSP] = None
+        self._p_callback = None
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self._wake = Event()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def __enter__(self) -> "LCMKeypad":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    def __iter__(self) -> Iterator[LCMKeyEventModel]:
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+    def __aiter__(self) -> "LCMKeypad":
+        return self
+
+    async def __anext__(self) -> LCMKeyEventModel:
+        # Wait in the event loop, not in an executor thread, so a cancelled task does not consume an event.
+        loop = asyncio.get_event_loop()
+        while True:
+            waiter = loop.create_future()
+            with self._lock:
+                self._waiters.append((loop, waiter))
+            try:
+                try:
+                    event = self._queue.get_nowait()
+                except Empty:
+                    await waiter
+                    continue
+            finally:
+                with self._lock:
+                    self._waiters.remove((loop, waiter))
+            if event is None:
+                # Wake up the other consumers too.
+                self._put(None)
+                raise StopAsyncIteration
+            return event
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if key events are being delivered."""
+        return self._psp is not None
+
+    @property
+    def is_polling(self) -> bool:
+        """Returns :data:`True` if the keys are polled instead of reported by the callback."""
+        return self._psp is not None and self._p_callback is None
+
+    @property
+    def dropped(self) -> int:
+        """Number of events dropped because the queue was full."""
+        return self._dropped
+
+    def start(self) -> None:
+        """
+        Open the LCD module and start delivering key events.
+
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotExist: This function is not enabled or does not exist.
+        :raises PSPError: General PSP functional error.
+        """
+        with self._lock:
+            if self._psp is not None:
+                return
+            psp = PSP()
+            psp.__enter__()
+            try:
+                self._lcm._open_device(psp)
+            except BaseException:
+                psp.__exit__(None, None, None)
+                raise
+            self._psp = psp
+            self._state = 0
+            self._next_repeat = {}
+            # Drop the events and the stop sentinel left by a previous run.
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except Empty:
+                    break
+            if self._use_callback:
+                p_callback = CFUNCTYPE(None, LCMKeyMsg)(self._callback)
+                i_ret = psp.lib.LMB_LCM_KeysCallback(p_callback, 150)
+                if i_ret == ERR_Success:
+                    self._p_callback = p_callback
+                else:
+                    logger.debug(f"{get_psp_exc_msg('LMB_LCM_KeysCallback', i_ret)}, fall back to polling")
+            self._stop.clear()
+            self._wake.clear()
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop delivering key events and close the LCD module. Waiting consumers receive :data:`None`.
+        """
+        with self._lock:
+            if self._psp is None or self._stop.is_set():
+                return
+            self._stop.set()
+            self._wake.set()
+        self._thread.join()
+        psp, p_callback = self._psp, self._p_callback
+        try:
+            # Not under the lock: the library may wait for a running _callback, which takes it.
+            if p_callback is not None:
+                psp.lib.LMB_LCM_KeysCallback(None, 150)
+            self._lcm._close_device(psp)
+        finally:
+            with self._lock:
+                self._psp = self._p_callback = None
+            psp.__exit__(None, None, None)
+            self._put(None)
+
+    def get(self, timeout: Optional[Union[float, int]] = None) -> Optional[LCMKeyEventModel]:
+        """
+        Wait for the next key event.
+
+        :type timeout: float or int or None
+        :param timeout: Number of seconds to wait, :data:`None` (the default) to wait indefinitely.
+        :return: the next key event, :data:`None` on timeout or when stopped
+        :rtype: LCMKeyEventModel or None
+        """
+        try:
+            event = self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+        if event is None:
+            # Wake up the other consumers too.
+            self._put(None)
+        return event
+
+    def _put(self, event: Optional[LCMKeyEventModel]) -> None:
+        """Queue an event, drop the oldest one if the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                break
+            except Full:
+                try:
+                    self._queue.get_nowait()
+                    self._dropped += 1
+                except Empty:
+                    pass
+        # Wake up the ``async for`` consumers.
+        with self._lock:
+            for loop, waiter in self._waiters:
+                loop.call_soon_threadsafe(_wake_waiter, waiter)
+
+    def _update(self, state: int, now: float) -> None:
+        """Emit the key-down/up events between the current and the new keys status."""
+        with self._lock:
+            changed = self._state ^ state
+            self._state = state
+            for i in range(self.NUMBER_OF_KEYS):
+                if not changed >> i & 1:
+                    continue
+                pressed = bool(state >> i & 1)
+                if pressed and self._repeat_delay is not None:
+                    self._next_repeat[i + 1] = now + self._repeat_delay
+                else:
+                    self._next_repeat.pop(i + 1, None)
+                self._put(LCMKeyEventModel(key=i + 1, pressed=pressed, is_repeat=False, timestamp=now))
+
+    def _callback(self, stu_lcm_msg: LCMKeyMsg) -> None:
+        """Callback function for ``LMB_LCM_KeysCallback``."""
+        now = monotonic()
+        with self._lock:
+            state = self._state & ~stu_lcm_msg.ub_keys | stu_lcm_msg.ub_status & stu_lcm_msg.ub_keys
+            self._update(state, now)
+        # Reschedule the auto-repeat timer.
+        self._wake.set()
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`, poll the keys and generate the repeated events."""
+        ub_keys = c_uint8()
+        while True:
+            now = monotonic()
+            if self._p_callback is None:
+                i_ret = self._psp.lib.LMB_LCM_KeysStatus(byref(ub_keys))
+                if i_ret == ERR_Success:
+                    self._update(ub_keys.value, now)
+                elif i_ret not in (ERR_NotOpened, ERR_NotSupport):
+                    # ``LMB_LCM_KeysStatus`` returns an error when no key is pressed.
+                    self._update(0, now)
+            with self._lock:
+                for key, next_time in self._next_repeat.items():
+                    if next_time <= now:
+                        self._next_repeat[key] = next_time + self._repeat_interval
+                        self._put(LCMKeyEventModel(key=key, pressed=True, is_repeat=True, timestamp=now))
+                timeout = self._poll_interval if self._p_callback is None else None
+                if self._next_repeat:
+                    next_repeat = max(min(self._next_repeat.values()) - now, 0.0)
+                    timeout = next_repeat if timeout is None else min(timeout, next_repeat)
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
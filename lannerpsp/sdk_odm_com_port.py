@@ -1,6 +1,6 @@
 import logging
 from ctypes import byref, c_uint8
-from typing import Any, Dict, NamedTuple
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
@@ -55,25 +55,33 @@ class COMPort:
     def __init__(self, num: int) -> None:
         self._version = DLL().get_version()
         self._num = num
+        self._check_num(self._version.platform_id, num)
+
+    @classmethod
+    def _check_num(cls, platform_id: str, num: int) -> None:
+        """
+        Check the COM port number on this platform.
+
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises NotImplementedError: It has not been verified to run on this platform.
+        """
         # Check type.
         if not isinstance(num, int):
             raise TypeError("'num' type must be int")
         # Check value.
-        if self._version.platform_id in SUPPORTED_1_COM:
+        if platform_id in SUPPORTED_1_COM:
             if num != 1:
                 raise PSPInvalid("'num' can only be set to (1) on this platform")
-            # Check import for LEC-7242.
-            if self._version.platform_id == "LEB-7242":
-                try:
-                    from portio import ioperm
-                except ImportError:
-                    raise RuntimeError(
-                        "Install lannerpsp with 'lec7242' extra in order to use COM port."
-                    )
-        elif self._version.platform_id in SUPPORTED_2_COM:
+            # Check I/O port backend for LEC-7242.
+            if platform_id == "LEB-7242":
+                from .gpio_config_tool import check_backend
+                check_backend()
+        elif platform_id in SUPPORTED_2_COM:
             if not 1 <= num <= 2:
                 raise PSPInvalid("'num' can only be set to (1~2) on this platform")
-        elif self._version.platform_id in UNSUPPORTED_COM:
+        elif platform_id in UNSUPPORTED_COM:
             raise PSPNotSupport("Not supported on this platform")
         else:
             raise NotImplementedError
@@ -175,6 +183,121 @@ class COMPort:
         else:
             raise PSPNotSupport("Not support on this platform")
 
+    def apply(self, mode: Optional[int] = None, termination: Optional[bool] = None) -> None:
+        """
+        Set COM port mode and RS-422/RS-485 termination, only writing what differs.
+
+        The current configuration is read once and the needed writes are done in the same
+        session, so applying the current configuration again costs a single read.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> com1 = COMPort(1)
+            >>> com1.apply(mode=485, termination=True)
+
+        :param mode: 232/422/485, :data:`None` to keep it
+        :type mode: int or None
+        :param termination: set :data:`True` to enable, :data:`False` to disable, :data:`None` to keep it
+        :type termination: bool or None
+        :raises PermissionError: if not running as root user
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPError: General PSP functional error.
+        """
+        self._apply(self._version.platform_id, {self._num: (mode, termination)})
+
+    @classmethod
+    def apply_all(cls, ports: Dict[int, Tuple[Optional[int], Optional[bool]]]) -> None:
+        """
+        Set the mode and RS-422/RS-485 termination of many COM ports in one session.
+
+        Like :meth:`apply`, only the settings that differ from the current configuration
+        are written.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> COMPort.apply_all({1: (232, None), 2: (485, True)})
+
+        :param ports: ``{num: (mode, termination)}``, :data:`None` keeps a setting
+        :type ports: dict[int, tuple[int or None, bool or None]]
+        :raises PermissionError: if not running as root user
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(ports, dict):
+            raise TypeError("'ports' type must be dict")
+        # Check value.
+        platform_id = DLL().get_version().platform_id
+        for num in ports:
+            cls._check_num(platform_id, num)
+        cls._apply(platform_id, ports)
+
+    @classmethod
+    def _apply(cls, platform_id: str, ports: Dict[int, Tuple[Optional[int], Optional[bool]]]) -> None:
+        """
+        Apply ``{num: (mode, termination)}`` in one session.
+
+        :raises PermissionError: if not running as root user
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type & value.
+        for num, config in ports.items():
+            if not isinstance(config, tuple) or len(config) != 2:
+                raise TypeError(f"COM port {num} config type must be tuple of (mode, termination)")
+            mode, termination = config
+            if mode is not None and not isinstance(mode, int):
+                raise TypeError("'mode' type must be int")
+            if termination is not None and not isinstance(termination, bool):
+                raise TypeError("'termination' type must be bool")
+            if mode is not None and mode not in (232, 422, 485):
+                raise PSPInvalid("'mode' value must be 232 or 422 or 485")
+        # Run.
+        if platform_id == "LEB-7242":
+            from .gpio_config_tool import GPIOConfigTool
+            # The transaction skips the register writes that do not change the value.
+            for mode, termination in ports.values():
+                GPIOConfigTool().set_com1(mode, termination)
+            return
+        if platform_id not in ("LEB-2680", "LEC-7230"):
+            raise PSPNotSupport("Not support on this platform")
+        mode_mapping = {232: URMODE_RS232, 422: URMODE_RS422, 485: URMODE_RS485}
+        termination_mapping = {True: URTERM_ON, False: URTERM_OFF}
+        b_mode = c_uint8()
+        b_term = c_uint8()
+        with PSP() as psp:
+            for num, (mode, termination) in ports.items():
+                # Only LEC-7230 can read the current configuration.
+                current_mode = current_term = None
+                if platform_id == "LEC-7230":
+                    i_ret = psp.lib.LMB_ODM_GetUartMode(num, byref(b_mode))
+                    if i_ret != ERR_Success:
+                        raise PSPError(get_psp_exc_msg("LMB_ODM_GetUartMode", i_ret))
+                    i_ret = psp.lib.LMB_ODM_TermStat(num, byref(b_term))
+                    if i_ret != ERR_Success:
+                        raise PSPError(get_psp_exc_msg("LMB_ODM_TermStat", i_ret))
+                    current_mode = b_mode.value
+                    current_term = b_term.value + 1
+                if mode is not None and mode_mapping[mode] != current_mode:
+                    i_ret = psp.lib.LMB_ODM_SetUartMode(num, c_uint8(mode_mapping[mode]))
+                    if i_ret != ERR_Success:
+                        raise PSPError(get_psp_exc_msg("LMB_ODM_SetUartMode", i_ret))
+                    logger.debug(f"set com port {num:d} mode {MODES[mode_mapping[mode]]}")
+                if termination is not None and termination_mapping[termination] != current_term:
+                    i_ret = psp.lib.LMB_ODM_Termination(num, termination_mapping[termination] - 1)
+                    if i_ret != ERR_Success:
+                        raise PSPError(get_psp_exc_msg("LMB_ODM_Termination", i_ret))
+                    logger.debug(f"set com port {num:d} termination {TERMS[termination_mapping[termination] - 1]}")
+
     def _set_mode(self, mode: int) -> None:
         """
         For LEC-7230.
@@ -1,10 +1,14 @@
 import logging
 from ctypes import byref, c_uint32
 from math import log2
-from typing import Any, Dict, NamedTuple
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from time import monotonic, time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from .core import PSP, convert_to_bit_array, get_psp_exc_msg
+from .core import PSP, get_psp_exc_msg
 from .exc import (
+    PSPBusyInUses,
     PSPError,
     PSPInvalid,
     PSPNotOpened,
@@ -24,6 +28,8 @@ logger = logging.getLogger(__name__)
 SUPPORTED_PLATFORMS = ("LEB-2680", "LEC-2290", "V3S", "V6S",)
 UNSUPPORTED_PLATFORMS = ("LEB-7242", "LEC-7230", "NCA-2510",)
 
+DEFAULT_PORT_POWER = 15.4  # Watts, the maximum power of an IEEE 802.3af port.
+
 
 class PoEInfoModel(NamedTuple):
     """To store PoE information."""
@@ -35,6 +41,47 @@ class PoEInfoModel(NamedTuple):
         return dict(self._asdict())
 
 
+class PoEStatusModel(NamedTuple):
+    """To store the power status of all PoE ports as a bitmask (bit 0 is LAN port 1)."""
+    number_of_poe_ports: int
+    mask: int
+
+    def is_powered(self, num: int) -> bool:
+        """Returns :data:`True` if the PoE power of LAN port ``num`` is enabled."""
+        return bool(self.mask >> (num - 1) & 1)
+
+    def get_powered_ports(self) -> List[int]:
+        """Returns the LAN port numbers whose PoE power is enabled."""
+        return [i + 1 for i in range(self.number_of_poe_ports) if self.mask >> i & 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
+class PoEEventModel(NamedTuple):
+    """To store a PoE port power change."""
+    port: int
+    power: bool
+    timestamp: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
+class PoEPortResultModel(NamedTuple):
+    """To store the result of setting the power of a PoE port."""
+    port: int
+    power: bool
+    success: bool
+    message: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
 class PoE:
     """
     Power over Ethernet.
@@ -45,6 +92,8 @@ class PoE:
     :raises PSPInvalid: The input parameter is out of range.
     :raises PSPError: General PSP functional error.
     """
+    # The number of PoE ports is fixed for a platform, so query it once per process.
+    _number_of_poe_ports: Optional[int] = None
 
     def __init__(self, num: int) -> None:
         self._version = DLL().get_version()
@@ -82,35 +131,46 @@ class PoE:
         :raises PSPNotOpened: Device port is not opened yet.
         :raises PSPError: General PSP functional error.
         """
+        status = cls.get_status()
+        return PoEInfoModel(
+            number_of_poe_ports=status.number_of_poe_ports,
+            power_status={i + 1: status.is_powered(i + 1) for i in range(status.number_of_poe_ports)},
+        )
+
+    @classmethod
+    def get_status(cls) -> PoEStatusModel:
+        """
+        Get the power status of all PoE ports with a single MCU read.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> status = PoE.get_status()
+            >>> status
+            PoEStatusModel(number_of_poe_ports=6, mask=61)
+            >>> status.is_powered(2)
+            False
+            >>> status.get_powered_ports()
+            [1, 3, 4, 5, 6]
+
+        :return: The power status bitmask.
+        :rtype: PoEStatusModel
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
         number_of_poe_ports = cls._get_supported_ports_count()
-        # Get the power status of each port.
-        udw_status = c_uint32(0)
         with PSP() as psp:
-            i_ret = psp.lib.LMB_IGN_GetPoePower(0xFFFFFFFF, byref(udw_status))
             try:
-                # Prevent the UART of the MCU from being occupied.
-                psp.lib.LMB_IGN_ClosePort()
-            except AttributeError:
-                pass
-        msg = get_psp_exc_msg("LMB_IGN_GetPoePower", i_ret)
-        if i_ret == ERR_Success:
-            # Convert integer to bit array.
-            power_status_list = convert_to_bit_array(udw_status.value)
-            # Fill the space with 0 from the beginning of the list.
-            power_status_list[0:0] = [0 for _ in range(number_of_poe_ports - len(power_status_list))]
-            # Reverse the list so that the port numbers start at 1.
-            power_status_list.reverse()
-            power_status = {}
-            for i in range(number_of_poe_ports):
-                power_status[i + 1] = bool(power_status_list[i])
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        else:
-            raise PSPError(msg)
-        return PoEInfoModel(
-            number_of_poe_ports=number_of_poe_ports,
-            power_status=power_status,
-        )
+                mask = cls._read_power_mask(psp, number_of_poe_ports)
+            finally:
+                try:
+                    # Prevent the UART of the MCU from being occupied.
+                    psp.lib.LMB_IGN_ClosePort()
+                except AttributeError:
+                    pass
+        return PoEStatusModel(number_of_poe_ports=number_of_poe_ports, mask=mask)
 
     def enable(self) -> None:
         """
@@ -204,14 +264,135 @@ class PoE:
         else:
             raise PSPError(msg)
 
+    @classmethod
+    def apply(cls, ports: Dict[int, bool]) -> List[PoEPortResultModel]:
+        """
+        Set the power of several PoE ports in a single session.
+
+        All port numbers are validated before any port is changed. A failure on one port
+        does not stop the others, the outcome of each port is returned instead.
+
+        Example:
+
+        .. code-block:: pycon
+
+            >>> PoE.apply({1: True, 2: False, 3: True})
+            [PoEPortResultModel(port=1, power=True, success=True, message=None), PoEPortResultModel(port=2, power=False, success=True, message=None), PoEPortResultModel(port=3, power=True, success=True, message=None)]
+            >>> all(result.success for result in _)
+            True
+
+        :param dict ports: a mapping of LAN port number to power,
+            :data:`True` to enable (power on by auto), :data:`False` to disable (power off)
+        :return: the result of each port, in the order given
+        :rtype: list[PoEPortResultModel]
+        :raises TypeError: The input parameters type error.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(ports, dict):
+            raise TypeError("'ports' type must be dict")
+        for num, power in ports.items():
+            if not isinstance(num, int):
+                raise TypeError("'num' type must be int")
+            if not isinstance(power, bool):
+                raise TypeError("'power' type must be bool")
+        # Check value.
+        number_of_poe_ports = cls._get_supported_ports_count()
+        for num in ports:
+            if not 1 <= num <= number_of_poe_ports:
+                raise PSPInvalid(f"'num' can only be set to (1~{number_of_poe_ports}) on this platform")
+        results = []
+        with PSP() as psp:
+            for num, power in ports.items():
+                i_ret = psp.lib.LMB_POE_SetPortPower(num, ENABLE if power else DISABLE)
+                if i_ret == ERR_Success:
+                    logger.debug(f"LAN{num} port power {'on by auto' if power else 'off'}")
+                    results.append(PoEPortResultModel(port=num, power=power, success=True, message=None))
+                else:
+                    msg = get_psp_exc_msg("LMB_POE_SetPortPower", i_ret)
+                    logger.warning(f"LAN{num} port: {msg}")
+                    results.append(PoEPortResultModel(port=num, power=power, success=False, message=msg))
+            try:
+                # Prevent the UART of the MCU from being occupied.
+                psp.lib.LMB_IGN_ClosePort()
+            except AttributeError:
+                pass
+        return results
+
+    @classmethod
+    def set_mask(cls, mask: int, value: int) -> List[PoEPortResultModel]:
+        """
+        Set the power of the PoE ports selected by a bitmask in a single session.
+
+        Bit 0 is LAN port 1, bit 1 is LAN port 2, and so on. Only the ports whose bit is
+        set in ``mask`` are changed, to the power given by the same bit of ``value``.
+
+        Example for enabling port 1 and 3 and disabling port 2:
+
+        .. code-block:: pycon
+
+            >>> results = PoE.set_mask(0b111, 0b101)
+            >>> [(result.port, result.power) for result in results]
+            [(1, True), (2, False), (3, True)]
+
+        :param int mask: the ports to change
+        :param int value: the power of the ports, ``1`` to enable, ``0`` to disable
+        :return: the result of each port, in port order
+        :rtype: list[PoEPortResultModel]
+        :raises TypeError: The input parameters type error.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(mask, int):
+            raise TypeError("'mask' type must be int")
+        if not isinstance(value, int):
+            raise TypeError("'value' type must be int")
+        # Check value.
+        number_of_poe_ports = cls._get_supported_ports_count()
+        max_mask = 2 ** number_of_poe_ports - 1
+        if not 0 <= mask <= max_mask:
+            raise PSPInvalid(f"'mask' value must be between 0x0 and 0x{max_mask:X}")
+        if not 0 <= value <= max_mask:
+            raise PSPInvalid(f"'value' value must be between 0x0 and 0x{max_mask:X}")
+        return cls.apply({
+            i + 1: bool(value >> i & 1)
+            for i in range(number_of_poe_ports) if mask >> i & 1
+        })
+
+    @classmethod
+    def _read_power_mask(cls, psp: PSP, number_of_poe_ports: int) -> int:
+        """
+        Read the power status bitmask of all PoE ports in an opened PSP session.
+
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        udw_status = c_uint32(0)
+        i_ret = psp.lib.LMB_IGN_GetPoePower(0xFFFFFFFF, byref(udw_status))
+        msg = get_psp_exc_msg("LMB_IGN_GetPoePower", i_ret)
+        if i_ret == ERR_Success:
+            return udw_status.value & (2 ** number_of_poe_ports - 1)
+        elif i_ret == ERR_NotOpened:
+            raise PSPNotOpened(msg)
+        else:
+            raise PSPError(msg)
+
     @classmethod
     def _get_supported_ports_count(cls) -> int:
         """
         Get the number of LAN ports that support PoE.
 
+        The result is cached for the life of the process.
+
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
+        if PoE._number_of_poe_ports is not None:
+            return PoE._number_of_poe_ports
         udw_ports = c_uint32(0)
         with PSP() as psp:
             try:
@@ -226,8 +407,453 @@ class PoE:
         msg = get_psp_exc_msg("LMB_POE_QueryDevices", i_ret)
         if i_ret == ERR_Success:
             logger.debug(f"PoE ports = 0x{udw_ports.value:08X}")
-            return int(log2(udw_ports.value + 1))
+            PoE._number_of_poe_ports = int(log2(udw_ports.value + 1))
+            return PoE._number_of_poe_ports
         elif i_ret == ERR_NotSupport:
             raise PSPNotSupport(msg)
         else:
             raise PSPError(msg)
+
+
+class PoESequencer:
+    """
+    Power up PoE ports in order from a dedicated thread in one PSP session.
+
+    A port is *ramping* from the moment it is enabled until :meth:`PoE.get_power_status`
+    reports it powered. The next port of the plan is enabled as soon as:
+
+    * ``delay`` seconds have passed since the previous port was enabled,
+    * fewer than ``max_concurrent`` ports are ramping, and
+    * the power of the ramping ports plus the next port fits into ``power_budget``.
+
+    So the ports come up as fast as the power supply allows, without the inrush current
+    of all ports at once.
+
+    Example for powering up 6 cameras, 2 at a time within a 30 W budget:
+
+    .. code-block:: pycon
+
+        >>> sequencer = PoESequencer(delay=0.2, max_concurrent=2, power_budget=30)
+        >>> sequencer.start([1, 2, 3, (4, 6.5), (5, 6.5), 6])
+        >>> sequencer.wait()
+        True
+        >>> all(result.success for result in sequencer.get_results())
+        True
+
+    :param delay: minimum number of seconds between enabling two ports
+    :type delay: float or int
+    :param int max_concurrent: maximum number of ramping ports
+    :param power_budget: maximum total power (in watts) of the ramping ports, :data:`None` for no limit
+    :type power_budget: float or int or None
+    :param settle_timeout: number of seconds a port may take to report powered before it is marked as failed
+    :type settle_timeout: float or int
+    :param poll_interval: number of seconds between two power status reads of a ramping port
+    :type poll_interval: float or int
+    :param on_complete: called from the sequencer thread with the list of :class:`PoEPortResultModel`
+        when the plan is finished, cancelled or failed (the unfinished ports are then marked as failed)
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self,
+                 delay: Union[float, int] = 0.5,
+                 max_concurrent: int = 1,
+                 power_budget: Optional[Union[float, int]] = None,
+                 settle_timeout: Union[float, int] = 10,
+                 poll_interval: Union[float, int] = 0.1,
+                 on_complete: Optional[Callable[[List[PoEPortResultModel]], Any]] = None) -> None:
+        # Check type.
+        if not isinstance(delay, (float, int)):
+            raise TypeError("'delay' type must be float or int")
+        if not isinstance(max_concurrent, int):
+            raise TypeError("'max_concurrent' type must be int")
+        if power_budget is not None and not isinstance(power_budget, (float, int)):
+            raise TypeError("'power_budget' type must be float or int or None")
+        if not isinstance(settle_timeout, (float, int)):
+            raise TypeError("'settle_timeout' type must be float or int")
+        if not isinstance(poll_interval, (float, int)):
+            raise TypeError("'poll_interval' type must be float or int")
+        if on_complete is not None and not callable(on_complete):
+            raise TypeError("'on_complete' must be callable")
+        # Check value.
+        if delay < 0:
+            raise PSPInvalid("'delay' value must be >= 0")
+        if max_concurrent < 1:
+            raise PSPInvalid("'max_concurrent' value must be >= 1")
+        if power_budget is not None and power_budget <= 0:
+            raise PSPInvalid("'power_budget' value must be > 0")
+        if settle_timeout <= 0:
+            raise PSPInvalid("'settle_timeout' value must be > 0")
+        if poll_interval <= 0:
+            raise PSPInvalid("'poll_interval' value must be > 0")
+        self._delay = delay
+        self._max_concurrent = max_concurrent
+        self._power_budget = power_budget
+        self._settle_timeout = settle_timeout
+        self._poll_interval = poll_interval
+        self._on_complete = on_complete
+        self._thread: Optional[Thread] = None
+        self._cancel = Event()
+        self._exc: Optional[BaseException] = None
+        self._results: Dict[int, PoEPortResultModel] = {}
+        self._plan: Tuple[Tuple[int, float], ...] = ()
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the plan is being powered up."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, plan: Sequence[Union[int, Tuple[int, Union[float, int]]]]) -> None:
+        """
+        Start powering up the ports of the plan in the background.
+
+        :param plan: ordered list of LAN port numbers, or ``(port, watts)`` tuples to give
+            the power of a port. A port alone counts as ``DEFAULT_PORT_POWER`` (15.4 W).
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPBusyInUses: A plan is already being powered up.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(plan, (list, tuple)):
+            raise TypeError("'plan' type must be list or tuple")
+        steps = []
+        for step in plan:
+            if isinstance(step, int):
+                num, power = step, DEFAULT_PORT_POWER
+            elif isinstance(step, (list, tuple)) and len(step) == 2:
+                num, power = step
+            else:
+                raise TypeError("'step' must be a port number or a (port, watts) tuple")
+            if not isinstance(num, int):
+                raise TypeError("'num' type must be int")
+            if not isinstance(power, (float, int)):
+                raise TypeError("'watts' type must be float or int")
+            steps.append((num, float(power)))
+        # Check value.
+        if not steps:
+            raise PSPInvalid("'plan' must not be empty")
+        number_of_poe_ports = PoE._get_supported_ports_count()
+        for num, power in steps:
+            if not 1 <= num <= number_of_poe_ports:
+                raise PSPInvalid(f"'num' can only be set to (1~{number_of_poe_ports}) on this platform")
+            if power < 0:
+                raise PSPInvalid("'watts' value must be >= 0")
+            if self._power_budget is not None and power > self._power_budget:
+                raise PSPInvalid(f"LAN{num} port power {power} W exceeds the power budget {self._power_budget} W")
+        if len({num for num, _ in steps}) != len(steps):
+            raise PSPInvalid("'plan' must not contain a port twice")
+        if self.is_running:
+            raise PSPBusyInUses("A plan is already being powered up")
+        # Run.
+        self._cancel.clear()
+        self._exc = None
+        self._results = {}
+        self._plan = tuple(steps)
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Stop enabling ports. The ports already enabled stay powered.
+        """
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, timeout: Optional[Union[float, int]] = None) -> bool:
+        """
+        Wait until the plan is finished or cancelled.
+
+        :type timeout: float or int or None
+        :param timeout: Number of seconds to wait, :data:`None` (the default) to wait indefinitely.
+        :return: :data:`True` if the plan is finished, :data:`False` on timeout.
+        :rtype: bool
+        :raises PSPError: The error raised by the sequencer thread.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return False
+        if self._exc is not None:
+            raise self._exc
+        return True
+
+    def get_results(self) -> List[PoEPortResultModel]:
+        """
+        Get the result of the ports finished so far, in plan order.
+
+        :return: the result of each finished port
+        :rtype: list[PoEPortResultModel]
+        """
+        results = dict(self._results)
+        return [results[num] for num, _ in self._plan if num in results]
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        pending = list(self._plan)
+        pending.reverse()
+        ramping: Dict[int, Tuple[float, float]] = {}  # port -> (enable time, watts)
+        udw_status = c_uint32(0)
+        try:
+            with PSP() as psp:
+                try:
+                    next_enable = monotonic()
+                    while (pending or ramping) and not self._cancel.is_set():
+                        # Settle the ramping ports.
+                        for num in list(ramping):
+                            enabled_at, _ = ramping[num]
+                            i_ret = psp.lib.LMB_POE_GetPortStatus(num, byref(udw_status))
+                            now = monotonic()
+                            if i_ret == ERR_Success and udw_status.value:
+                                logger.debug(f"LAN{num} port powered in {now - enabled_at:.3f} s")
+                                self._finish(ramping, num, True, None)
+                            elif i_ret != ERR_Success:
+                                self._finish(ramping, num, False, get_psp_exc_msg("LMB_POE_GetPortStatus", i_ret))
+                            elif now - enabled_at >= self._settle_timeout:
+                                self._finish(ramping, num, False,
+                                             f"LAN{num} port is not powered after {self._settle_timeout} s")
+                        # Enable the next ports that fit.
+                        over_budget = False
+                        while pending and len(ramping) < self._max_concurrent:
+                            num, power = pending[-1]
+                            if (self._power_budget is not None and ramping and
+                                    sum(watts for _, watts in ramping.values()) + power > self._power_budget):
+                                over_budget = True
+                                break
+                            now = monotonic()
+                            if now < next_enable:
+                                break
+                            pending.pop()
+                            i_ret = psp.lib.LMB_POE_SetPortPower(num, ENABLE)
+                            if i_ret == ERR_Success:
+                                logger.debug(f"LAN{num} port power on by auto")
+                                ramping[num] = (now, power)
+                                next_enable = now + self._delay
+                            else:
+                                self._finish(ramping, num, False, get_psp_exc_msg("LMB_POE_SetPortPower", i_ret))
+                        # Sleep until the next poll or the next port may be enabled.
+                        # A port waiting for the power budget waits for the next poll.
+                        timeout = self._poll_interval if ramping else float("inf")
+                        if pending and len(ramping) < self._max_concurrent and not over_budget:
+                            timeout = min(timeout, max(next_enable - monotonic(), 0.0))
+                        if timeout != float("inf"):
+                            self._cancel.wait(timeout)
+                finally:
+                    try:
+                        # Prevent the UART of the MCU from being occupied.
+                        psp.lib.LMB_IGN_ClosePort()
+                    except AttributeError:
+                        pass
+        except BaseException as e:
+            logger.error(f"PoE sequencer stopped: {e}")
+            self._exc = e
+            # Fail the ports that are not finished.
+            for num, _ in self._plan:
+                if num not in self._results:
+                    self._results[num] = PoEPortResultModel(port=num, power=True, success=False, message=str(e))
+        finally:
+            if self._on_complete is not None:
+                try:
+                    self._on_complete(self.get_results())
+                except Exception as e:
+                    logger.error(f"PoE sequencer completion callback failed: {e}")
+
+    def _finish(self, ramping: Dict[int, Tuple[float, float]], num: int, success: bool,
+                message: Optional[str]) -> None:
+        """Record the result of a port and release its place in the ramp."""
+        ramping.pop(num, None)
+        if message is not None:
+            logger.warning(message)
+        self._results[num] = PoEPortResultModel(port=num, power=True, success=success, message=message)
+
+
+class PoEWatcher:
+    """
+    Watch the power status of all PoE ports from a dedicated thread in one PSP session.
+
+    Each poll is a single MCU read of the power status bitmask, whatever the number of
+    ports. A :class:`PoEEventModel` is emitted for every port whose power changed since
+    the previous poll, to ``on_change`` (called from the watcher thread) and to the
+    queue read by :meth:`get`. When the queue is full, the oldest event is dropped.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> with PoEWatcher(interval=0.5) as watcher:
+        ...     for event in watcher:
+        ...         print(event.port, event.power)
+        2 False
+        2 True
+
+    :param interval: number of seconds between two polls
+    :type interval: float or int
+    :param on_change: called with each :class:`PoEEventModel`
+    :param int maxsize: maximum number of queued events
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self,
+                 interval: Union[float, int] = 1,
+                 on_change: Optional[Callable[[PoEEventModel], Any]] = None,
+                 maxsize: int = 64) -> None:
+        # Check type.
+        if not isinstance(interval, (float, int)):
+            raise TypeError("'interval' type must be float or int")
+        if on_change is not None and not callable(on_change):
+            raise TypeError("'on_change' must be callable")
+        if not isinstance(maxsize, int):
+            raise TypeError("'maxsize' type must be int")
+        # Check value.
+        if interval <= 0:
+            raise PSPInvalid("'interval' value must be > 0")
+        if maxsize <= 0:
+            raise PSPInvalid("'maxsize' value must be > 0")
+        self._interval = interval
+        self._on_change = on_change
+        self._queue: Queue = Queue(maxsize)
+        self._dropped = 0
+        self._status: Optional[PoEStatusModel] = None
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self._exc: Optional[BaseException] = None
+
+    def __enter__(self) -> "PoEWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    def __iter__(self) -> Iterator[PoEEventModel]:
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the watcher thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def status(self) -> Optional[PoEStatusModel]:
+        """The power status of the last poll, :data:`None` before the first poll."""
+        return self._status
+
+    @property
+    def dropped(self) -> int:
+        """The number of events dropped because the queue was full."""
+        return self._dropped
+
+    def start(self) -> None:
+        """
+        Read the initial power status and start watching in the background.
+
+        :raises PSPBusyInUses: The watcher is already running.
+        :raises PSPNotSupport: This function is not supported.
+        :raises PSPNotOpened: Device port is not opened yet.
+        :raises PSPError: General PSP functional error.
+        """
+        if self.is_running:
+            raise PSPBusyInUses("The PoE watcher is already running")
+        self._status = PoE.get_status()
+        # Drop the events and the stop sentinel left by a previous run.
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                break
+        self._stop.clear()
+        self._exc = None
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop watching and wake up the consumers of :meth:`get`.
+
+        :raises PSPError: The error raised by the watcher thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._put(None)
+        if self._exc is not None:
+            exc, self._exc = self._exc, None
+            raise exc
+
+    def get(self, timeout: Optional[Union[float, int]] = None) -> Optional[PoEEventModel]:
+        """
+        Wait for the next power change event.
+
+        :type timeout: float or int or None
+        :param timeout: Number of seconds to wait, :data:`None` (the default) to wait indefinitely.
+        :return: the next event, :data:`None` on timeout or when stopped
+        :rtype: PoEEventModel or None
+        """
+        try:
+            event = self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+        if event is None:
+            # Wake up the other consumers too.
+            self._put(None)
+        return event
+
+    def _put(self, event: Optional[PoEEventModel]) -> None:
+        """Queue an event, drop the oldest one if the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except Full:
+                try:
+                    self._queue.get_nowait()
+                    self._dropped += 1
+                except Empty:
+                    pass
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        number_of_poe_ports = self._status.number_of_poe_ports
+        try:
+            with PSP() as psp:
+                try:
+                    deadline = monotonic()
+                    while True:
+                        deadline += self._interval
+                        if self._stop.wait(max(deadline - monotonic(), 0.0)):
+                            return
+                        mask = PoE._read_power_mask(psp, number_of_poe_ports)
+                        changed = mask ^ self._status.mask
+                        self._status = PoEStatusModel(number_of_poe_ports=number_of_poe_ports, mask=mask)
+                        timestamp = time()
+                        while changed:
+                            bit = changed & -changed
+                            changed ^= bit
+                            event = PoEEventModel(port=bit.bit_length(), power=bool(mask & bit),
+                                                  timestamp=timestamp)
+                            logger.debug(f"LAN{event.port} port power {'on' if event.power else 'off'}")
+                            self._put(event)
+                            if self._on_change is not None:
+                                try:
+                                    self._on_change(event)
+                                except Exception as e:
+                                    logger.error(f"PoE watcher callback failed: {e}")
+                finally:
+                    try:
+                        # Prevent the UART of the MCU from being occupied.
+                        psp.lib.LMB_IGN_ClosePort()
+                    except AttributeError:
+                        pass
+        except BaseException as e:
+            logger.error(f"PoE watcher stopped: {e}")
+            self._exc = e
+            self._put(None)
@@ -1,5 +1,9 @@
 import logging
+from concurrent.futures import Future
 from ctypes import byref, c_uint32
+from threading import RLock, Thread
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
@@ -18,6 +22,25 @@ logger = logging.getLogger(__name__)
 SUPPORTED_PLATFORMS = ("LEB-7242",)
 UNSUPPORTED_PLATFORMS = ("LEC-7230", "NCA-2510", "V3S", "V6S",)
 
+# The bits of the module power status and SIM card status.
+RFM_M2 = 0b01
+RFM_MPCIE = 0b10
+
+
+class RFMSwitchModel(NamedTuple):
+    """To store the result and the timing (in seconds) of a SIM card switch."""
+    module: int
+    sim_status: int
+    power_status: int
+    power_off_time: float
+    switch_time: float
+    power_on_time: float
+    total_time: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
 
 class RFM:
     """
@@ -192,3 +215,231 @@ class RFM:
             raise PSPInvalid(msg)
         else:
             raise PSPError(msg)
+
+
+class RFMController:
+    """
+    Switch the SIM card of a radio module with a cached power and SIM card status.
+
+    The module power status and SIM card status are read once (in one session) and then
+    kept up to date by the controller. :meth:`switch_sim` runs the whole switch sequence
+    (power the module off, switch the SIM card, power the module back on) as one
+    transaction in one PSP session, and measures each step.
+
+    Example for a failover of the M.2 module to the other SIM card:
+
+    .. code-block:: pycon
+
+        >>> controller = RFMController()
+        >>> controller.switch_sim(1)
+        RFMSwitchModel(module=1, sim_status=1, power_status=3, power_off_time=0.0021, switch_time=0.5013, power_on_time=0.0019, total_time=0.5053)
+
+    Or in the background:
+
+    .. code-block:: pycon
+
+        >>> future = controller.switch_sim_async(1, on_complete=print)
+        >>> await asyncio.wrap_future(future)
+
+    :param settle_time: number of seconds the module stays powered off before the SIM card is switched
+    :type settle_time: float or int
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self, settle_time: Union[float, int] = 0.5) -> None:
+        # Check type.
+        if not isinstance(settle_time, (float, int)):
+            raise TypeError("'settle_time' type must be float or int")
+        # Check value.
+        if settle_time < 0:
+            raise PSPInvalid("'settle_time' value must be >= 0")
+        self._settle_time = settle_time
+        self._lock = RLock()
+        self._power_status: Optional[int] = None
+        self._sim_status: Optional[int] = None
+        self._last_switch: Optional[RFMSwitchModel] = None
+
+    @property
+    def power_status(self) -> int:
+        """
+        The cached module power status (see :meth:`RFM.get_power_status`).
+
+        :raises PSPError: General PSP functional error.
+        """
+        with self._lock:
+            if self._power_status is None:
+                self.refresh()
+            return self._power_status
+
+    @property
+    def sim_status(self) -> int:
+        """
+        The cached SIM card status (see :meth:`RFM.get_sim_status`).
+
+        :raises PSPError: General PSP functional error.
+        """
+        with self._lock:
+            if self._sim_status is None:
+                self.refresh()
+            return self._sim_status
+
+    @property
+    def last_switch(self) -> Optional[RFMSwitchModel]:
+        """The result of the last :meth:`switch_sim`, :data:`None` if none was done."""
+        return self._last_switch
+
+    def refresh(self) -> None:
+        """
+        Read the module power status and SIM card status again, in one session.
+
+        Call it when the status may have been changed by another program.
+
+        :raises PSPError: General PSP functional error.
+        """
+        udw_power = c_uint32(0)
+        udw_sim = c_uint32(0)
+        with self._lock:
+            self._power_status = self._sim_status = None
+            with PSP() as psp:
+                i_ret = psp.lib.LMB_RFM_GetModule(byref(udw_power))
+                if i_ret != ERR_Success:
+                    raise PSPError(get_psp_exc_msg("LMB_RFM_GetModule", i_ret))
+                i_ret = psp.lib.LMB_RFM_GetSIM(byref(udw_sim))
+                if i_ret != ERR_Success:
+                    raise PSPError(get_psp_exc_msg("LMB_RFM_GetSIM", i_ret))
+            self._power_status = udw_power.value
+            self._sim_status = udw_sim.value
+            logger.debug(f"module power status {self._power_status:x}, sim card status {self._sim_status:x}")
+
+    def switch_sim(self, module: int, sim: Optional[int] = None) -> RFMSwitchModel:
+        """
+        Switch the SIM card of a module in one session.
+
+        A powered module is powered off, left off for ``settle_time`` seconds, switched
+        and powered back on. A module that is off is only switched. Nothing is done when
+        the module already uses that SIM card.
+
+        :param int module: ``1`` for M.2 or ``2`` for mPCIe
+        :param sim: ``0`` for the first SIM card, ``1`` for the second, :data:`None` (the default) for the other one
+        :type sim: int or None
+        :return: the new status and the time taken by each step (the settle time counts as power off)
+        :rtype: RFMSwitchModel
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(module, int):
+            raise TypeError("'module' type must be int")
+        if sim is not None and not isinstance(sim, int):
+            raise TypeError("'sim' type must be int or None")
+        # Check value.
+        if module not in (RFM_M2, RFM_MPCIE):
+            raise PSPInvalid(f"'module' value must be {RFM_M2} (M.2) or {RFM_MPCIE} (mPCIe)")
+        if sim is not None and sim not in (0, 1):
+            raise PSPInvalid("'sim' value must be 0 or 1")
+        # Run.
+        with self._lock:
+            power_status = self.power_status
+            sim_status = self.sim_status
+            if sim is None:
+                new_sim_status = sim_status ^ module
+            elif sim:
+                new_sim_status = sim_status | module
+            else:
+                new_sim_status = sim_status & ~module
+            is_powered = bool(power_status & module)
+            power_off_time = switch_time = power_on_time = 0.0
+            start_time = perf_counter()
+            if new_sim_status != sim_status:
+                with PSP() as psp:
+                    try:
+                        if is_powered:
+                            self._set(psp, "LMB_RFM_SetModule", power_status & ~module)
+                            self._power_status = power_status & ~module
+                            sleep(self._settle_time)
+                        power_off_time = perf_counter() - start_time
+                        self._set(psp, "LMB_RFM_SetSIM", new_sim_status)
+                        self._sim_status = new_sim_status
+                        switch_time = perf_counter() - start_time - power_off_time
+                        if is_powered:
+                            self._set(psp, "LMB_RFM_SetModule", power_status)
+                            self._power_status = power_status
+                        power_on_time = perf_counter() - start_time - power_off_time - switch_time
+                    except PSPError:
+                        # Do not leave the module powered off by a failed switch.
+                        if is_powered and self._power_status != power_status:
+                            try:
+                                self._set(psp, "LMB_RFM_SetModule", power_status)
+                            except PSPError as e:
+                                logger.error(f"cannot power the module back on: {e}")
+                        # The status is unknown after a failure.
+                        self._power_status = self._sim_status = None
+                        raise
+            self._last_switch = RFMSwitchModel(
+                module=module,
+                sim_status=new_sim_status,
+                power_status=power_status,
+                power_off_time=power_off_time,
+                switch_time=switch_time,
+                power_on_time=power_on_time,
+                total_time=perf_counter() - start_time,
+            )
+            logger.debug(f"switch sim card status {sim_status:x} -> {new_sim_status:x}"
+                         f" in {self._last_switch.total_time:.3f} s")
+            return self._last_switch
+
+    def switch_sim_async(self,
+                         module: int,
+                         sim: Optional[int] = None,
+                         on_complete: Optional[Callable[[RFMSwitchModel], Any]] = None) -> Future:
+        """
+        Run :meth:`switch_sim` in the background.
+
+        :param int module: ``1`` for M.2 or ``2`` for mPCIe
+        :param sim: ``0`` for the first SIM card, ``1`` for the second, :data:`None` (the default) for the other one
+        :type sim: int or None
+        :param on_complete: called from the background thread with the :class:`RFMSwitchModel`
+        :return: a future of the :class:`RFMSwitchModel`, use :func:`asyncio.wrap_future` to await it
+        :rtype: concurrent.futures.Future
+        :raises TypeError: The input parameters type error.
+        """
+        if on_complete is not None and not callable(on_complete):
+            raise TypeError("'on_complete' must be callable")
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run() -> None:
+            try:
+                result = self.switch_sim(module, sim)
+            except BaseException as e:
+                logger.error(f"switch sim card failure: {e}")
+                future.set_exception(e)
+                return
+            future.set_result(result)
+            if on_complete is not None:
+                try:
+                    on_complete(result)
+                except Exception as e:
+                    logger.error(f"switch sim card callback failed: {e}")
+
+        Thread(target=run, daemon=True).start()
+        return future
+
+    @classmethod
+    def _set(cls, psp: PSP, func_name: str, value: int) -> None:
+        """
+        Call an RFM set function in an opened PSP session.
+
+        :raises PSPInvalid: The input parameter is out of range.
+        :raises PSPError: General PSP functional error.
+        """
+        i_ret = getattr(psp.lib, func_name)(value)
+        msg = get_psp_exc_msg(func_name, i_ret)
+        if i_ret == ERR_Success:
+            logger.debug(f"{func_name} {value:d}")
+        elif i_ret == ERR_Invalid:
+            raise PSPInvalid(msg)
+        else:
+            raise PSPError(msg)
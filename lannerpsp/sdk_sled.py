@@ -1,8 +1,14 @@
+import heapq
 import logging
 from ctypes import byref, c_uint8
+from itertools import count
+from threading import Condition, RLock, Thread, local
+from time import monotonic
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
+    PSPBusyInUses,
     PSPError,
     PSPInvalid,
     PSPNotOpened,
@@ -22,6 +28,116 @@ logger = logging.getLogger(__name__)
 SUPPORTED_PLATFORMS = ("LEB-7242", "NCA-2510",)
 UNSUPPORTED_PLATFORMS = ("LEB-2680", "LEC-2290", "LEC-7230", "V3S", "V6S",)
 
+# The last mode set on each LED, by SLED function name, shared by all LED classes.
+_led_lock = RLock()
+_led_states: Dict[str, int] = {}
+# The PSP session of the LEDBatch of the current thread.
+_led_batch = local()
+
+
+class LEDBatch:
+    """
+    Set several status LEDs in one PSP session.
+
+    Inside the ``with`` block, the methods of :class:`SystemLED`, :class:`GPSStatusLED`,
+    :class:`LTEStatusLED` and :class:`LTEStressLED` called from the same thread use the
+    session of the batch instead of opening their own.
+
+    All LED classes remember the last mode set on each LED and skip the SLED function
+    call when the LED is already in that mode, so re-asserting the LED states every loop
+    costs nothing. Call :meth:`invalidate` when an LED was changed by another program.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> system_led = SystemLED()
+        >>> lte_status_led = LTEStatusLED()
+        >>> with LEDBatch():
+        ...     system_led.green()
+        ...     lte_status_led.green_blink()
+    """
+
+    def __init__(self) -> None:
+        self._psp: Optional[PSP] = None
+
+    def __enter__(self) -> "LEDBatch":
+        if getattr(_led_batch, "psp", None) is None:
+            self._psp = PSP()
+            _led_batch.psp = self._psp.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        if self._psp is not None:
+            _led_batch.psp = None
+            psp, self._psp = self._psp, None
+            psp.__exit__(exc_type, exc_val, exc_tb)
+        return False
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Forget the mode of all LEDs, so the next call of each LED is sent again."""
+        with _led_lock:
+            _led_states.clear()
+
+
+def _set_led(func_name: str, mode: int) -> bool:
+    """
+    Set an LED by its SLED function, unless it is already in that mode.
+
+    :return: :data:`True` if the SLED function was called, :data:`False` if it was skipped
+    :raises PSPNotOpened: The library is not ready or opened yet.
+    :raises PSPInvalid: The input parameter is out of range.
+    :raises PSPNotSupport: This function is not supported.
+    :raises PSPError: General PSP functional error.
+    """
+    with _led_lock:
+        if _led_states.get(func_name) == mode:
+            return False
+        psp = getattr(_led_batch, "psp", None)
+        if psp is not None:
+            _write_led(psp, func_name, mode)
+        else:
+            with PSP() as psp:
+                _write_led(psp, func_name, mode)
+        return True
+
+
+def _write_led(psp: PSP, func_name: str, mode: int) -> None:
+    """
+    Call an SLED function in an opened PSP session and remember the mode.
+
+    :raises PSPNotOpened: The library is not ready or opened yet.
+    :raises PSPInvalid: The input parameter is out of range.
+    :raises PSPNotSupport: This function is not supported.
+    :raises PSPError: General PSP functional error.
+    """
+    _led_states.pop(func_name, None)
+    i_ret = getattr(psp.lib, func_name)(mode)
+    msg = get_psp_exc_msg(func_name, i_ret)
+    if i_ret == ERR_Success:
+        _led_states[func_name] = mode
+    elif i_ret == ERR_NotOpened:
+        raise PSPNotOpened(msg)
+    elif i_ret == ERR_Invalid:
+        raise PSPInvalid(msg)
+    elif i_ret == ERR_NotSupport:
+        raise PSPNotSupport(msg)
+    else:
+        raise PSPError(msg)
+
+
+def _is_led_set(func_name: str, mode: int) -> bool:
+    """Returns :data:`True` if the LED is known to be in that mode."""
+    with _led_lock:
+        return _led_states.get(func_name) == mode
+
+
+def _invalidate_led(func_name: str) -> None:
+    """Forget the mode of an LED."""
+    with _led_lock:
+        _led_states.pop(func_name, None)
+
 
 class SystemLED:
     """
@@ -37,6 +153,9 @@ class SystemLED:
     :raises NotImplementedError: It has not been verified to run on this platform
         (when ``check_platform`` is set to :data:`True`).
     """
+    # The SLED function and display modes used by LEDAnimator.
+    _SLED_FUNC = "LMB_SLED_SetSystemLED"
+    _SLED_MODES = {"off": 0, "green": 1, "red": 2}
 
     def __init__(self, check_platform: bool = False) -> None:
         self._version = DLL().get_version()
@@ -68,10 +187,17 @@ class SystemLED:
         :raises PSPError: General PSP functional error.
         """
         ub_read = c_uint8(0xFF)
-        with PSP() as psp:
+        psp = getattr(_led_batch, "psp", None)
+        if psp is not None:
             i_ret = psp.lib.LMB_SLED_GetSystemLED(byref(ub_read))
+        else:
+            with PSP() as psp:
+                i_ret = psp.lib.LMB_SLED_GetSystemLED(byref(ub_read))
         msg = get_psp_exc_msg("LMB_SLED_GetSystemLED", i_ret)
         if i_ret == ERR_Success:
+            # Follow the changes made by other programs.
+            with _led_lock:
+                _led_states["LMB_SLED_SetSystemLED"] = ub_read.value
             return ub_read.value
         elif i_ret == ERR_NotOpened:
             raise PSPNotOpened(msg)
@@ -96,19 +222,8 @@ class SystemLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetSystemLED(0)
-        msg = get_psp_exc_msg("LMB_SLED_SetSystemLED", i_ret)
-        if i_ret == ERR_Success:
-            pass
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        if not _set_led("LMB_SLED_SetSystemLED", 0):
+            return
         # Check setting.
         if self.get_status() == 0:
             logger.debug("set status led off")
@@ -131,19 +246,8 @@ class SystemLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetSystemLED(1)
-        msg = get_psp_exc_msg("LMB_SLED_SetSystemLED", i_ret)
-        if i_ret == ERR_Success:
-            pass
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        if not _set_led("LMB_SLED_SetSystemLED", 1):
+            return
         # Check setting.
         if self.get_status() == 1:
             logger.debug("set status led green")
@@ -166,19 +270,8 @@ class SystemLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetSystemLED(2)
-        msg = get_psp_exc_msg("LMB_SLED_SetSystemLED", i_ret)
-        if i_ret == ERR_Success:
-            pass
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        if not _set_led("LMB_SLED_SetSystemLED", 2):
+            return
         # Check setting.
         if self.get_status() == 2:
             logger.debug("set status led red/amber")
@@ -212,6 +305,7 @@ class SystemLED:
         if secs <= 0:
             raise ValueError("'secs' value must be >= 0")
         # Run.
+        _invalidate_led("LMB_SLED_SetSystemLED")
         with PSP() as psp:
             i_ret = psp.lib.LMB_SLED_SetSystemLED(1)
             if i_ret != ERR_Success:
@@ -237,3 +331,228 @@ class SystemLED:
                 print(f"\033[1;31m{msg}\033[0m")
             else:
                 print("set status led off")
+
+
+class LEDAnimator:
+    """
+    Play LED patterns on the status LEDs from one dedicated thread in one PSP session.
+
+    A pattern is a list of ``(mode, duration)`` steps: the LED is set to ``mode`` and
+    held for ``duration`` seconds. A mode is a display mode name of the LED class:
+
+    * :class:`SystemLED`: ``"off"``, ``"green"``, ``"red"``
+    * :class:`GPSStatusLED`: ``"off"``, ``"on"``, ``"blink"``
+    * :class:`LTEStatusLED`: ``"off"``, ``"red"``, ``"red_blink"``, ``"green"``,
+      ``"green_blink"``, ``"yellow"``, ``"yellow_blink"``
+    * :class:`LTEStressLED`: ``"off"`` or a signal strength percent (0 ~ 100)
+
+    Steps are scheduled against absolute deadlines, so the timing error does not
+    accumulate. Steps of all LEDs due within the same ``tick`` are applied in one
+    wakeup, and an LED already in the mode of a step is not set again.
+
+    An LED that fails to be set (for example not supported on this platform) stops
+    its pattern with an error log, the other LEDs keep playing.
+
+    Example for 2 short red blinks then a pause on the system LED, and a ramp on
+    the LTE stress LED:
+
+    .. code-block:: pycon
+
+        >>> with LEDAnimator() as animator:
+        ...     animator.play(SystemLED(), [("red", 0.15), ("off", 0.15), ("red", 0.15), ("off", 1)])
+        ...     animator.play(LTEStressLED(), [(percent, 0.1) for percent in range(0, 101, 10)])
+        ...     sleep(10)
+
+    :param tick: steps due within this number of seconds are applied together
+    :type tick: float or int
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self, tick: Union[float, int] = 0.01) -> None:
+        # Check type.
+        if not isinstance(tick, (float, int)):
+            raise TypeError("'tick' type must be float or int")
+        # Check value.
+        if tick < 0:
+            raise PSPInvalid("'tick' value must be >= 0")
+        self._tick = tick
+        self._cond = Condition()
+        # SLED function name -> (generation, steps, repeat).
+        self._animations: Dict[str, Tuple[int, Tuple[Tuple[int, float], ...], int]] = {}
+        # (deadline, order, SLED function name, generation, step index, count).
+        self._schedule: List[Tuple[float, int, str, int, int, int]] = []
+        self._order = count()
+        self._generation = count()
+        self._thread: Optional[Thread] = None
+        self._stop = False
+        self._exc: Optional[BaseException] = None
+
+    def __enter__(self) -> "LEDAnimator":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the animator thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Start the animator thread.
+
+        :raises PSPBusyInUses: The animator is already running.
+        """
+        if self.is_running:
+            raise PSPBusyInUses("The LED animator is already running")
+        with self._cond:
+            self._stop = False
+        self._exc = None
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the animator thread. The LEDs keep their last mode.
+
+        :raises PSPError: The error raised by the animator thread.
+        """
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._exc is not None:
+            exc, self._exc = self._exc, None
+            raise exc
+
+    def play(self, led: Any, pattern: Sequence[Tuple[Union[str, int], Union[float, int]]], repeat: int = 0) -> None:
+        """
+        Play a pattern on an LED, replacing the pattern it is playing.
+
+        :param led: a :class:`SystemLED`, :class:`GPSStatusLED`, :class:`LTEStatusLED` or :class:`LTEStressLED`
+        :param pattern: list of ``(mode, duration)`` steps
+        :param int repeat: number of times to play the pattern, ``0`` to repeat until :meth:`cancel`
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: The input parameter is out of range.
+        """
+        # Check type.
+        func_name = getattr(led, "_SLED_FUNC", None)
+        if func_name is None:
+            raise TypeError("'led' type must be SystemLED, GPSStatusLED, LTEStatusLED or LTEStressLED")
+        if not isinstance(pattern, (list, tuple)):
+            raise TypeError("'pattern' type must be list or tuple")
+        if not isinstance(repeat, int):
+            raise TypeError("'repeat' type must be int")
+        steps = []
+        for step in pattern:
+            if not isinstance(step, (list, tuple)) or len(step) != 2:
+                raise TypeError("'step' must be a (mode, duration) tuple")
+            mode, duration = step
+            if not isinstance(duration, (float, int)):
+                raise TypeError("'duration' type must be float or int")
+            # Check value.
+            if duration < 0:
+                raise PSPInvalid("'duration' value must be >= 0")
+            if isinstance(mode, str) and mode in led._SLED_MODES:
+                steps.append((led._SLED_MODES[mode], float(duration)))
+            elif getattr(led, "_SLED_PERCENT", False) and isinstance(mode, int) and 0 <= mode <= 100:
+                steps.append((mode, float(duration)))
+            else:
+                raise PSPInvalid(f"'mode' {mode!r} is not supported by {type(led).__name__}")
+        # Check value.
+        if not steps:
+            raise PSPInvalid("'pattern' must not be empty")
+        if sum(duration for _, duration in steps) <= 0:
+            raise PSPInvalid("'pattern' duration must be > 0")
+        if repeat < 0:
+            raise PSPInvalid("'repeat' value must be >= 0")
+        # Run.
+        with self._cond:
+            generation = next(self._generation)
+            self._animations[func_name] = (generation, tuple(steps), repeat)
+            heapq.heappush(self._schedule, (monotonic(), next(self._order), func_name, generation, 0, 0))
+            self._cond.notify()
+
+    def cancel(self, led: Any) -> None:
+        """
+        Stop the pattern of an LED. The LED keeps its current mode.
+
+        :param led: the LED given to :meth:`play`
+        """
+        with self._cond:
+            self._animations.pop(getattr(led, "_SLED_FUNC", None), None)
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        try:
+            with PSP() as psp:
+                while True:
+                    with self._cond:
+                        due = self._wait_due()
+                        if due is None:
+                            return
+                    failed = []
+                    with _led_lock:
+                        for func_name, generation, mode in due:
+                            if _led_states.get(func_name) == mode:
+                                continue
+                            try:
+                                if func_name == "LMB_SLED_SetLteStateLED" and mode != 0:
+                                    _write_led(psp, func_name, 0)  # Clear color.
+                                _write_led(psp, func_name, mode)
+                            except PSPError as e:
+                                # Stop this LED only, the other LEDs keep their patterns.
+                                logger.error(f"LED animator cannot set {func_name}: {e}")
+                                failed.append((func_name, generation))
+                    if failed:
+                        with self._cond:
+                            for func_name, generation in failed:
+                                if self._animations.get(func_name, (None,))[0] == generation:
+                                    del self._animations[func_name]
+        except BaseException as e:
+            logger.error(f"LED animator stopped: {e}")
+            self._exc = e
+
+    def _wait_due(self) -> Optional[List[Tuple[str, int]]]:
+        """
+        Wait for the next tick and return its ``(SLED function name, generation, mode)`` steps, scheduling the next steps.
+
+        :return: the steps, :data:`None` when stopped
+        """
+        schedule = self._schedule
+        while True:
+            # Drop the steps of cancelled or replaced patterns.
+            while schedule and self._animations.get(schedule[0][2], (None,))[0] != schedule[0][3]:
+                heapq.heappop(schedule)
+            if self._stop:
+                return None
+            now = monotonic()
+            if schedule and schedule[0][0] <= now:
+                break
+            self._cond.wait(schedule[0][0] - now if schedule else None)
+        due = {}
+        tick_end = schedule[0][0] + self._tick
+        while schedule and schedule[0][0] <= max(now, tick_end):
+            deadline, _, func_name, generation, index, played = heapq.heappop(schedule)
+            animation = self._animations.get(func_name)
+            if animation is None or animation[0] != generation:
+                continue
+            _, steps, repeat = animation
+            mode, duration = steps[index]
+            due[func_name] = (generation, mode)
+            # Schedule the next step, a later step of the same LED in this tick overrides this one.
+            index += 1
+            if index == len(steps):
+                index = 0
+                played += 1
+                if repeat and played >= repeat:
+                    del self._animations[func_name]
+                    continue
+            heapq.heappush(schedule, (deadline + duration, next(self._order), func_name, generation, index, played))
+        return [(func_name, generation, mode) for func_name, (generation, mode) in due.items()]
@@ -1,19 +1,10 @@
 import logging
 
 from .core import PSP, get_psp_exc_msg
-from .exc import (
-    PSPError,
-    PSPInvalid,
-    PSPNotOpened,
-    PSPNotSupport,
-)
-from .lmbinc import (
-    ERR_Invalid,
-    ERR_NotOpened,
-    ERR_NotSupport,
-    ERR_Success,
-)
+from .exc import PSPNotSupport
+from .lmbinc import ERR_Success
 from .sdk_dll import DLL
+from .sdk_sled import _invalidate_led, _set_led
 from .utils import show_delay
 
 logger = logging.getLogger(__name__)
@@ -34,6 +25,9 @@ class GPSStatusLED:
     :raises NotImplementedError: It has not been verified to run on this platform
         (when ``check_platform`` is set to :data:`True`).
     """
+    # The SLED function and display modes used by LEDAnimator.
+    _SLED_FUNC = "LMB_SLED_SetGPSLED"
+    _SLED_MODES = {"off": 0, "on": 1, "blink": 2}
 
     def __init__(self, check_platform: bool = False) -> None:
         self._version = DLL().get_version()
@@ -62,19 +56,8 @@ class GPSStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetGPSLED(0)
-        msg = get_psp_exc_msg("LMB_SLED_SetGPSLED", i_ret)
-        if i_ret == ERR_Success:
+        if _set_led("LMB_SLED_SetGPSLED", 0):
             logger.debug("set gps led off")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
 
     def on(self) -> None:
         """
@@ -92,19 +75,8 @@ class GPSStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetGPSLED(1)
-        msg = get_psp_exc_msg("LMB_SLED_SetGPSLED", i_ret)
-        if i_ret == ERR_Success:
+        if _set_led("LMB_SLED_SetGPSLED", 1):
             logger.debug("set gps led on")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
 
     def blink(self) -> None:
         """
@@ -122,19 +94,8 @@ class GPSStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetGPSLED(2)
-        msg = get_psp_exc_msg("LMB_SLED_SetGPSLED", i_ret)
-        if i_ret == ERR_Success:
+        if _set_led("LMB_SLED_SetGPSLED", 2):
             logger.debug("set gps led blink")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
 
     def test(self, secs: int = 2) -> None:
         """
@@ -163,6 +124,7 @@ class GPSStatusLED:
         if secs <= 0:
             raise ValueError("'secs' value must be >= 0")
         # Run.
+        _invalidate_led("LMB_SLED_SetGPSLED")
         with PSP() as psp:
             i_ret = psp.lib.LMB_SLED_SetGPSLED(1)
             if i_ret != ERR_Success:
@@ -1,19 +1,10 @@
 import logging
 
 from .core import PSP, get_psp_exc_msg
-from .exc import (
-    PSPError,
-    PSPInvalid,
-    PSPNotOpened,
-    PSPNotSupport,
-)
-from .lmbinc import (
-    ERR_Invalid,
-    ERR_NotOpened,
-    ERR_NotSupport,
-    ERR_Success,
-)
+from .exc import PSPNotSupport
+from .lmbinc import ERR_Success
 from .sdk_dll import DLL
+from .sdk_sled import LEDBatch, _invalidate_led, _is_led_set, _led_lock, _set_led
 from .utils import show_delay
 
 logger = logging.getLogger(__name__)
@@ -34,6 +25,9 @@ class LTEStatusLED:
     :raises NotImplementedError: It has not been verified to run on this platform
         (when ``check_platform`` is set to :data:`True`).
     """
+    # The SLED function and display modes used by LEDAnimator.
+    _SLED_FUNC = "LMB_SLED_SetLteStateLED"
+    _SLED_MODES = {"off": 0, "red": 1, "red_blink": 2, "green": 3, "green_blink": 4, "yellow": 5, "yellow_blink": 6}
 
     def __init__(self, check_platform: bool = False) -> None:
         self._version = DLL().get_version()
@@ -62,19 +56,8 @@ class LTEStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStateLED(0)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStateLED", i_ret)
-        if i_ret == ERR_Success:
+        if _set_led("LMB_SLED_SetLteStateLED", 0):
             logger.debug("set lte led off")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
 
     def red(self) -> None:
         """
@@ -92,20 +75,7 @@ class LTEStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        self.off()  # Clear color.
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStateLED(1)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStateLED", i_ret)
-        if i_ret == ERR_Success:
-            logger.debug("set lte led red on")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        self._set_color(1, "set lte led red on")
 
     def red_blink(self) -> None:
         """
@@ -123,20 +93,7 @@ class LTEStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        self.off()  # Clear color.
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStateLED(2)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStateLED", i_ret)
-        if i_ret == ERR_Success:
-            logger.debug("set lte led red blink")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        self._set_color(2, "set lte led red blink")
 
     def green(self) -> None:
         """
@@ -154,20 +111,7 @@ class LTEStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        self.off()  # Clear color.
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStateLED(3)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStateLED", i_ret)
-        if i_ret == ERR_Success:
-            logger.debug("set lte led green on")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        self._set_color(3, "set lte led green on")
 
     def green_blink(self) -> None:
         """
@@ -185,20 +129,7 @@ class LTEStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        self.off()  # Clear color.
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStateLED(4)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStateLED", i_ret)
-        if i_ret == ERR_Success:
-            logger.debug("set lte led green blink")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        self._set_color(4, "set lte led green blink")
 
     def yellow(self) -> None:
         """
@@ -216,20 +147,7 @@ class LTEStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        self.off()  # Clear color.
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStateLED(5)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStateLED", i_ret)
-        if i_ret == ERR_Success:
-            logger.debug("set lte led yellow on")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        self._set_color(5, "set lte led yellow on")
 
     def yellow_blink(self) -> None:
         """
@@ -247,20 +165,17 @@ class LTEStatusLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        self.off()  # Clear color.
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStateLED(6)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStateLED", i_ret)
-        if i_ret == ERR_Success:
-            logger.debug("set lte led yellow blink")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
+        self._set_color(6, "set lte led yellow blink")
+
+    def _set_color(self, mode: int, description: str) -> None:
+        """Clear the color then set the mode, in one session and only if the mode changes."""
+        with _led_lock:
+            if _is_led_set("LMB_SLED_SetLteStateLED", mode):
+                return
+            with LEDBatch():
+                self.off()  # Clear color.
+                _set_led("LMB_SLED_SetLteStateLED", mode)
+        logger.debug(description)
 
     def test(self, secs: int = 2) -> None:
         """
@@ -301,6 +216,7 @@ class LTEStatusLED:
         if secs <= 0:
             raise ValueError("'secs' value must be >= 0")
         # Run.
+        _invalidate_led("LMB_SLED_SetLteStateLED")
         with PSP() as psp:
             i_ret = psp.lib.LMB_SLED_SetLteStateLED(1)
             if i_ret != ERR_Success:
@@ -1,19 +1,18 @@
 import logging
+import os
+import re
+import tty
+from math import floor
+from select import select
+from threading import Event, Thread
+from time import monotonic, time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from .core import PSP, get_psp_exc_msg
-from .exc import (
-    PSPError,
-    PSPInvalid,
-    PSPNotOpened,
-    PSPNotSupport,
-)
-from .lmbinc import (
-    ERR_Invalid,
-    ERR_NotOpened,
-    ERR_NotSupport,
-    ERR_Success,
-)
+from .exc import PSPBusyInUses, PSPError, PSPInvalid, PSPNotSupport
+from .lmbinc import ERR_Success
 from .sdk_dll import DLL
+from .sdk_sled import _invalidate_led, _set_led
 from .utils import show_delay
 
 logger = logging.getLogger(__name__)
@@ -21,6 +20,23 @@ logger = logging.getLogger(__name__)
 SUPPORTED_PLATFORMS = ("LEB-7242",)
 UNSUPPORTED_PLATFORMS = ("LEB-2680", "LEC-2290", "LEC-7230", "NCA-2510", "V3S", "V6S",)
 
+DEFAULT_MODEM_AT_PORT = "/dev/ttyUSB2"
+
+# The LED level of LTESignalMonitor is unknown (not set yet or the last set failed).
+_LEVEL_UNKNOWN = -1
+
+
+class LTESignalModel(NamedTuple):
+    """To store an LTE signal reading, :data:`None` when the modem does not know the value."""
+    rssi: Optional[int]
+    rsrp: Optional[int]
+    percent: Optional[int]
+    timestamp: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
 
 class LTEStressLED:
     """
@@ -34,6 +50,10 @@ class LTEStressLED:
     :raises NotImplementedError: It has not been verified to run on this platform
         (when ``check_platform`` is set to :data:`True`).
     """
+    # The SLED function and display modes used by LEDAnimator, a percent is also a mode.
+    _SLED_FUNC = "LMB_SLED_SetLteStressLED"
+    _SLED_MODES = {"off": -1}
+    _SLED_PERCENT = True
 
     def __init__(self, check_platform: bool = False) -> None:
         self._version = DLL().get_version()
@@ -62,19 +82,8 @@ class LTEStressLED:
         :raises PSPNotSupport: This function is not supported.
         :raises PSPError: General PSP functional error.
         """
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStressLED(-1)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStressLED", i_ret)
-        if i_ret == ERR_Success:
+        if _set_led("LMB_SLED_SetLteStressLED", -1):
             logger.debug("set lte stress led off")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
 
     def set_strength(self, percent: int) -> None:
         """
@@ -101,19 +110,8 @@ class LTEStressLED:
         if not 0 <= percent <= 100:
             raise PSPInvalid("'percent' value must be between 0 and 100")
         # Run.
-        with PSP() as psp:
-            i_ret = psp.lib.LMB_SLED_SetLteStressLED(percent)
-        msg = get_psp_exc_msg("LMB_SLED_SetLteStressLED", i_ret)
-        if i_ret == ERR_Success:
+        if _set_led("LMB_SLED_SetLteStressLED", percent):
             logger.debug(f"set lte stress led {percent:d}%")
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        else:
-            raise PSPError(msg)
 
     def test(self, secs: int = 2) -> None:
         """
@@ -154,6 +152,7 @@ class LTEStressLED:
         if secs <= 0:
             raise ValueError("'secs' value must be >= 0")
         # Run.
+        _invalidate_led("LMB_SLED_SetLteStressLED")
         with PSP() as psp:
             i_ret = psp.lib.LMB_SLED_SetLteStressLED(90)
             if i_ret != ERR_Success:
@@ -233,3 +232,287 @@ class LTEStressLED:
                 print(f"\033[1;31m{msg}\033[0m")
             else:
                 print("set lte stress led off")
+
+
+class _ATParser:
+    """Incremental parser of ``+CSQ`` and ``+CESQ`` responses, fed with the bytes read so far."""
+
+    MAX_LINE = 1024
+    _RE_CSQ = re.compile(r"\+CSQ:\s*(\d+),\s*(\d+)")
+    _RE_CESQ = re.compile(r"\+CESQ:\s*(\d+),\s*(\d+),\s*(\d+),\s*(\d+),\s*(\d+),\s*(\d+)")
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.rssi: Optional[int] = None
+        self.rsrp: Optional[int] = None
+        self.seen = False
+
+    def reset(self) -> None:
+        """Forget the values parsed so far, before a new cycle of commands."""
+        self.rssi = self.rsrp = None
+        self.seen = False
+
+    def feed(self, data: bytes) -> int:
+        """
+        Parse the bytes read from the AT port.
+
+        :return: the number of completed command responses (final result codes)
+        """
+        self._buffer += data
+        *lines, rest = re.split(rb"[\r\n]+", self._buffer)
+        # Drop a partial line that can never complete.
+        self._buffer = bytearray(rest[-self.MAX_LINE:])
+        results = 0
+        for line in lines:
+            text = line.decode("ascii", "replace").strip()
+            m = self._RE_CSQ.match(text)
+            if m:
+                rssi = int(m.group(1))
+                # 0 ~ 31: -113 ~ -51 dBm, 99: not known.
+                self.rssi = -113 + 2 * rssi if rssi <= 31 else None
+                self.seen = True
+                continue
+            m = self._RE_CESQ.match(text)
+            if m:
+                rsrp = int(m.group(6))
+                # 0 ~ 97: -141 ~ -44 dBm, 255: not known.
+                self.rsrp = -141 + rsrp if rsrp <= 97 else None
+                self.seen = True
+                continue
+            if text in ("OK", "ERROR") or text.startswith("+CME ERROR"):
+                results += 1
+        return results
+
+
+class LTESignalMonitor:
+    """
+    Show the LTE signal strength of a modem on the LTE stress LED.
+
+    A dedicated thread sends ``AT+CSQ`` then ``AT+CESQ`` to the modem AT port every ``interval``
+    seconds and parses the responses without blocking. The RSRP (or the RSSI when the
+    modem does not report RSRP) is mapped to a percent and quantized to ``levels``
+    levels with ``hysteresis``; :meth:`LTEStressLED.set_strength` is only called when
+    the level changes. The LED is turned off when the modem reports no signal.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> with LTESignalMonitor("/dev/ttyUSB2") as monitor:
+        ...     sleep(30)
+        ...     monitor.signal
+        LTESignalModel(rssi=-71, rsrp=-97, percent=57, timestamp=1667808000.0)
+
+    :param str port: the modem AT port
+    :param LTEStressLED led: the LED to drive. Defaults to a new :class:`LTEStressLED`.
+    :param interval: number of seconds between two readings
+    :type interval: float or int
+    :param int levels: number of LED levels
+    :param hysteresis: percent points a reading must go past a level boundary to change the level
+    :type hysteresis: float or int
+    :param tuple rsrp_range: the RSRP in dBm shown as 0 and 100 percent
+    :param tuple rssi_range: the RSSI in dBm shown as 0 and 100 percent
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: The input parameter is out of range.
+    """
+
+    def __init__(self,
+                 port: str = DEFAULT_MODEM_AT_PORT,
+                 led: Optional[LTEStressLED] = None,
+                 interval: Union[float, int] = 5,
+                 levels: int = 8,
+                 hysteresis: Union[float, int] = 3,
+                 rsrp_range: Tuple[int, int] = (-120, -80),
+                 rssi_range: Tuple[int, int] = (-113, -51)) -> None:
+        if led is None:
+            led = LTEStressLED()
+        # Check type.
+        if not isinstance(port, str):
+            raise TypeError("'port' type must be str")
+        if not isinstance(led, LTEStressLED):
+            raise TypeError("'led' type must be LTEStressLED")
+        if not isinstance(interval, (float, int)):
+            raise TypeError("'interval' type must be float or int")
+        if not isinstance(levels, int):
+            raise TypeError("'levels' type must be int")
+        if not isinstance(hysteresis, (float, int)):
+            raise TypeError("'hysteresis' type must be float or int")
+        for name, value in (("rsrp_range", rsrp_range), ("rssi_range", rssi_range)):
+            if (not isinstance(value, (list, tuple)) or len(value) != 2 or
+                    not all(isinstance(v, int) for v in value)):
+                raise TypeError(f"'{name}' must be a (low, high) tuple of int")
+        # Check value.
+        if interval <= 0:
+            raise PSPInvalid("'interval' value must be > 0")
+        if not 1 <= levels <= 100:
+            raise PSPInvalid("'levels' value must be between 1 and 100")
+        if not 0 <= hysteresis < 50 / levels:
+            raise PSPInvalid(f"'hysteresis' value must be between 0 and {50 / levels}")
+        if rsrp_range[0] >= rsrp_range[1] or rssi_range[0] >= rssi_range[1]:
+            raise PSPInvalid("'rsrp_range' and 'rssi_range' must be (low, high) with low < high")
+        self._port = port
+        self._led = led
+        self._interval = interval
+        self._levels = levels
+        self._hysteresis = hysteresis
+        self._rsrp_range = tuple(rsrp_range)
+        self._rssi_range = tuple(rssi_range)
+        self._level: Optional[int] = _LEVEL_UNKNOWN
+        self._signal: Optional[LTESignalModel] = None
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self._exc: Optional[BaseException] = None
+
+    def __enter__(self) -> "LTESignalMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the monitor thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def signal(self) -> Optional[LTESignalModel]:
+        """The last signal reading, :data:`None` before the first reading."""
+        return self._signal
+
+    @property
+    def level(self) -> Optional[int]:
+        """The level shown on the LED (0 ~ ``levels`` - 1), :data:`None` when the LED is off or not set yet."""
+        return None if self._level == _LEVEL_UNKNOWN else self._level
+
+    def start(self) -> None:
+        """
+        Open the modem AT port and start monitoring in the background.
+
+        :raises PSPBusyInUses: The monitor is already running.
+        :raises OSError: The AT port cannot be opened.
+        """
+        if self.is_running:
+            raise PSPBusyInUses("The LTE signal monitor is already running")
+        fd = os.open(self._port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            tty.setraw(fd)
+        except Exception:
+            os.close(fd)
+            raise
+        self._level = _LEVEL_UNKNOWN
+        self._stop.clear()
+        self._exc = None
+        self._thread = Thread(target=self._run, args=(fd,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop monitoring. The LED keeps its last level.
+
+        :raises OSError: The error raised by the monitor thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._exc is not None:
+            exc, self._exc = self._exc, None
+            raise exc
+
+    def _run(self, fd: int) -> None:
+        """Thread target of :meth:`start`."""
+        parser = _ATParser()
+        # Separate commands, so a modem without +CESQ still answers +CSQ.
+        commands: List[bytes] = []
+        waiting = False
+        try:
+            deadline = monotonic()
+            while not self._stop.is_set():
+                now = monotonic()
+                if now >= deadline:
+                    # Start a new cycle, also when the modem did not answer the last one.
+                    parser.reset()
+                    commands = [b"AT+CESQ\r"]
+                    waiting = self._send(fd, b"AT+CSQ\r")
+                    deadline += self._interval
+                    if deadline < now:
+                        deadline = now + self._interval
+                # Wake up at least every 0.1 second to notice stop().
+                readable, _, _ = select([fd], [], [], min(max(deadline - monotonic(), 0.0), 0.1))
+                if not readable:
+                    continue
+                try:
+                    data = os.read(fd, 4096)
+                except BlockingIOError:
+                    continue
+                for _ in range(parser.feed(data)):
+                    if not waiting:
+                        continue
+                    if commands:
+                        waiting = self._send(fd, commands.pop(0))
+                        continue
+                    waiting = False
+                    if parser.seen:
+                        self._update(parser.rssi, parser.rsrp)
+        except BaseException as e:
+            logger.error(f"LTE signal monitor stopped: {e}")
+            self._exc = e
+        finally:
+            os.close(fd)
+
+    @classmethod
+    def _send(cls, fd: int, command: bytes) -> bool:
+        """Write a command to the AT port, :data:`False` if the port is busy (the cycle is retried later)."""
+        try:
+            os.write(fd, command)
+        except BlockingIOError:
+            logger.debug(f"LTE modem AT port is busy, skip {command.strip().decode()}")
+            return False
+        return True
+
+    def _update(self, rssi: Optional[int], rsrp: Optional[int]) -> None:
+        """Map a reading to a level and set the LED if the level changed."""
+        if rsrp is not None:
+            low, high = self._rsrp_range
+            percent = (rsrp - low) * 100 / (high - low)
+        elif rssi is not None:
+            low, high = self._rssi_range
+            percent = (rssi - low) * 100 / (high - low)
+        else:
+            percent = None
+        if percent is not None:
+            percent = min(max(percent, 0.0), 100.0)
+        self._signal = LTESignalModel(
+            rssi=rssi,
+            rsrp=rsrp,
+            percent=None if percent is None else round(percent),
+            timestamp=time(),
+        )
+        level = self._quantize(percent)
+        if level == self._level:
+            return
+        try:
+            if level is None:
+                self._led.off()
+            else:
+                # Show the middle of the level.
+                self._led.set_strength(round((level + 0.5) * 100 / self._levels))
+        except PSPError as e:
+            # Try again on the next reading, also when the LED was to be turned off.
+            logger.warning(f"set lte stress led failure: {e}")
+            self._level = _LEVEL_UNKNOWN
+            return
+        logger.debug(f"lte signal {self._signal.percent}% shown as level {level}")
+        self._level = level
+
+    def _quantize(self, percent: Optional[float]) -> Optional[int]:
+        """Quantize a percent to a level, keeping the current level within the hysteresis."""
+        if percent is None:
+            return None
+        step = 100 / self._levels
+        if self._level is not None and self._level != _LEVEL_UNKNOWN:
+            if self._level * step - self._hysteresis <= percent < (self._level + 1) * step + self._hysteresis:
+                return self._level
+        return min(floor(percent / step), self._levels - 1)
@@ -1,6 +1,11 @@
 import logging
+import os
 from ctypes import byref
-from typing import Any, Dict, NamedTuple
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from .core import PSP, get_psp_exc_msg
 from .exc import (
@@ -42,6 +47,36 @@ class WDTInfoModel(NamedTuple):
         return dict(self._asdict())
 
 
+class WDTKeepaliveStatsModel(NamedTuple):
+    """To store :class:`WDTKeepalive` feeding statistics (in seconds)."""
+    feeds: int
+    interval: float
+    mean_jitter: float
+    max_jitter: float
+    min_margin: float
+    warnings: int
+    skipped: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
+class WDTProbeStatsModel(NamedTuple):
+    """To store the heartbeat statistics of a :class:`WDTSupervisor` liveness probe (in seconds)."""
+    name: str
+    deadline: float
+    beats: int
+    age: float
+    mean_interval: float
+    max_interval: float
+    is_stale: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return dict(self._asdict())
+
+
 class WDT:
     """
     Watch Dog Timer.
@@ -54,6 +89,8 @@ class WDT:
     :raises NotImplementedError: It has not been verified to run on this platform
         (when ``check_platform`` is set to :data:`True`).
     """
+    # WDT information shared by all instances in this process.
+    _info: Optional[WDTInfoModel] = None
 
     def __init__(self, check_platform: bool = False) -> None:
         self._version = DLL().get_version()
@@ -66,10 +103,12 @@ class WDT:
         else:
             raise NotImplementedError
 
-    def get_info(self) -> WDTInfoModel:
+    def get_info(self, refresh: bool = False) -> WDTInfoModel:
         """
         Get Watch Dog Timer information.
 
+        The information is queried once and cached for the life of the process.
+
         Example:
 
         .. code-block:: pycon
@@ -78,23 +117,27 @@ class WDT:
             >>> wdt.get_info()
             WDTInfoModel(type='SuperIO', max_count=255, is_minute_support=True)
 
+        :param bool refresh: set :data:`True` to query the information again instead of using the cache
         :return: WDT information
         :rtype: WDTInfoModel
         :raises PSPNotOpened: The library is not ready or opened yet.
         :raises PSPNotSupport: This platform does not support this function.
         :raises PSPError: General PSP functional error.
         """
+        if WDT._info is not None and not refresh:
+            return WDT._info
         stu_wdt_info = WDTInfo()
         type_mapping = {WDT_TYPE_UNKNOWN: "Unknown", WDT_TYPE_SIO: "SuperIO", WDT_TYPE_TCO: "TCO"}
         with PSP() as psp:
             i_ret = psp.lib.LMB_WDT_QueryInfo(byref(stu_wdt_info))
         msg = get_psp_exc_msg("LMB_WDT_QueryInfo", i_ret)
         if i_ret == ERR_Success:
-            return WDTInfoModel(
+            WDT._info = WDTInfoModel(
                 type=type_mapping[stu_wdt_info.ub_type],
                 max_count=stu_wdt_info.uw_count_max,
                 is_minute_support=bool(stu_wdt_info.ub_minute_support),
             )
+            return WDT._info
         elif i_ret == ERR_NotOpened:
             raise PSPNotOpened(msg)
         elif i_ret == ERR_NotSupport:
@@ -134,42 +177,16 @@ class WDT:
         :raises PSPBusyInUses: This step is skipped because WDT is already starting now.
         :raises PSPError: General PSP functional error.
         """
-        # Check type.
-        if not isinstance(count, int):
-            raise TypeError("'count' type must be int")
-        if not isinstance(time_base, int):
-            raise TypeError("'time_base' type must be int")
-        # Check value.
-        info = self.get_info()
-        if not 0 <= count <= info.max_count:
-            raise PSPInvalid(f"'count' value must be between 0 and {info.max_count}")
-        if time_base not in (BASE_SECOND, BASE_MINUTE):
-            raise PSPInvalid(f"'time_base' value must be {BASE_SECOND}"
-                             f" for SECOND base or {BASE_MINUTE} for MINUTE base")
-        if not info.is_minute_support and time_base == BASE_MINUTE:
-            raise PSPInvalid("WDT only support SECOND base")
-        # Run.
-        time_base_mapping = {BASE_SECOND: "seconds", BASE_MINUTE: "minutes"}
+        self._check_config(count, time_base)
         with PSP() as psp:
-            i_ret = psp.lib.LMB_WDT_Config(count, time_base)
-        msg = get_psp_exc_msg("LMB_WDT_Config", i_ret)
-        if i_ret == ERR_Success:
-            logger.debug(f"configure the watchdog timer for {count:d} {time_base_mapping[time_base]}")
-        elif i_ret == ERR_Invalid:
-            raise PSPInvalid(msg)
-        elif i_ret == ERR_NotOpened:
-            raise PSPNotOpened(msg)
-        elif i_ret == ERR_NotSupport:
-            raise PSPNotSupport(msg)
-        elif i_ret == ERR_BusyInUses:
-            raise PSPBusyInUses(msg)
-        else:
-            raise PSPError(msg)
+            self._config(psp, count, time_base)
 
     def enable(self, count: int = 0, time_base: int = 1) -> None:
         """
         Configure the Watch Dog Timer for specific time and start the WDT countdown.
 
+        When ``count`` is given, the configuration and the start are done in a single PSP session.
+
         You can :func:`enable` dircetly by a given time:
 
         .. code-block:: pycon
@@ -200,8 +217,10 @@ class WDT:
         :raises PSPError: General PSP functional error.
         """
         if count != 0:
-            self.config(count, time_base)
+            self._check_config(count, time_base)
         with PSP() as psp:
+            if count != 0:
+                self._config(psp, count, time_base)
             i_ret = psp.lib.LMB_WDT_Start()
         msg = get_psp_exc_msg("LMB_WDT_Start", i_ret)
         if i_ret == ERR_Success:
@@ -213,6 +232,57 @@ class WDT:
         else:
             raise PSPError(msg)
 
+    def _check_config(self, count: int, time_base: int) -> None:
+        """
+        Check the configuration against the cached WDT information.
+
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: Invalid parameter value.
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This platform does not support this function.
+        :raises PSPError: General PSP functional error.
+        """
+        # Check type.
+        if not isinstance(count, int):
+            raise TypeError("'count' type must be int")
+        if not isinstance(time_base, int):
+            raise TypeError("'time_base' type must be int")
+        # Check value.
+        info = self.get_info()
+        if not 0 <= count <= info.max_count:
+            raise PSPInvalid(f"'count' value must be between 0 and {info.max_count}")
+        if time_base not in (BASE_SECOND, BASE_MINUTE):
+            raise PSPInvalid(f"'time_base' value must be {BASE_SECOND}"
+                             f" for SECOND base or {BASE_MINUTE} for MINUTE base")
+        if not info.is_minute_support and time_base == BASE_MINUTE:
+            raise PSPInvalid("WDT only support SECOND base")
+
+    def _config(self, psp: PSP, count: int, time_base: int) -> None:
+        """
+        Configure the Watch Dog Timer in an opened PSP session.
+
+        :raises PSPInvalid: Invalid parameter value.
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This platform does not support this function.
+        :raises PSPBusyInUses: This step is skipped because WDT is already starting now.
+        :raises PSPError: General PSP functional error.
+        """
+        time_base_mapping = {BASE_SECOND: "seconds", BASE_MINUTE: "minutes"}
+        i_ret = psp.lib.LMB_WDT_Config(count, time_base)
+        msg = get_psp_exc_msg("LMB_WDT_Config", i_ret)
+        if i_ret == ERR_Success:
+            logger.debug(f"configure the watchdog timer for {count:d} {time_base_mapping[time_base]}")
+        elif i_ret == ERR_Invalid:
+            raise PSPInvalid(msg)
+        elif i_ret == ERR_NotOpened:
+            raise PSPNotOpened(msg)
+        elif i_ret == ERR_NotSupport:
+            raise PSPNotSupport(msg)
+        elif i_ret == ERR_BusyInUses:
+            raise PSPBusyInUses(msg)
+        else:
+            raise PSPError(msg)
+
     def disable(self) -> None:
         """
         Stop the WDT countdown.
@@ -270,3 +340,410 @@ class WDT:
             raise PSPNotSupport(msg)
         else:
             raise PSPError(msg)
+
+
+class WDTKeepalive:
+    """
+    Feed the Watch Dog Timer from a dedicated thread with its own PSP session.
+
+    The watchdog is configured with ``count`` and ``time_base`` and started by :meth:`start`.
+    It is then fed every ``interval`` seconds (one third of the timeout by default) against
+    absolute deadlines, independently of the application loop. The feed jitter is measured, and
+    ``on_warning`` is called when the margin to the watchdog expiry falls below ``warning_margin``.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> keepalive = WDTKeepalive(30, warning_margin=10, on_warning=print)
+        >>> keepalive.start()
+        >>> keepalive.get_stats()
+        WDTKeepaliveStatsModel(feeds=12, interval=10.0, mean_jitter=0.0003, max_jitter=0.0011, min_margin=29.99, warnings=0)
+        >>> keepalive.stop()
+
+    :param int count: the timer count down
+    :param int time_base: Set ``1`` to select SECOND base, Set ``2`` to select MINUTE base. Defaults to ``1``.
+    :type interval: float or int or None
+    :param interval: seconds between two feeds, :data:`None` (the default) for one third of the timeout
+    :type warning_margin: float or int or None
+    :param warning_margin: seconds, warn when the margin to the expiry falls below this value.
+        :data:`None` (the default) for one third of the timeout.
+    :param on_warning: called with the remaining margin in seconds when it falls below ``warning_margin``
+    :param WDT wdt: the :class:`WDT` to feed. Defaults to a new :class:`WDT`.
+    :param bool realtime: set :data:`True` to run the feeding thread with real-time priority (if permitted)
+    :raises TypeError: The input parameters type error.
+    :raises PSPInvalid: Invalid parameter value.
+    """
+
+    def __init__(self,
+                 count: int,
+                 time_base: int = BASE_SECOND,
+                 interval: Optional[Union[float, int]] = None,
+                 warning_margin: Optional[Union[float, int]] = None,
+                 on_warning: Optional[Callable[[float], None]] = None,
+                 wdt: Optional[WDT] = None,
+                 realtime: bool = True) -> None:
+        # Check type.
+        if not isinstance(count, int):
+            raise TypeError("'count' type must be int")
+        if not isinstance(time_base, int):
+            raise TypeError("'time_base' type must be int")
+        if interval is not None and not isinstance(interval, (float, int)):
+            raise TypeError("'interval' type must be float or int or None")
+        if warning_margin is not None and not isinstance(warning_margin, (float, int)):
+            raise TypeError("'warning_margin' type must be float or int or None")
+        if on_warning is not None and not callable(on_warning):
+            raise TypeError("'on_warning' must be callable")
+        if wdt is not None and not isinstance(wdt, WDT):
+            raise TypeError("'wdt' type must be WDT")
+        if not isinstance(realtime, bool):
+            raise TypeError("'realtime' type must be bool")
+        # Check value.
+        if count <= 0:
+            raise PSPInvalid("'count' value must be > 0")
+        if time_base not in (BASE_SECOND, BASE_MINUTE):
+            raise PSPInvalid(f"'time_base' value must be {BASE_SECOND}"
+                             f" for SECOND base or {BASE_MINUTE} for MINUTE base")
+        timeout = count * (60 if time_base == BASE_MINUTE else 1)
+        if interval is None:
+            interval = timeout / 3
+        if not 0 < interval < timeout:
+            raise PSPInvalid(f"'interval' value must be between 0 and {timeout} seconds")
+        if warning_margin is None:
+            warning_margin = timeout / 3
+        if not 0 <= warning_margin < timeout:
+            raise PSPInvalid(f"'warning_margin' value must be between 0 and {timeout} seconds")
+        self._wdt = wdt if wdt is not None else WDT()
+        self._count = count
+        self._time_base = time_base
+        self._timeout = float(timeout)
+        self._interval = float(interval)
+        self._warning_margin = float(warning_margin)
+        self._on_warning = on_warning
+        self._realtime = realtime
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self._lock = Lock()
+        self._exc: Optional[BaseException] = None
+        self._reset_stats()
+
+    def __enter__(self) -> "WDTKeepalive":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    @property
+    def timeout(self) -> float:
+        """The watchdog timeout in seconds."""
+        return self._timeout
+
+    @property
+    def interval(self) -> float:
+        """Seconds between two feeds."""
+        return self._interval
+
+    @property
+    def is_running(self) -> bool:
+        """Returns :data:`True` if the watchdog is being fed."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Configure and start the watchdog, then start feeding it.
+
+        :raises PSPInvalid: Invalid parameter value.
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This platform does not support this function.
+        :raises PSPBusyInUses: The WDT is already starting now.
+        :raises PSPError: General PSP functional error.
+        """
+        if self.is_running:
+            return
+        self._wdt.enable(self._count, self._time_base)
+        self._reset_stats()
+        self._exc = None
+        self._stop.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, disable: bool = True) -> None:
+        """
+        Stop feeding the watchdog.
+
+        :param bool disable: set :data:`False` to keep the watchdog running, so it will expire
+        :raises PSPNotOpened: The library is not ready or opened yet.
+        :raises PSPNotSupport: This platform does not support this function.
+        :raises PSPError: General PSP functional error.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if disable:
+            self._wdt.disable()
+
+    def get_stats(self) -> WDTKeepaliveStatsModel:
+        """
+        Get the feeding statistics.
+
+        :rtype: WDTKeepaliveStatsModel
+        :raises PSPError: The error that stopped the feeding thread.
+        """
+        if self._exc is not None:
+            raise self._exc
+        with self._lock:
+            return WDTKeepaliveStatsModel(
+                feeds=self._feeds,
+                interval=self._interval,
+                mean_jitter=self._sum_jitter / self._feeds if self._feeds else 0.0,
+                max_jitter=self._max_jitter,
+                min_margin=self._min_margin,
+                warnings=self._warnings,
+                skipped=self._skipped,
+            )
+
+    def _reset_stats(self) -> None:
+        """Reset the feeding statistics."""
+        with self._lock:
+            self._feeds = 0
+            self._sum_jitter = 0.0
+            self._max_jitter = 0.0
+            self._min_margin = self._timeout
+            self._warnings = 0
+            self._skipped = 0
+
+    def _is_healthy(self, now: float) -> bool:
+        """Returns :data:`True` if the watchdog may be fed at ``now``."""
+        return True
+
+    def _set_realtime_priority(self) -> None:
+        """Run the calling thread with the lowest real-time priority, if permitted."""
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(os.sched_get_priority_min(os.SCHED_FIFO)))
+        except (AttributeError, OSError) as e:
+            logger.debug(f"set watchdog keepalive thread real-time priority failure: {e}")
+
+    def _run(self) -> None:
+        """Thread target of :meth:`start`."""
+        if self._realtime:
+            self._set_realtime_priority()
+        try:
+            with PSP() as psp:
+                last_feed = monotonic()
+                deadline = last_feed + self._interval
+                while not self._stop.wait(max(deadline - monotonic(), 0.0)):
+                    now = monotonic()
+                    if not self._is_healthy(now):
+                        # Let the watchdog expire.
+                        with self._lock:
+                            self._skipped += 1
+                        deadline = now + self._interval
+                        continue
+                    # The margin left to the expiry just before this feed.
+                    margin = self._timeout - (now - last_feed)
+                    i_ret = psp.lib.LMB_WDT_Tick()
+                    if i_ret != ERR_Success:
+                        raise PSPError(get_psp_exc_msg("LMB_WDT_Tick", i_ret))
+                    jitter = abs(now - deadline)
+                    with self._lock:
+                        self._feeds += 1
+                        self._sum_jitter += jitter
+                        self._max_jitter = max(self._max_jitter, jitter)
+                        self._min_margin = min(self._min_margin, margin)
+                        if margin < self._warning_margin:
+                            self._warnings += 1
+                    if margin < self._warning_margin:
+                        logger.warning(f"watchdog fed {margin:.3f} seconds before expiry")
+                        if self._on_warning is not None:
+                            try:
+                                self._on_warning(margin)
+                            except Exception as e:
+                                logger.error(f"watchdog keepalive warning callback failed: {e}")
+                    last_feed = now
+                    deadline += self._interval
+                    if deadline < now:
+                        # Do not burst to catch up the missed feeds.
+                        deadline = now + self._interval
+        except BaseException as e:
+            logger.error(f"watchdog keepalive stopped: {e}")
+            self._exc = e
+
+
+class _WDTProbe:
+    """Internal state of a :class:`WDTSupervisor` liveness probe."""
+    __slots__ = ("name", "deadline", "probe", "last_beat", "seq", "beats", "sum_interval", "max_interval")
+
+    def __init__(self, name: str, deadline: float, probe: Optional[Callable[[], bool]], now: float, seq: int) -> None:
+        self.name = name
+        self.deadline = deadline
+        self.probe = probe
+        self.last_beat = now
+        self.seq = seq
+        self.beats = 0
+        self.sum_interval = 0.0
+        self.max_interval = 0.0
+
+
+class WDTSupervisor(WDTKeepalive):
+    """
+    Feed the Watch Dog Timer only while all registered liveness probes are healthy.
+
+    Each component registers a probe with its own deadline and calls :meth:`heartbeat` regularly,
+    or registers a cheap ``probe`` callable that is evaluated on every tick. As soon as one probe
+    has not reported within its deadline, ``LMB_WDT_Tick`` is no longer called, so the board resets
+    on a real hang. The expiry times are kept in a heap, so checking all heartbeats costs O(1) per tick.
+
+    Example:
+
+    .. code-block:: pycon
+
+        >>> supervisor = WDTSupervisor(60)
+        >>> supervisor.register("mqtt", deadline=30)
+        >>> supervisor.register("disk", deadline=20, probe=lambda: os.path.exists("/data/ok"))
+        >>> supervisor.start()
+        >>> supervisor.heartbeat("mqtt")  # From the MQTT client loop.
+        >>> supervisor.get_probe_stats()["mqtt"]
+        WDTProbeStatsModel(name='mqtt', deadline=30.0, beats=1, age=0.2, mean_interval=5.1, max_interval=5.1, is_stale=False)
+
+    The parameters are the same as :class:`WDTKeepalive`.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._probes: Dict[str, _WDTProbe] = {}
+        self._callable_probes: List[_WDTProbe] = []
+        self._expiries: List[Tuple[float, int, str]] = []
+        # Shared by all probes, so an expiry of an unregistered probe never matches a new one of the same name.
+        self._seq = count()
+        self._stale: Optional[str] = None
+
+    def register(self,
+                 name: str,
+                 deadline: Union[float, int],
+                 probe: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Register a liveness probe, its deadline starts now.
+
+        :param str name: probe name
+        :type deadline: float or int
+        :param deadline: seconds allowed between two heartbeats
+        :param probe: a cheap callable evaluated on every tick, returning :data:`True` counts as a heartbeat
+        :raises TypeError: The input parameters type error.
+        :raises PSPInvalid: Invalid parameter value.
+        """
+        # Check type.
+        if not isinstance(name, str):
+            raise TypeError("'name' type must be str")
+        if not isinstance(deadline, (float, int)):
+            raise TypeError("'deadline' type must be float or int")
+        if probe is not None and not callable(probe):
+            raise TypeError("'probe' must be callable")
+        # Check value.
+        if deadline <= 0:
+            raise PSPInvalid("'deadline' value must be > 0")
+        with self._lock:
+            if name in self._probes:
+                raise PSPInvalid(f"probe '{name}' is already registered")
+            p = _WDTProbe(name, float(deadline), probe, monotonic(), next(self._seq))
+            self._probes[name] = p
+            if probe is not None:
+                self._callable_probes.append(p)
+            heappush(self._expiries, (p.last_beat + p.deadline, p.seq, name))
+
+    def unregister(self, name: str) -> None:
+        """
+        Unregister a liveness probe, do nothing if it is not registered.
+
+        :param str name: probe name
+        """
+        with self._lock:
+            p = self._probes.pop(name, None)
+            if p is not None and p.probe is not None:
+                self._callable_probes.remove(p)
+
+    def heartbeat(self, name: str) -> None:
+        """
+        Report that the component of a probe is alive.
+
+        :param str name: probe name
+        :raises PSPInvalid: The probe is not registered.
+        """
+        now = monotonic()
+        with self._lock:
+            p = self._probes.get(name)
+            if p is None:
+                raise PSPInvalid(f"probe '{name}' is not registered")
+            self._beat(p, now)
+
+    @property
+    def is_healthy(self) -> bool:
+        """Returns :data:`True` if no heartbeat is stale."""
+        return self._is_healthy(monotonic())
+
+    def get_probe_stats(self) -> Dict[str, WDTProbeStatsModel]:
+        """
+        Get the heartbeat statistics of each probe.
+
+        :rtype: typing.Dict[str, WDTProbeStatsModel]
+        """
+        now = monotonic()
+        with self._lock:
+            return {
+                p.name: WDTProbeStatsModel(
+                    name=p.name,
+                    deadline=p.deadline,
+                    beats=p.beats,
+                    age=now - p.last_beat,
+                    mean_interval=p.sum_interval / p.beats if p.beats else 0.0,
+                    max_interval=p.max_interval,
+                    is_stale=now - p.last_beat > p.deadline,
+                )
+                for p in self._probes.values()
+            }
+
+    def _beat(self, p: _WDTProbe, now: float) -> None:
+        """Record a heartbeat of a probe. Must be called with the lock held."""
+        interval = now - p.last_beat
+        p.last_beat = now
+        p.seq = next(self._seq)
+        p.beats += 1
+        p.sum_interval += interval
+        if interval > p.max_interval:
+            p.max_interval = interval
+        heappush(self._expiries, (now + p.deadline, p.seq, p.name))
+        if len(self._expiries) > 4 * len(self._probes) + 16:
+            # Drop the superseded expiries.
+            self._expiries = [(p.last_beat + p.deadline, p.seq, p.name) for p in self._probes.values()]
+            heapify(self._expiries)
+
+    def _is_healthy(self, now: float) -> bool:
+        """Returns :data:`True` if no heartbeat is stale at ``now``."""
+        for p in tuple(self._callable_probes):
+            try:
+                alive = p.probe()
+            except Exception as e:
+                logger.warning(f"watchdog probe '{p.name}' failure: {e}")
+                alive = False
+            if alive:
+                with self._lock:
+                    self._beat(p, now)
+        with self._lock:
+            expiries = self._expiries
+            while expiries:
+                expiry, seq, name = expiries[0]
+                p = self._probes.get(name)
+                if p is None or p.seq != seq:
+                    # Superseded by a later heartbeat or unregistered.
+                    heappop(expiries)
+                    continue
+                if expiry < now:
+                    if self._stale != name:
+                        logger.error(f"watchdog probe '{name}' is stale, stop feeding the watchdog")
+                        self._stale = name
+                    return False
+                break
+            self._stale = None
+            return True
@@ -101,6 +101,44 @@ class TestPoE:
             assert poe1.get_power_status() is False
             assert PoE.get_info().power_status[i + 1] is False
 
+    def test_apply(self):
+        results = PoE.apply({i + 1: True for i in range(6)})
+        assert all(result.success for result in results)
+        assert all(PoE.get_info().power_status.values())
+        results = PoE.set_mask(0b111111, 0b000000)
+        assert [result.port for result in results] == [1, 2, 3, 4, 5, 6]
+        assert not any(PoE.get_info().power_status.values())
+
+    def test_get_status(self):
+        PoE.set_mask(0b111111, 0b000101)
+        status = PoE.get_status()
+        assert status.number_of_poe_ports == 6
+        assert status.mask == 0b000101
+        assert status.get_powered_ports() == [1, 3]
+
+    def test_watcher(self):
+        PoE.set_mask(0b111111, 0b000000)
+        with PoEWatcher(interval=0.2) as watcher:
+            PoE(2).enable()
+            event = watcher.get(timeout=5)
+        assert event.port == 2
+        assert event.power is True
+        PoE(2).disable()
+
+    def test_sequencer(self):
+        PoE.set_mask(0b111111, 0b000000)
+        sequencer = PoESequencer(delay=0.2, max_concurrent=2)
+        sequencer.start([1, 2, 3, 4, 5, 6])
+        assert sequencer.wait(60) is True
+        assert [result.port for result in sequencer.get_results()] == [1, 2, 3, 4, 5, 6]
+        assert all(PoE.get_info().power_status.values())
+
+    def test_apply_out_of_range(self):
+        with pytest.raises(PSPInvalid):
+            PoE.apply({7: True})
+        with pytest.raises(PSPInvalid):
+            PoE.set_mask(0b1000000, 0)
+
     def test_init_out_of_range(self):
         with pytest.raises(PSPInvalid) as e:
             PoE(7)
@@ -45,8 +45,44 @@ class TestDLL:
 
 
 class TestGPIO:
-    # TODO: Tooling is required.
-    pass
+    gpio = GPIO()
+
+    def test_capture(self):
+        capture = self.gpio.capture(0.5)
+        assert capture.number_of_di_pins == 8
+        assert capture.sample_count > 0
+        assert sum(capture.run_lengths) == capture.sample_count
+        assert len(capture.timestamps) == len(capture.values) == len(capture.run_lengths)
+
+    def test_write_masked(self):
+        self.gpio.set_digital_out(0b00000011)
+        self.gpio.write_masked(0b00000110, 0b00000100)
+        assert self.gpio.get_digital_out() == 0b00000101
+        self.gpio.set_pin(7)
+        self.gpio.clear_pin(0)
+        self.gpio.toggle_pin(1)
+        assert self.gpio.get_digital_out() == 0b10000110
+        self.gpio.write_pins({1: False, 2: False, 7: False})
+        assert self.gpio.get_digital_out() == 0
+
+    def test_set_pin_out_of_range(self):
+        with pytest.raises(PSPInvalid):
+            self.gpio.set_pin(8)
+        with pytest.raises(PSPInvalid):
+            self.gpio.clear_pin(-1)
+
+    def test_sequencer(self):
+        sequencer = GPIOSequencer(self.gpio)
+        sequencer.start([(0b1, 0b1, 0.2), (0b1, 0b0, 0.2)], repeat=3)
+        assert sequencer.wait(5)
+        timing = sequencer.get_timing()
+        assert timing.steps == 6
+        assert timing.max_error < 0.05
+        assert self.gpio.get_digital_out() & 0b1 == 0
+
+    def test_capture_out_of_range(self):
+        with pytest.raises(PSPInvalid):
+            self.gpio.capture(0)
 
 
 class TestHWM:
@@ -97,6 +97,20 @@ class TestComPort:
         assert com2_info.termination is True
         assert com2_info.termination_str == "Enabled"
 
+    def test_apply(self):
+        com1 = COMPort(1)
+        com1.apply(mode=422, termination=True)
+        assert com1.get_info().mode == 422
+        com1.apply(mode=422, termination=True)
+        COMPort.apply_all({1: (232, False), 2: (485, None)})
+        assert COMPort(1).get_info().termination is False
+        assert COMPort(2).get_info().mode == 485
+        com1.apply(mode=485)
+        assert com1.get_info().mode == 485
+        assert com1.get_info().termination is False
+        with pytest.raises(PSPInvalid):
+            COMPort.apply_all({3: (232, None)})
+
     def test_init_out_of_range(self):
         with pytest.raises(PSPInvalid) as e:
             COMPort(3)
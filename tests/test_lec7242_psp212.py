@@ -17,6 +17,10 @@ SDK:
 - sdk_wdt: Done.
 - config_tool: Done.
 """
+import os
+import pty
+import tty
+from threading import Thread
 from time import sleep
 
 import pytest
@@ -109,6 +113,22 @@ class TestRFM:
         assert self.rfm.get_power_status() == 3
         sleep(DELAY_TIME)
 
+    def test_controller(self):
+        self.rfm.set_power_status(3)
+        self.rfm.set_sim_status(0)
+        controller = RFMController()
+        result = controller.switch_sim(1)
+        assert result.sim_status == 1
+        assert result.power_status == 3
+        assert result.total_time >= 0.5
+        assert self.rfm.get_sim_status() == 1
+        assert self.rfm.get_power_status() == 3
+        assert controller.switch_sim(1, 1).total_time < 0.5
+        future = controller.switch_sim_async(2)
+        assert future.result(timeout=DELAY_TIME).sim_status == 3
+        assert controller.sim_status == self.rfm.get_sim_status() == 3
+        self.rfm.set_sim_status(0)
+
     def test_set_sim_status_out_of_range(self):
         with pytest.raises(PSPInvalid):
             self.rfm.set_sim_status(-1)
@@ -214,6 +234,36 @@ class TestLTEStressLED:
         with pytest.raises(PSPInvalid):
             self.lte_stress_led.set_strength(101)
 
+    def test_signal_monitor(self):
+        # Fake modem on a pty, answering RSSI -73 dBm and RSRP -96 dBm.
+        master, slave = pty.openpty()
+        tty.setraw(master)
+        responses = {
+            b"AT+CSQ": b"\r\n+CSQ: 20,99\r\n\r\nOK\r\n",
+            b"AT+CESQ": b"\r\n+CESQ: 99,99,255,255,20,45\r\n\r\nOK\r\n",
+        }
+
+        def modem():
+            buffer = b""
+            try:
+                while True:
+                    buffer += os.read(master, 1024)
+                    while b"\r" in buffer:
+                        command, buffer = buffer.split(b"\r", 1)
+                        os.write(master, responses.get(command.strip(), b"\r\nERROR\r\n"))
+            except OSError:
+                pass
+
+        Thread(target=modem, daemon=True).start()
+        with LTESignalMonitor(os.ttyname(slave), self.lte_stress_led, interval=0.5) as monitor:
+            sleep(DELAY_TIME)
+        os.close(master)
+        os.close(slave)
+        assert monitor.signal.rsrp == -96
+        assert monitor.signal.rssi == -73
+        assert monitor.signal.percent == 60
+        assert monitor.level == 4
+
     def test_off(self):
         self.lte_stress_led.off()
         sleep(DELAY_TIME)
@@ -267,6 +317,34 @@ class TestComPort:
         with pytest.raises(PSPNotSupport):
             com1.get_info()
 
+    def test_sio_transaction(self):
+        from lannerpsp.gpio_config_tool import GPIOConfigTool, SIOTransaction
+        tool = GPIOConfigTool()
+        tool.set_com1(485, True)
+        transaction = SIOTransaction()
+        transaction.select(GPIOConfigTool.SIO_GPIO_DEVICE)
+        transaction.read(GPIOConfigTool.REG_GPIO1_OUT_DATA)
+        assert tool.run(transaction)[1] & 0x08
+        assert tool.shadow[(GPIOConfigTool.SIO_GPIO_DEVICE, GPIOConfigTool.REG_GPIO1_OUT_DATA)] & 0x08
+        transaction = SIOTransaction()
+        transaction.read(GPIOConfigTool.REG_GPIO1_OUT_DATA)
+        with pytest.raises(PSPInvalid):
+            tool.run(transaction)
+        tool.set_com1(termination=False)
+        assert tool.backend == "devport"
+        GPIOConfigTool("portio").set_com1(termination=False)
+
+    def test_apply_mode_only(self):
+        from lannerpsp.gpio_config_tool import GPIOConfigTool, SIOTransaction
+        com1 = COMPort(1)
+        com1.apply(mode=232, termination=True)
+        com1.apply(mode=485)
+        transaction = SIOTransaction()
+        transaction.select(GPIOConfigTool.SIO_GPIO_DEVICE)
+        transaction.read(GPIOConfigTool.REG_GPIO1_OUT_DATA)
+        assert GPIOConfigTool().run(transaction)[1] & 0x08
+        com1.set_termination(False)
+
     def test_init_out_of_range(self):
         with pytest.raises(PSPInvalid) as e:
             COMPort(2)
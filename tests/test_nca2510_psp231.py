@@ -15,6 +15,8 @@ SDK:
 - sdk_swr: Done.
 - sdk_wdt: Done.
 """
+import asyncio
+import os
 from time import sleep
 
 import pytest
@@ -46,6 +48,8 @@ class TestDLL:
 
     def test_get_bios_id(self):
         assert self.dll.get_bios_id() == '*LIID NCA-2510B BIOS V2.02 "08/09/2018"'
+        assert self.dll.get_bios_id() is self.dll.get_bios_id()
+        assert self.dll.get_bios_id(refresh=True) == '*LIID NCA-2510B BIOS V2.02 "08/09/2018"'
 
 
 class TestGPIO:
@@ -103,6 +107,93 @@ class TestLCM:
         self.lcm.clear()
         sleep(DELAY_TIME)
 
+    def test_frame_buffer(self):
+        with LCMFrameBuffer(self.lcm) as fb:
+            assert fb.draw(["Hello Kitty!", "CPU 42C"]) == 19
+            sleep(DELAY_TIME)
+            assert fb.draw(["Hello Kitty!", "CPU 43C"]) == 1
+            sleep(DELAY_TIME)
+            assert fb.shadow[1].rstrip() == "CPU 43C"
+        self.lcm.clear()
+
+    def test_render_queue(self):
+        fb = LCMFrameBuffer(self.lcm)
+        with LCMRenderQueue(fb, max_rate=5) as queue:
+            queue.set_region("net", 1, 1, 20)
+            queue.set_region("alarm", 2, 1, 20)
+            for i in range(10):
+                queue.post("net", f"eth0 rx {i}")
+            queue.post("alarm", "FAN1 fail")
+            sleep(DELAY_TIME)
+        stats = queue.get_stats()
+        assert stats.posted == 11
+        assert stats.rendered + stats.dropped == 11
+        assert stats.errors == 0
+        assert fb.shadow == ["eth0 rx 9".ljust(20), "FAN1 fail".ljust(20)]
+        with pytest.raises(PSPInvalid):
+            queue.post("cpu", "CPU 42C")
+        self.lcm.clear()
+
+    def test_discover(self, tmp_path, monkeypatch):
+        cache_path = str(tmp_path / "lcm.json")
+        # Cache miss: scan and save the port.
+        lcm_port = self.lcm.discover(cache_path)
+        assert self.lcm.search_port() == f"port={lcm_port.port}, speed={lcm_port.baud_rate:d}"
+        assert os.path.exists(cache_path)
+
+        # Cache hit: validate the cached port without scanning.
+        def search_port(psp):
+            raise AssertionError("the cached port was not used")
+
+        with monkeypatch.context() as m:
+            m.setattr(self.lcm, "_search_port", search_port)
+            assert self.lcm.discover(cache_path) == lcm_port
+        assert self.lcm.discover(cache_path, refresh=True) == lcm_port
+        # An invalid cache is scanned again.
+        with open(cache_path, "w") as f:
+            f.write("{}")
+        assert self.lcm.discover(cache_path) == lcm_port
+
+    def test_display_engine(self):
+        fb = LCMFrameBuffer(self.lcm)
+        with LCMDisplayEngine(fb, fps=4, page_time=1) as engine:
+            engine.set_page("host", ["Hostname", "appliance-01.example.com"])
+            sleep(DELAY_TIME)
+            assert fb.shadow[0].rstrip() == "Hostname"
+            # The long row scrolls.
+            frame = fb.shadow[1]
+            sleep(0.5)
+            assert fb.shadow[1] != frame
+            engine.set_page("ipv6", ["IPv6", "2001:db8::1"])
+            engine.remove_page("host")
+            sleep(DELAY_TIME)
+            assert fb.shadow == ["IPv6".ljust(20), "2001:db8::1".ljust(20)]
+        with pytest.raises(PSPInvalid):
+            engine.set_page("rows", ["1", "2", "3"])
+        self.lcm.clear()
+
+    def test_keypad(self):
+        # No key is pressed during the test.
+        keypad = LCMKeypad(self.lcm)
+        keypad.start()
+        assert keypad.is_running
+        assert keypad.get(timeout=0.5) is None
+        keypad.stop()
+        assert not keypad.is_running
+        assert keypad.get(timeout=0) is None
+
+        async def consume():
+            loop.call_later(0.5, keypad.stop)
+            return [event async for event in keypad]
+
+        loop = asyncio.new_event_loop()
+        try:
+            with keypad:
+                assert loop.run_until_complete(consume()) == []
+        finally:
+            loop.close()
+        assert keypad.dropped == 0
+
 
 class TestSystemLED:
     system_led = SystemLED()
@@ -119,6 +210,22 @@ class TestSystemLED:
         self.system_led.off()
         sleep(DELAY_TIME)
 
+    def test_batch(self):
+        with LEDBatch():
+            self.system_led.green()
+            assert self.system_led.get_status() == 1
+            self.system_led.green()
+        sleep(DELAY_TIME)
+        LEDBatch.invalidate()
+        self.system_led.off()
+        assert self.system_led.get_status() == 0
+
+    def test_animator(self):
+        with LEDAnimator() as animator:
+            animator.play(self.system_led, [("red", 0.15), ("off", 0.15), ("red", 0.15), ("off", 1)], repeat=2)
+            sleep(DELAY_TIME + 1)
+        assert self.system_led.get_status() == 0
+
 
 class TestSWR:
     swr = SWR()
@@ -132,6 +239,8 @@ class TestWDT:
         assert wdt_info.type == "SuperIO"
         assert wdt_info.max_count == 255
         assert wdt_info.is_minute_support is True
+        assert self.wdt.get_info() is wdt_info
+        assert self.wdt.get_info(refresh=True) == wdt_info
 
     def test_enable(self):
         self.wdt.enable(10, 2)
@@ -156,3 +265,19 @@ class TestWDT:
         self.wdt.reset()
         sleep(DELAY_TIME)
         self.wdt.disable()
+
+    def test_keepalive(self):
+        with WDTKeepalive(3, interval=0.5, wdt=self.wdt) as keepalive:
+            sleep(DELAY_TIME * 2)
+        stats = keepalive.get_stats()
+        assert stats.feeds >= 6
+        assert stats.min_margin > 2
+        assert stats.warnings == 0
+
+    def test_supervisor_reregister(self):
+        supervisor = WDTSupervisor(30, wdt=self.wdt)
+        supervisor.register("mqtt", deadline=0.1)
+        supervisor.unregister("mqtt")
+        sleep(0.2)
+        supervisor.register("mqtt", deadline=10)
+        assert supervisor.is_healthy
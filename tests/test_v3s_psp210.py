@@ -14,6 +14,7 @@ SDK:
 - sdk_poe: Done.
 - sdk_wdt: Done.
 """
+import os
 from time import sleep
 
 import pytest
@@ -76,6 +77,37 @@ class TestGSR:
         assert gsr_offset.raw_y == 0
         assert gsr_offset.raw_z == 0
 
+    def test_stream(self):
+        with GSRStream(sample_rate=200, capacity=1024) as stream:
+            sleep(1)
+        block = stream.read(timeout=0)
+        assert stream.overruns == 0
+        assert block.sequence == 0
+        assert 150 <= block.sample_count <= 250
+        assert block.samples[3] == 2
+        assert list(block.timestamps) == sorted(block.timestamps)
+
+    def test_analyzer(self):
+        analyzer = GSRAnalyzer(200, window=128, offset=self.gsr.get_offset())
+        with GSRStream(sample_rate=200) as stream:
+            sleep(1)
+        features = analyzer.feed(stream.read(timeout=0))
+        assert len(features) >= 1
+        assert features[0].sample_count == 128
+        assert len(features[0].band_power) == 3
+        assert all(rms >= 0 for rms in features[0].rms)
+
+    def test_trigger(self, tmp_path):
+        # At rest the magnitude is about 1 g, so a 0.5 g threshold triggers at once.
+        with GSRTrigger(str(tmp_path), pre_trigger=20, post_trigger=20, shock_threshold=0.5) as trigger:
+            sleep(DELAY_TIME)
+        assert trigger.events
+        event = trigger.events[0]
+        assert event.kind == "shock"
+        assert event.sample_count == event.pre_trigger + 20
+        assert os.path.dirname(event.path) == str(tmp_path)
+        assert os.path.exists(event.path)
+
 
 class TestHWM:
     hwm = HWM()